@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -17,14 +18,146 @@ class Settings(BaseSettings):
     debug: bool = True
     app_name: str = "SignBridge API"
     app_version: str = "1.0.0"
+    web_concurrency: int = 1  # API worker processes per host (gunicorn --workers, from WEB_CONCURRENCY)
 
     # Gemini Settings
     gemini_model: str = "gemini-3-flash-preview"  # Using Gemini 3 for the hackathon
     gemini_vision_model: str = "gemini-3-pro-image-preview"  # For image analysis
 
+    # Gemini Gateway Settings (one gateway per API worker process)
+    gemini_max_concurrency: int = 8  # Upper bound per worker; lowered automatically on 429/503
+    gemini_min_concurrency: int = 1
+    gemini_requests_per_minute: float = 300  # API key quota, split between web_concurrency workers; 0 disables
+    gemini_tokens_per_minute: float = 1_000_000  # API key quota, split between web_concurrency workers; 0 disables
+    gemini_workers: int = 0  # Threads for blocking calls, 0 = gemini_max_concurrency
+    gemini_backoff_seconds: float = 2.0  # Pause after a 429/503 before admitting more calls
+    gemini_retries: int = 2  # Retries on quota, overload and transient server errors
+    gemini_retry_base_delay: float = 0.5  # Full-jitter backoff: uniform(0, base * 2^attempt)
+    gemini_json_mode: bool = True  # Request application/json responses for structured calls
+
+    # Result Cache Settings (guidance and hand pose responses)
+    cache_backend: str = "memory"  # "memory", "sqlite" or "none"
+    cache_max_entries: int = 2048
+    cache_ttl_seconds: float = 7 * 24 * 3600
+    cache_sqlite_path: str = "signbridge_cache.db"
+
+    # Visual Guidance Settings (one model call per sign unit not in the cache)
+    guidance_max_units: int = 24  # Sign units allowed in one request; longer text is rejected
+    guidance_unit_concurrency: int = 4  # Units requested at once per request
+
+    # Sign Library Settings (precomputed hand poses and alphabet guidance)
+    sign_library_enabled: bool = True
+    sign_library_path: str = ""  # Empty = the library bundled in app/data
+
+    # Sign Media Sources
+    lifeprint_base_url: str = "https://www.lifeprint.com"
+    handspeak_base_url: str = "https://www.handspeak.com"
+    sign_media_providers: list[str] = ["lifeprint", "handspeak"]  # Priority order
+    sign_media_deadline: float = 12.0  # Overall budget for one word lookup
+
+    # Sign Media Index Settings (persistent word -> media lookup)
+    media_index_enabled: bool = True
+    media_index_path: str = "signbridge_media.db"
+    media_index_ttl_seconds: float = 30 * 24 * 3600
+    media_index_negative_ttl_seconds: float = 24 * 3600
+    media_index_incomplete_ttl_seconds: float = 3600  # Hits found while a better source failed or timed out
+
+    # Shared HTTP Client Settings
+    http_http2: bool = True  # Used when the h2 package is installed
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 5.0
+    http_host_timeouts: dict[str, float] = {}  # e.g. {"www.handspeak.com": 6.0}
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 60.0
+
     # Processing Settings
     max_frame_size: int = 1280
-    frame_quality: int = 85
+    frame_passthrough: bool = True  # Send JPEG frames to Gemini as received (no landmark overlay) when no resize is needed
+    frame_analysis_size: int = 640  # Longest side kept JPEG frames are decoded at for MediaPipe, 0 = full size
+    frame_quality: int = 85  # JPEG quality for images sent without an encoding profile
+
+    # Gemini Image Encoding Settings (see app.services.encoding)
+    encoding_profile: str = "balanced"  # Default profile: "fast", "balanced" or "accurate"
+    encoding_profiles: dict[str, dict] = {}  # Overrides/new profiles, e.g. {"fast": {"format": "WEBP"}}
+
+    # MediaPipe Hands Settings
+    hands_pool_size: int = 2  # Long-lived detectors shared by request handlers
+    hands_checkout_timeout: float = 10.0
+    hands_max_num_hands: int = 2
+    hands_min_detection_confidence: float = 0.5
+    hands_min_tracking_confidence: float = 0.5
+
+    # Frame Preprocessing Executor Settings
+    frame_workers: int = 0  # Worker processes per API worker, 0 = CPU cores / web_concurrency
+    frame_queue_limit: int = 64  # Frames queued or in flight before new ones are rejected
+    frame_timeout: float = 10.0
+    frame_worker_max_sessions: int = 32  # Streaming trackers kept per worker process
+
+    # Streaming Settings (per WebSocket connection)
+    stream_buffer_size: int = 1  # Newest frames kept while inference is busy (only the newest is translated)
+    stream_max_in_flight: int = 1  # Concurrent translations per connection
+
+    # Sign Segmentation Settings (stream_mode="segment")
+    stream_mode: str = "frame"  # "frame": per gated frame, "segment": one Gemini call per sign (clients opt in via hello)
+    segment_start_velocity: float = 0.25  # Hand speed (image widths/sec) that starts a sign
+    segment_end_velocity: float = 0.08  # Hand speed below which a sign is ending
+    segment_pixel_scale: float = 1.0  # Weight of thumbnail difference when landmarks are missing
+    segment_start_frames: int = 2
+    segment_end_frames: int = 3
+    segment_min_duration: float = 0.25
+    segment_max_duration: float = 4.0
+    segment_hold_seconds: float = 0.8  # Still handshape emitted as a static sign
+    segment_max_frames: int = 16  # Frames buffered per sign (decimated beyond this)
+    segment_tile_size: int = 384
+    segment_keyframes: int = 4
+    segment_batch: str = "sheet"  # "sheet": one tiled image, "frames": separate images
+    segment_queue_size: int = 4  # Finished signs waiting for Gemini per connection
+
+    # Motion Gate Settings (skip frames that wouldn't change the translation)
+    motion_gate_enabled: bool = True
+    motion_require_hands: bool = True
+    motion_pixel_threshold: float = 0.02  # Mean abs. grayscale difference, 0-1
+    motion_landmark_threshold: float = 0.015  # Mean landmark displacement, normalized units
+    motion_thumbnail_width: int = 64
+
+    # Video Upload Settings (/api/translate/video)
+    video_max_upload_bytes: int = 500 * 1024 * 1024
+    video_temp_dir: Optional[str] = None  # Defaults to the system temp directory
+    video_sample_fps: float = 10.0  # Frames per second analyzed from the upload
+    video_queue_size: int = 8  # Decoded frames buffered ahead of segmentation
+    video_max_concurrency: int = 3  # Gemini calls in flight per video
+    video_decode_workers: int = 2  # Videos decoded at once (one thread each)
+
+    # Video Job Settings (/api/translate/jobs)
+    jobs_db_path: str = "signbridge_jobs.db"
+    jobs_dir: str = "signbridge_jobs"  # Uploaded videos, kept until their job finishes
+    jobs_max_concurrent: int = 2  # Jobs translated at once per API worker; the rest wait queued
+    jobs_max_queued: int = 32  # Queued + running jobs before submissions are rejected
+    jobs_checkpoint_interval: float = 2.0  # Seconds of video between progress checkpoints
+    jobs_retention_seconds: float = 7 * 24 * 3600  # Finished jobs kept for polling
+    jobs_purge_interval: float = 3600.0  # Seconds between purges of expired jobs
+    jobs_poll_interval: float = 1.0  # Seconds between job store polls (claims, cancellations, job events)
+    jobs_stale_seconds: float = 30.0  # A running job without a heartbeat this long is taken over
+
+    # Metrics Settings (/metrics, Prometheus text format)
+    metrics_enabled: bool = True
+    metrics_dir: str = "signbridge_metrics"  # Per-worker snapshots merged at /metrics when web_concurrency > 1
+    metrics_snapshot_interval: float = 5.0  # Seconds between snapshots (how stale other workers' values can be)
+
+    # Logging and Tracing Settings
+    log_level: str = "INFO"
+    tracing_enabled: bool = True  # Server-Timing headers and slow request logs
+    trace_slow_request_ms: float = 2000.0  # Requests at least this slow are logged as JSON
+    trace_slow_sample_rate: float = 1.0  # Fraction of slow requests logged
+    trace_otlp_endpoint: str = ""  # OTLP/HTTP collector, e.g. "http://localhost:4318"; empty = no export
+    trace_otlp_sample_rate: float = 1.0  # Fraction of traces exported
+    trace_otlp_interval: float = 2.0  # Seconds between export batches
+
+    # Admin Settings (/api/admin)
+    admin_token: str = ""  # Bearer token for admin endpoints; empty = admin endpoints disabled
+    profiler_max_seconds: float = 60.0  # Longest on-demand profile
+    profiler_background_interval: float = 0.0  # Always-on sampler period in seconds, 0 = off (e.g. 0.1)
 
     class Config:
         env_file = ".env"
@@ -1,10 +1,26 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+import logging
 
 from app.config import get_settings
-from app.routers import translate, signs
+from app.routers import translate, signs, jobs, admin
 from app.services.gemini import init_gemini
+from app.services.hands import close_hands_pool
+from app.services.cache import init_result_cache, get_result_cache, close_result_cache
+from app.services import singleflight
+from app.services.http_client import init_http_client, close_http_client
+from app.services.media_index import init_media_index, get_media_index, close_media_index
+from app.services.sign_library import init_sign_library, get_sign_library, close_sign_library
+from app.services.frame_executor import init_frame_executor, shutdown_frame_executor, get_frame_executor
+from app.services.video_pipeline import shutdown_decode_pool
+from app.services.jobs import init_job_manager, get_job_manager, close_job_manager
+from app.services.model_gateway import init_model_gateway, get_model_gateway, shutdown_model_gateway
+from app.services.model_client import get_model_client
+from app.services.metrics import init_metrics_snapshots, close_metrics_snapshots, render_metrics
+from app.services.tracing import TracingMiddleware, init_tracing, get_exporter, close_tracing
+from app.services.profiler import init_profiler, close_profiler
 
 
 @asynccontextmanager
@@ -16,13 +32,51 @@ async def lifespan(app: FastAPI):
         print("Gemini API initialized")
     else:
         print("WARNING: GEMINI_API_KEY not set")
+    init_model_gateway()
+    if exporter := init_tracing():
+        print(f"Exporting traces to {exporter.url}")
+    init_http_client()
+    init_media_index()
+    if library := init_sign_library():
+        print(f"Sign library v{library.version} loaded ({library.stats()['poses']} poses)")
+    cache = init_result_cache()
+    print(f"Result cache initialized ({cache.backend})")
+    # Frame preprocessing workers each warm their own MediaPipe Hands pool
+    executor = await init_frame_executor()
+    print(f"Frame executor initialized ({executor.workers} workers)")
+    # Video jobs interrupted by the last shutdown resume from their checkpoints
+    init_job_manager()
+    if sampler := init_profiler():
+        print(f"Background profiler sampling every {sampler.interval:g}s")
+    # Each API worker has its own registry; share them so any worker can serve /metrics
+    if settings.metrics_enabled and settings.web_concurrency > 1:
+        init_metrics_snapshots(settings.metrics_dir, settings.metrics_snapshot_interval)
     yield
     # Shutdown
     print("Shutting down...")
+    await close_metrics_snapshots()
+    close_profiler()
+    await close_job_manager()
+    shutdown_frame_executor()
+    shutdown_decode_pool()
+    shutdown_model_gateway()
+    await close_http_client()
+    await close_tracing()
+    close_media_index()
+    close_result_cache()
+    close_sign_library()
+    close_hands_pool()
 
 
 settings = get_settings()
 
+logging.basicConfig(
+    level=settings.log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+# httpx logs every sign site request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
@@ -37,11 +91,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Per-request stage timings (Server-Timing header, slow request log, OTLP export)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(translate.router, prefix="/api/translate", tags=["Translation"])
+app.include_router(jobs.router, prefix="/api/translate/jobs", tags=["Jobs"])
 app.include_router(signs.router, prefix="/api/signs", tags=["Signs"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"], include_in_schema=False)
 
 
 @app.get("/")
@@ -58,4 +119,21 @@ async def health_check():
     return {
         "status": "healthy",
         "gemini_configured": bool(settings.gemini_api_key),
+        "gemini_gateway": get_model_gateway().stats(),
+        "gemini_calls": get_model_client().stats(),
+        "frame_executor": (await get_frame_executor()).stats(),
+        "cache": get_result_cache().stats(),
+        "singleflight": singleflight.stats(),
+        "media_index": index.stats() if (index := get_media_index()) else None,
+        "sign_library": library.stats() if (library := get_sign_library()) else None,
+        "jobs": await get_job_manager().stats(),
+        "trace_export": exporter.stats() if (exporter := get_exporter()) else None,
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (stage latencies, cache lookups, queue depths)."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -7,6 +7,9 @@ class TranslationRequest(BaseModel):
 
     image: str = Field(..., description="Base64 encoded image data")
     language: str = Field(default="ASL", description="Sign language type (ASL, BSL, etc.)")
+    profile: Optional[str] = Field(
+        default=None, description="Image encoding profile: fast, balanced or accurate (default from settings)"
+    )
 
 
 class TranslationResponse(BaseModel):
@@ -150,3 +153,33 @@ class SignGifResponse(BaseModel):
     found: bool = Field(..., description="Whether media was found")
     alt_sources: list[dict] = Field(default=[], description="Alternative video sources")
     media_type: str = Field(default="image", description="Type of media: 'image' or 'video'")
+
+
+class VideoJobResult(BaseModel):
+    """A timestamped translation from a video job."""
+
+    start_frame: int = Field(..., description="First video frame of the sign")
+    end_frame: int = Field(..., description="Last video frame of the sign")
+    start: float = Field(..., description="Start time in seconds")
+    end: float = Field(..., description="End time in seconds")
+    kind: str = Field(..., description="'motion', 'hold' or 'frame'")
+    text: str = Field(..., description="Translated text")
+    confidence: float = Field(..., ge=0, le=1, description="Confidence score")
+
+
+class VideoJobResponse(BaseModel):
+    """Status, progress and partial transcript of a video translation job."""
+
+    id: str = Field(..., description="Job ID")
+    status: str = Field(..., description="queued, running, interrupted, completed, failed or cancelled")
+    language: str = Field(..., description="Sign language type")
+    mode: Optional[str] = Field(None, description="'segment' or 'frame' (None for the server default)")
+    progress: float = Field(..., ge=0, le=1, description="Fraction of the video processed")
+    frames_done: int = Field(..., description="Video frames processed so far")
+    total_frames: int = Field(..., description="Video frames in total (0 if unknown)")
+    checkpoint_frame: int = Field(..., description="Frame the job resumes from after a restart")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    updated_at: float = Field(..., description="Last update time (Unix seconds)")
+    results: Optional[list[VideoJobResult]] = Field(None, description="Translations so far, in video order")
+    transcript: Optional[str] = Field(None, description="Translations so far joined into text")
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+import asyncio
+import hmac
+from collections import Counter
+
+from app.config import get_settings
+from app.services.frame_executor import get_frame_executor
+from app.services.profiler import StackSampler, format_collapsed, get_background_profiler, merge_stacks
+
+# One on-demand profile at a time
+_profile_lock = asyncio.Lock()
+
+
+def require_admin(request: Request) -> None:
+    """Allow the request only with the configured admin token (as a Bearer token)."""
+    token = get_settings().admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(credentials.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _collapsed_response(counts: Counter, samples: int, workers: int) -> PlainTextResponse:
+    return PlainTextResponse(
+        format_collapsed(counts),
+        headers={"X-Profile-Samples": str(samples), "X-Profile-Workers": str(workers)},
+    )
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(seconds: float = 10.0, interval: float = 0.005, workers: bool = True, idle: bool = False):
+    """
+    Sample the live process for a while and return collapsed stacks.
+
+    The API process's threads (event loop, Gemini and video decode pools)
+    are rooted at "api"; with workers=true each frame preprocessing worker
+    is sampled too and rooted at "frame-worker-N". The response can be fed
+    straight to flamegraph.pl or opened in speedscope. Threads waiting for
+    work are left out unless idle=true.
+    """
+    settings = get_settings()
+    if not 0 < seconds <= settings.profiler_max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be between 0 and {settings.profiler_max_seconds:g}")
+    if not 0.001 <= interval <= 1.0:
+        raise HTTPException(status_code=400, detail="interval must be between 0.001 and 1 seconds")
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        executor = await get_frame_executor() if workers else None
+        sampler = StackSampler(interval, idle=idle)
+        sampler.start()
+        try:
+            if executor is not None:
+                await executor.start_profile(interval)
+            await asyncio.sleep(seconds)
+        finally:
+            sampler.stop()
+            worker_counts = await executor.stop_profile() if executor is not None else []
+
+    counts: Counter = Counter()
+    merge_stacks(counts, sampler.snapshot(), "api")
+    for i, worker in enumerate(worker_counts):
+        merge_stacks(counts, worker, f"frame-worker-{i}")
+    return _collapsed_response(counts, sampler.samples, len(worker_counts))
+
+
+@router.get("/profile/background", response_class=PlainTextResponse)
+async def background_profile(reset: bool = False):
+    """
+    Collapsed stacks from the always-on low-rate sampler
+    (settings.profiler_background_interval), since startup or the last reset.
+    """
+    sampler = get_background_profiler()
+    if sampler is None:
+        raise HTTPException(status_code=404, detail="Background profiler is disabled")
+
+    samples = sampler.samples
+    counts: Counter = Counter()
+    merge_stacks(counts, sampler.snapshot(reset=reset), "api")
+    worker_counts = await (await get_frame_executor()).background_profile(reset=reset)
+    for i, worker in enumerate(worker_counts):
+        if worker is not None:
+            merge_stacks(counts, worker, f"frame-worker-{i}")
+    return _collapsed_response(counts, samples, len(worker_counts))
@@ -0,0 +1,88 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from typing import Optional
+
+from app.models.schemas import VideoJobResponse
+from app.services.jobs import JobQueueFullError, get_job_manager, job_view
+from app.services.video_pipeline import OPENCV_AVAILABLE, UploadError, UploadTooLargeError, receive_upload
+
+router = APIRouter()
+
+
+@router.post("", response_model=VideoJobResponse, status_code=202)
+async def submit_video_job(
+    request: Request,
+    language: str = "ASL",
+    mode: Optional[str] = None,
+):
+    """
+    Submit a video for background translation.
+
+    Takes the same upload as /api/translate/video (multipart file or raw
+    body) and returns a job immediately. Poll GET /api/translate/jobs/{id}
+    or subscribe to the /events WebSocket for progress and partial results.
+    """
+    if mode is not None and mode not in ("frame", "segment"):
+        raise HTTPException(status_code=400, detail="mode must be 'frame' or 'segment'")
+    if not OPENCV_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Video decoding requires OpenCV")
+
+    manager = get_job_manager()
+    try:
+        await manager.check_capacity()
+        path = await receive_upload(request, directory=manager.jobs_dir)
+        return job_view(await manager.submit(path, language=language, mode=mode))
+
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("", response_model=list[VideoJobResponse])
+async def list_video_jobs(limit: int = 50):
+    """List recent video jobs, newest first."""
+    # Job store calls can wait on another worker's write lock, so keep them off the event loop
+    jobs = await asyncio.to_thread(get_job_manager().store.recent, limit=min(max(limit, 1), 500))
+    return [job_view(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=VideoJobResponse)
+async def get_video_job(job_id: str):
+    """Get a job's status, progress and partial transcript."""
+    manager = get_job_manager()
+    job = await asyncio.to_thread(manager.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_view(job, await asyncio.to_thread(manager.store.results, job_id))
+
+
+@router.post("/{job_id}/cancel", response_model=VideoJobResponse)
+async def cancel_video_job(job_id: str):
+    """Cancel a queued or running job (a finished job is returned unchanged)."""
+    job = await get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_view(job)
+
+
+@router.websocket("/{job_id}/events")
+async def video_job_events(websocket: WebSocket, job_id: str):
+    """
+    WebSocket stream of a job's events.
+
+    Sends {"type": "job", "data": <job with results so far>} first, then the
+    job's status, progress and translation events as they happen, and
+    closes after the final status event. Events come from the job store,
+    so this works whichever API worker runs the job.
+    """
+    await websocket.accept()
+    try:
+        async for event in get_job_manager().events(job_id):
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
@@ -1,21 +1,74 @@
+import json
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 
 from app.models.schemas import (
     SignGuidanceRequest,
     SignGuidanceResponse,
+    SignGuidanceStep,
     VisualGuidanceRequest,
     VisualGuidanceResponse,
+    VisualSignStep,
     HandPoseRequest,
     HandPoseResponse,
     SignGifRequest,
     SignGifResponse,
 )
-from app.services.gemini import get_sign_guidance, get_visual_sign_guidance, generate_hand_pose
+from app.services.gemini import (
+    get_sign_guidance,
+    get_visual_sign_guidance,
+    generate_hand_pose,
+    stream_sign_guidance,
+    stream_visual_sign_guidance,
+)
+from app.services.sign_library import get_sign_library
 from app.services.sign_resources import fetch_sign_gif
 
 router = APIRouter()
 
 
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_guidance_response(
+    events: AsyncIterator[tuple[str, Any]],
+    step_model: type[BaseModel],
+    text: str,
+    language: str,
+) -> StreamingResponse:
+    """
+    Relay streamed guidance as server-sent events.
+
+    Sends a "step" event per validated step, then "done" with the remaining
+    fields, or "error" if the model call fails.
+    """
+
+    async def body():
+        try:
+            async for kind, data in events:
+                if kind == "step":
+                    try:
+                        step = step_model.model_validate(data)
+                    except ValidationError:
+                        continue  # Incomplete step from the model; skip it
+                    yield _sse("step", step.model_dump())
+                else:
+                    fields = {key: value for key, value in data.items() if key != "steps"}
+                    yield _sse("done", {"text": text, "language": language, **fields})
+        except ValueError as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/guidance", response_model=SignGuidanceResponse)
 async def get_text_to_sign_guidance(request: SignGuidanceRequest):
     """
@@ -42,14 +95,37 @@ async def get_text_to_sign_guidance(request: SignGuidanceRequest):
         raise HTTPException(status_code=500, detail=f"Failed to get guidance: {str(e)}")
 
 
+@router.post("/guidance/stream")
+async def stream_text_to_sign_guidance(request: SignGuidanceRequest):
+    """
+    Stream step-by-step guidance for signing text as server-sent events.
+
+    Each step is sent as a "step" event as soon as the model has generated
+    it; a final "done" event carries the notes.
+    """
+    return _stream_guidance_response(
+        stream_sign_guidance(text=request.text, language=request.language),
+        SignGuidanceStep,
+        request.text,
+        request.language,
+    )
+
+
 @router.get("/alphabet/{letter}")
 async def get_alphabet_sign(letter: str):
     """
     Get guidance for signing a single letter of the alphabet.
+
+    Served from the precomputed sign library; Gemini is only asked for
+    letters the library doesn't have.
     """
     if len(letter) != 1 or not letter.isalpha():
         raise HTTPException(status_code=400, detail="Please provide a single letter")
 
+    library = get_sign_library()
+    if library is not None and (guidance := library.alphabet(letter)) is not None:
+        return {"letter": letter.upper(), "guidance": guidance}
+
     try:
         result = await get_sign_guidance(
             text=letter.upper(),
@@ -112,18 +188,39 @@ async def get_visual_sign_guidance_endpoint(request: VisualGuidanceRequest):
         raise HTTPException(status_code=500, detail=f"Failed to get visual guidance: {str(e)}")
 
 
+@router.post("/visual-guidance/stream")
+async def stream_visual_sign_guidance_endpoint(request: VisualGuidanceRequest):
+    """
+    Stream visual guidance for signing text as server-sent events.
+
+    Each step is sent as a "step" event as soon as the model has generated
+    it; a final "done" event carries the video resources, tips and common
+    mistakes.
+    """
+    return _stream_guidance_response(
+        stream_visual_sign_guidance(text=request.text, language=request.language),
+        VisualSignStep,
+        request.text,
+        request.language,
+    )
+
+
 @router.post("/hand-pose", response_model=HandPoseResponse)
 async def get_hand_pose(request: HandPoseRequest):
     """
     Generate 3D hand pose data for a sign.
 
-    Uses AI to generate precise finger positions for 3D hand visualization.
+    Known signs (alphabet, numbers, common vocabulary) come from the
+    precomputed sign library; others are generated with AI.
     """
     try:
-        result = await generate_hand_pose(
-            sign=request.sign,
-            language=request.language,
-        )
+        library = get_sign_library()
+        result = library.pose(request.sign, request.language) if library is not None else None
+        if result is None:
+            result = await generate_hand_pose(
+                sign=request.sign,
+                language=request.language,
+            )
 
         return HandPoseResponse(
             sign=result["sign"],
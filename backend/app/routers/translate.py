@@ -1,13 +1,57 @@
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
-import base64
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+import asyncio
 import json
+import logging
+import os
+import time
+from typing import NamedTuple, Optional, Union
 
+from app.config import get_settings
 from app.models.schemas import TranslationRequest, TranslationResponse
-from app.services.gemini import translate_sign_language
-from app.services.video import process_frame, decode_base64_image
+from app.services.encoding import get_profile
+from app.services.gemini import translate_sign_language, translate_sign_clip
+from app.services.metrics import REGISTRY
+from app.services.tracing import traced
+from app.services.frame_executor import get_frame_executor, ExecutorBusyError
+from app.services.frame_protocol import (
+    SUBPROTOCOL_BINARY,
+    SUBPROTOCOL_JSON,
+    FrameProtocolError,
+    parse_frame,
+)
+from app.services.motion import create_motion_gate, SKIP_NO_HANDS, SKIP_STILL
+from app.services.segmentation import SignClip, create_segmenter, clip_images
+from app.services.stream_scheduler import LatestFrameScheduler
+from app.services.video_pipeline import (
+    OPENCV_AVAILABLE,
+    UploadError,
+    UploadTooLargeError,
+    receive_upload,
+    translate_video_file,
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Metrics
+_WS_CONNECTIONS = REGISTRY.counter("signbridge_websocket_connections_total", "WebSocket streams opened")
+_WS_ACTIVE = REGISTRY.gauge("signbridge_websocket_connections", "WebSocket streams currently open")
+_STREAM_DROPPED = REGISTRY.counter(
+    "signbridge_stream_dropped_total", "Pending stream items replaced before inference", ("kind",)
+)
+_FRAMES_DROPPED = _STREAM_DROPPED.labels("frame")
+_CLIPS_DROPPED = _STREAM_DROPPED.labels("clip")
+
+
+class StreamFrame(NamedTuple):
+    """A frame received on the stream, waiting for a free inference slot."""
+
+    data: Union[str, bytes]  # Base64 data URL (JSON mode) or binary message
+    offset: Optional[int]  # Payload offset for binary messages, None for base64
+    language: str
+    seq: Optional[int]
+    received_at: float
 
 
 @router.post("/frame", response_model=TranslationResponse)
@@ -16,20 +60,21 @@ async def translate_frame(request: TranslationRequest):
     Translate a single frame containing sign language.
 
     Accepts a base64 encoded image and returns the detected sign language text.
+    The image is sent to Gemini per the requested encoding profile.
     """
     try:
-        # Decode and process the image
-        image_data = decode_base64_image(request.image)
+        profile = get_profile(request.profile)
 
-        if image_data is None:
-            raise HTTPException(status_code=400, detail="Invalid image data")
+        # Decode, process (MediaPipe preprocessing) and encode the image off the event loop
+        executor = await get_frame_executor()
+        processed = await executor.process(request.image, profile=profile)
 
-        # Process frame (optional preprocessing with MediaPipe)
-        processed_image = process_frame(image_data)
+        if processed is None:
+            raise HTTPException(status_code=400, detail="Invalid image data")
 
         # Translate using Gemini
         result = await translate_sign_language(
-            processed_image,
+            processed.model_image(),
             language=request.language,
         )
 
@@ -40,23 +85,86 @@ async def translate_frame(request: TranslationRequest):
             raw_response=result.get("raw_response"),
         )
 
+    except HTTPException:
+        raise
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Frame preprocessing timed out")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
 
+class _UploadResponse(StreamingResponse):
+    """Streams results for an uploaded file and deletes the file however the response ends."""
+
+    def __init__(self, content, path: str, **kwargs):
+        super().__init__(content, **kwargs)
+        self.path = path
+
+    async def __call__(self, scope, receive, send) -> None:
+        # The body may never start (client gone before the headers were sent),
+        # so the upload is cleaned up here rather than in the body generator
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+            os.unlink(self.path)
+
+
 @router.post("/video")
-async def translate_video():
+async def translate_video(
+    request: Request,
+    language: str = "ASL",
+    mode: Optional[str] = None,
+    format: Optional[str] = None,
+    profile: Optional[str] = None,
+):
     """
     Translate a video clip containing sign language.
 
     Accepts a video file and returns translations with timestamps.
+
+    The video is sent as multipart/form-data (any file field) or as the raw
+    request body, and is streamed to disk rather than held in memory.
+    Results are streamed back as they complete, as NDJSON by default or as
+    server-sent events with ?format=sse (or Accept: text/event-stream). Each
+    {"type": "translation"} line has start/end times in seconds; the last
+    line is {"type": "done"} with decode stats. ?profile= picks the image
+    encoding profile.
     """
-    # TODO: Implement video upload and processing
-    return JSONResponse(
-        status_code=501,
-        content={"message": "Video translation not yet implemented"},
+    if mode is not None and mode not in ("frame", "segment"):
+        raise HTTPException(status_code=400, detail="mode must be 'frame' or 'segment'")
+    try:
+        encoding_profile = get_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not OPENCV_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Video decoding requires OpenCV")
+
+    try:
+        path = await receive_upload(request)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    sse = format == "sse" or (format is None and "text/event-stream" in request.headers.get("accept", ""))
+
+    async def body():
+        async for event in translate_video_file(path, language=language, mode=mode, profile=encoding_profile):
+            if sse:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
+
+    return _UploadResponse(
+        body(),
+        path,
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -66,59 +174,269 @@ async def translate_stream(websocket: WebSocket):
     WebSocket endpoint for real-time sign language translation.
 
     Accepts continuous video frames and returns translations in real-time.
+
+    Frames are sent either as JSON text messages carrying a base64 data URL,
+    or, once the binary protocol is negotiated (via the signbridge.frames.v1
+    subprotocol or a {"type": "hello", "protocol": "binary"} first message),
+    as binary messages: a frame_protocol header followed by raw JPEG/WebP bytes.
+
+    Frames that arrive while inference is busy replace older pending frames;
+    each translation reports how many frames have been dropped so far.
+    In "frame" mode (the default, see settings.stream_mode) frames without
+    hands or without meaningful motion since the last translated frame are
+    not sent to Gemini (see app.services.motion). In "segment" mode, frames
+    are split into individual signs by hand velocity and each sign is
+    translated from a few keyframes in one Gemini call. Clients opt in with
+    {"type": "hello", "mode": "segment"} and send {"type": "end"} to
+    translate a sign that is still in progress. The hello message can also
+    pick the image encoding profile for the session, e.g. "profile": "fast".
     """
-    await websocket.accept()
+    binary = SUBPROTOCOL_BINARY in websocket.scope.get("subprotocols", [])
+    if binary:
+        await websocket.accept(subprotocol=SUBPROTOCOL_BINARY)
+    elif SUBPROTOCOL_JSON in websocket.scope.get("subprotocols", []):
+        await websocket.accept(subprotocol=SUBPROTOCOL_JSON)
+    else:
+        await websocket.accept()
+    _WS_CONNECTIONS.inc()
+    _WS_ACTIVE.inc()
+
+    # Pin the connection to one worker so its MediaPipe tracker stays warm
+    executor = await get_frame_executor()
+    session_id = executor.open_session()
+    settings = get_settings()
+    send_lock = asyncio.Lock()
+
+    async def send(message: dict) -> None:
+        # Inference tasks and the receive loop share the socket
+        async with send_lock:
+            await websocket.send_json(message)
+
+    # How images are prepared for Gemini (see app.services.encoding)
+    profile = get_profile()
+
+    # "segment" mode: translate each complete sign from a few keyframes
+    mode = settings.stream_mode
+    segmenter = create_segmenter()
+
+    # "frame" mode: skip frames with no hands or no meaningful motion, reusing the last result
+    gate = create_motion_gate()
+    last_result = {"text": "", "confidence": 0.0}
+
+    async def translate_and_send(frame: StreamFrame) -> None:
+        nonlocal last_result
+        try:
+            # Decode and process; single frames are encoded for Gemini in the worker,
+            # while signs are encoded once their keyframes are chosen
+            frame_profile = profile if mode == "frame" else None
+            if frame.offset is None:
+                processed = await executor.process(frame.data, session_id=session_id, profile=frame_profile)
+            else:
+                processed = await executor.process_bytes(
+                    frame.data, frame.offset, session_id=session_id, profile=frame_profile
+                )
+            if processed is None:
+                return
+
+            if mode == "segment":
+                clip = segmenter.push(processed, frame.received_at, frame.seq)
+                if clip is not None:
+                    clip_scheduler.submit((clip, frame.language))
+                return
+
+            skipped = gate.check(processed) if gate is not None else None
+            if skipped == SKIP_NO_HANDS:
+                result = {"text": "", "confidence": 0.0}
+            elif skipped == SKIP_STILL:
+                result = last_result
+            else:
+                # Translate
+                result = await translate_sign_language(
+                    processed.model_image(),
+                    language=frame.language,
+                )
+                last_result = result
+
+            # Send translation
+            data = {
+                "text": result["text"],
+                "confidence": result["confidence"],
+                "dropped": scheduler.dropped,
+                "latency_ms": round((time.monotonic() - frame.received_at) * 1000),
+            }
+            if frame.seq is not None:
+                data["seq"] = frame.seq
+            if gate is not None:
+                data["skipped"] = skipped
+                data["skip_ratio"] = round(gate.skip_ratio, 3)
+            await send({
+                "type": "translation",
+                "data": data,
+            })
+
+        except ExecutorBusyError as e:
+            await send({
+                "type": "error",
+                "error": f"{e}, frame skipped",
+            })
+        except asyncio.TimeoutError:
+            await send({
+                "type": "error",
+                "error": "Frame preprocessing timed out",
+            })
+        except Exception as e:
+            await send({
+                "type": "error",
+                "error": str(e),
+            })
+
+    async def translate_clip_and_send(item: tuple[SignClip, str]) -> None:
+        clip, language = item
+        try:
+            images, tiled = clip_images(clip)
+            result = await translate_sign_clip(images, language=language, tiled=tiled, profile=profile)
+
+            await send({
+                "type": "translation",
+                "data": {
+                    "text": result["text"],
+                    "confidence": result["confidence"],
+                    "dropped": scheduler.dropped + clip_scheduler.dropped,
+                    "latency_ms": round((time.monotonic() - clip.end) * 1000),
+                    "segment": {
+                        "kind": clip.kind,
+                        "start_seq": clip.frames[0].seq,
+                        "end_seq": clip.frames[-1].seq,
+                        "frames": len(images),
+                        "duration_ms": round(clip.duration * 1000),
+                    },
+                },
+            })
+
+        except Exception as e:
+            await send({
+                "type": "error",
+                "error": str(e),
+            })
+
+    # Receiving never waits on inference: only the freshest frames are translated
+    # Each frame and sign gets its own trace (slow request log, OTLP export)
+    trace_name = f"WS {websocket.url.path}"
+    scheduler = LatestFrameScheduler(
+        traced(translate_and_send, trace_name, kind="frame"),
+        buffer_size=settings.stream_buffer_size,
+        max_in_flight=settings.stream_max_in_flight,
+        dropped_counter=_FRAMES_DROPPED,
+    )
+    # Finished signs queue separately so preprocessing keeps feeding the segmenter
+    clip_scheduler = LatestFrameScheduler(
+        traced(translate_clip_and_send, trace_name, kind="clip"),
+        buffer_size=settings.segment_queue_size,
+        max_in_flight=settings.stream_max_in_flight,
+        newest_first=False,
+        dropped_counter=_CLIPS_DROPPED,
+    )
+    scheduler.start()
+    clip_scheduler.start()
 
     try:
         while True:
             # Receive frame data
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
 
-            if message.get("type") == "frame":
-                image_data = message.get("data", {}).get("image")
-
-                if not image_data:
-                    await websocket.send_json({
+            if received.get("bytes") is not None:
+                if not binary:
+                    await send({
                         "type": "error",
-                        "error": "No image data provided",
+                        "error": "Binary frames require the binary protocol to be negotiated",
                     })
                     continue
 
+                data = received["bytes"]
                 try:
-                    # Decode and process
-                    decoded_image = decode_base64_image(image_data)
-                    if decoded_image is None:
-                        continue
-
-                    processed_image = process_frame(decoded_image)
-
-                    # Translate
-                    result = await translate_sign_language(
-                        processed_image,
-                        language=message.get("data", {}).get("language", "ASL"),
-                    )
-
-                    # Send translation
-                    await websocket.send_json({
-                        "type": "translation",
-                        "data": {
-                            "text": result["text"],
-                            "confidence": result["confidence"],
-                        },
+                    header, offset = parse_frame(data)
+                except FrameProtocolError as e:
+                    await send({
+                        "type": "error",
+                        "error": str(e),
                     })
+                    continue
+
+                scheduler.submit(StreamFrame(
+                    data=data,
+                    offset=offset,
+                    language=header.language,
+                    seq=header.seq,
+                    received_at=time.monotonic(),
+                ))
+                continue
+
+            message = json.loads(received["text"])
+
+            if message.get("type") == "hello":
+                # A hello that only sets the mode or profile keeps the negotiated protocol
+                if "protocol" in message:
+                    binary = message["protocol"] == "binary"
+                if message.get("mode") in ("frame", "segment"):
+                    mode = message["mode"]
+                if message.get("profile"):
+                    try:
+                        profile = get_profile(message["profile"])
+                    except ValueError as e:
+                        await send({
+                            "type": "error",
+                            "error": str(e),
+                        })
+                await send({
+                    "type": "hello",
+                    "protocol": "binary" if binary else "json",
+                    "mode": mode,
+                    "profile": profile.name,
+                })
+
+            elif message.get("type") == "frame":
+                image_data = message.get("data", {}).get("image")
 
-                except Exception as e:
-                    await websocket.send_json({
+                if not image_data:
+                    await send({
                         "type": "error",
-                        "error": str(e),
+                        "error": "No image data provided",
                     })
+                    continue
+
+                scheduler.submit(StreamFrame(
+                    data=image_data,
+                    offset=None,
+                    language=message.get("data", {}).get("language", "ASL"),
+                    seq=message.get("data", {}).get("seq"),
+                    received_at=time.monotonic(),
+                ))
+
+            elif message.get("type") == "end":
+                # Client stopped signing: translate the sign in progress, if any
+                clip = segmenter.flush()
+                if clip is not None:
+                    clip_scheduler.submit((clip, message.get("data", {}).get("language", "ASL")))
 
             elif message.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+                await send({
+                    "type": "pong",
+                    "data": {
+                        **scheduler.stats(),
+                        "motion": gate.stats() if gate is not None else None,
+                        "segments": segmenter.stats(),
+                    },
+                })
 
     except WebSocketDisconnect:
-        print("Client disconnected")
+        logger.info("Client disconnected")
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.warning("WebSocket error: %s", e)
         await websocket.close()
+    finally:
+        _WS_ACTIVE.dec()
+        await scheduler.stop()
+        await clip_scheduler.stop()
+        executor.close_session(session_id)
@@ -0,0 +1,258 @@
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.services.metrics import REGISTRY
+
+# Global cache instance
+_cache: Optional["ResultCache"] = None
+
+
+def normalize_text(text: str) -> str:
+    """Normalize prompt text so trivially different inputs share a cache entry."""
+    return " ".join(text.split()).casefold()
+
+
+def cache_key(function: str, text: str, language: str, model: str) -> str:
+    """
+    Build a cache key from the inputs that determine a model response.
+
+    Args:
+        function: Name of the cached function (e.g. "sign_guidance")
+        text: Prompt text (word, phrase or sign)
+        language: Sign language type
+        model: Gemini model name
+
+    Returns:
+        Cache key string
+    """
+    return "\x1f".join([function, normalize_text(text), language.strip().upper(), model])
+
+
+class ResultCache:
+    """Base class for result caches with hit/miss counters (caches nothing itself)."""
+
+    backend = "none"
+    # Lookups can block (disk, or another worker's write lock), so the async
+    # methods run them in a thread
+    blocking = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._set(key, value)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() for coroutines: never blocks the event loop."""
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """set() for coroutines: never blocks the event loop."""
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def invalidate(self, function: Optional[str] = None, text: Optional[str] = None) -> int:
+        """
+        Remove cached entries.
+
+        Args:
+            function: Only remove entries for this function
+            text: Only remove entries for this (normalized) text
+
+        Returns:
+            Number of entries removed
+        """
+        normalized = normalize_text(text) if text is not None else None
+
+        def matches(key: str) -> bool:
+            parts = key.split("\x1f")
+            if function is not None and parts[0] != function:
+                return False
+            if normalized is not None and parts[1] != normalized:
+                return False
+            return True
+
+        return self._invalidate(matches)
+
+    def clear(self) -> int:
+        return self._invalidate(lambda key: True)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _get(self, key: str) -> Optional[Any]:
+        return None
+
+    def _set(self, key: str, value: Any) -> None:
+        pass
+
+    def _invalidate(self, matches) -> int:
+        return 0
+
+    def __len__(self) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCache(ResultCache):
+    """In-memory LRU cache with a per-entry TTL."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int, ttl: float):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers get their own copy so they can't mutate the cached result
+        return copy.deepcopy(value)
+
+    def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _invalidate(self, matches) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if matches(key)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(ResultCache):
+    """On-disk cache backed by SQLite, shared across workers and restarts."""
+
+    backend = "sqlite"
+    blocking = True
+
+    def __init__(self, path: str, ttl: float):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + self.ttl),
+            )
+
+    def _invalidate(self, matches) -> int:
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM results") if matches(row[0])]
+            self._conn.executemany("DELETE FROM results WHERE key = ?", [(key,) for key in keys])
+        return len(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def init_result_cache() -> ResultCache:
+    """Initialize the global result cache from settings."""
+    global _cache
+    settings = get_settings()
+
+    if settings.cache_backend == "sqlite":
+        _cache = SQLiteCache(settings.cache_sqlite_path, ttl=settings.cache_ttl_seconds)
+    elif settings.cache_backend == "memory":
+        _cache = MemoryCache(settings.cache_max_entries, ttl=settings.cache_ttl_seconds)
+    else:
+        _cache = ResultCache()
+    return _cache
+
+
+def get_result_cache() -> ResultCache:
+    """Get the global result cache instance."""
+    if _cache is None:
+        return init_result_cache()
+    return _cache
+
+
+def close_result_cache() -> None:
+    """Close the global result cache."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+def invalidate(function: Optional[str] = None, text: Optional[str] = None) -> int:
+    """Remove entries from the global result cache (all entries if no filter is given)."""
+    return get_result_cache().invalidate(function=function, text=text)
+
+
+REGISTRY.callback(
+    "signbridge_result_cache_lookups_total", "Result cache lookups by outcome", "counter",
+    lambda: {"hit": _cache.hits, "miss": _cache.misses} if _cache is not None else None,
+    labelnames=("result",),
+)
@@ -0,0 +1,156 @@
+import io
+import math
+from typing import NamedTuple, Optional
+
+from PIL import Image
+
+from app.config import get_settings
+
+# Image formats Gemini accepts as inline parts
+_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+class EncodingProfile(NamedTuple):
+    """How a frame is prepared before it is sent to Gemini."""
+
+    name: str
+    max_size: int  # Longest side in pixels
+    format: str  # "JPEG" or "WEBP"
+    quality: int  # 1-100
+    grayscale: bool = False
+    crop_to_hands: bool = False  # Crop to the MediaPipe hand bounding box (with margin)
+    crop_margin: float = 0.5  # Added on each side, as a fraction of the box's longer side
+    crop_min_fraction: float = 0.4  # Smallest crop, as a fraction of the frame, so some context stays
+
+
+# Gemini bills an image up to 384x384 as one 258-token tile and larger
+# images as 768x768 tiles, so the sizes below are one tile, one or two
+# tiles, and the full frame
+PROFILES = {
+    "fast": EncodingProfile("fast", max_size=384, format="JPEG", quality=70, grayscale=True, crop_to_hands=True),
+    "balanced": EncodingProfile("balanced", max_size=768, format="JPEG", quality=80),
+    "accurate": EncodingProfile("accurate", max_size=1280, format="JPEG", quality=90),
+}
+
+
+def get_profile(name: Optional[str] = None) -> EncodingProfile:
+    """
+    Look up an encoding profile.
+
+    Built-in profiles can be changed, and new ones added, with
+    settings.encoding_profiles (e.g. {"tiny": {"max_size": 256, "format": "WEBP"}});
+    new profiles start from "balanced".
+
+    Args:
+        name: Profile name (defaults to settings.encoding_profile)
+
+    Returns:
+        The profile
+
+    Raises:
+        ValueError: If the profile doesn't exist or is invalid
+    """
+    settings = get_settings()
+    name = (name or settings.encoding_profile).strip().lower()
+    overrides = settings.encoding_profiles.get(name)
+    if overrides is None:
+        if name not in PROFILES:
+            raise ValueError(f"Unknown encoding profile '{name}' (expected one of {', '.join(profile_names())})")
+        return PROFILES[name]
+
+    try:
+        profile = PROFILES.get(name, PROFILES["balanced"])._replace(name=name, **overrides)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid encoding profile '{name}': {e}")
+    profile = profile._replace(format=profile.format.upper())
+    if profile.format not in _MIME_TYPES or not 1 <= profile.quality <= 100 or profile.max_size < 16:
+        raise ValueError(
+            f"Invalid encoding profile '{name}': format must be JPEG or WEBP, quality 1-100 and max_size at least 16"
+        )
+    return profile
+
+
+def profile_names() -> list[str]:
+    return sorted(set(PROFILES) | set(get_settings().encoding_profiles))
+
+
+def source_size(profile: EncodingProfile) -> int:
+    """Longest side a frame needs so that the profile's output (even its smallest crop) isn't upscaled."""
+    if profile.crop_to_hands:
+        return math.ceil(profile.max_size / profile.crop_min_fraction)
+    return profile.max_size
+
+
+def can_pass_through(profile: EncodingProfile) -> bool:
+    """True if a frame's original JPEG (already small enough) satisfies the profile as-is."""
+    return profile.format == "JPEG" and not profile.grayscale
+
+
+def hands_box(landmarks: dict, size: tuple[int, int], profile: EncodingProfile) -> Optional[tuple[int, int, int, int]]:
+    """
+    Pixel box around every detected hand, padded by the profile's margin.
+
+    Args:
+        landmarks: extract_hand_landmarks() format (coordinates normalized to the image)
+        size: Image (width, height)
+        profile: Encoding profile
+
+    Returns:
+        (left, top, right, bottom), or None if there are no landmarks
+    """
+    points = [point for hand in landmarks.get("hands", []) for point in hand["landmarks"]]
+    if not points:
+        return None
+
+    width, height = size
+    xs = [min(max(point["x"], 0.0), 1.0) * width for point in points]
+    ys = [min(max(point["y"], 0.0), 1.0) * height for point in points]
+    margin = profile.crop_margin * max(max(xs) - min(xs), max(ys) - min(ys))
+    box_w = max(max(xs) - min(xs) + 2 * margin, profile.crop_min_fraction * width)
+    box_h = max(max(ys) - min(ys) + 2 * margin, profile.crop_min_fraction * height)
+    center_x = (min(xs) + max(xs)) / 2
+    center_y = (min(ys) + max(ys)) / 2
+
+    # Shift rather than shrink the box where it runs off the frame
+    left = min(max(center_x - box_w / 2, 0.0), max(width - box_w, 0.0))
+    top = min(max(center_y - box_h / 2, 0.0), max(height - box_h, 0.0))
+    return (
+        int(left),
+        int(top),
+        min(width, int(round(left + box_w))),
+        min(height, int(round(top + box_h))),
+    )
+
+
+def encode_image(image: Image.Image, profile: EncodingProfile, landmarks: Optional[dict] = None) -> dict:
+    """
+    Crop, downscale and compress an image per an encoding profile.
+
+    Args:
+        image: PIL Image
+        profile: Encoding profile
+        landmarks: Hand landmarks for the image, used when the profile crops to hands
+
+    Returns:
+        Inline image part for generate_content ({"mime_type", "data"})
+    """
+    if profile.crop_to_hands and landmarks:
+        box = hands_box(landmarks, image.size, profile)
+        if box is not None:
+            image = image.crop(box)
+
+    # Grayscale first, so there is a third of the pixel data to resize
+    if profile.grayscale:
+        image = image.convert("L")
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    if max(image.size) > profile.max_size:
+        ratio = profile.max_size / max(image.size)
+        new_size = (max(1, round(image.size[0] * ratio)), max(1, round(image.size[1] * ratio)))
+        # Bilinear is antialiased when downscaling and several times faster than Lanczos
+        image = image.resize(new_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=profile.format, quality=profile.quality)
+    return {"mime_type": _MIME_TYPES[profile.format], "data": buffer.getvalue()}
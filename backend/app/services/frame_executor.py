@@ -0,0 +1,466 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from PIL import Image
+
+from app.config import get_settings
+from app.services import tracing
+from app.services.encoding import EncodingProfile
+from app.services.metrics import REGISTRY, STAGE_BUCKETS, STAGE_SECONDS
+from app.services.video import ProcessedFrame
+
+logger = logging.getLogger(__name__)
+
+# Global executor instance (parent process)
+_executor: Optional["FrameExecutor"] = None
+
+# Per-connection MediaPipe trackers (worker processes only)
+_worker_trackers: "OrderedDict[str, object]" = OrderedDict()
+_worker_max_sessions = 32
+# On-demand profile running in this worker (worker processes only)
+_worker_profile = None
+
+
+# Metrics (parent process)
+_FRAME_SECONDS = REGISTRY.histogram(
+    "signbridge_frame_preprocess_seconds",
+    "Frame preprocessing time including queueing and transfer to the worker",
+    bounds=STAGE_BUCKETS,
+)
+_STAGE_HISTOGRAMS = {
+    stage: STAGE_SECONDS.labels(stage) for stage in ("base64_decode", "image_decode", "resize", "mediapipe", "encode")
+}
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the preprocessing queue is full and a frame is rejected."""
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+
+def _init_worker(max_sessions: int) -> None:
+    """Warm PIL plugins and MediaPipe once per worker process."""
+    global _worker_max_sessions
+    _worker_max_sessions = max_sessions
+
+    Image.init()
+
+    from app.services.profiler import init_profiler
+
+    init_profiler()
+
+    from app.services.hands import init_hands_pool
+
+    try:
+        init_hands_pool(1)
+    except Exception as e:
+        print(f"Frame worker {os.getpid()}: MediaPipe unavailable: {e}")
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _session_tracker(session_id: Optional[str]):
+    """Get (or create) the tracker for a streaming session in this worker."""
+    if session_id is None:
+        return None
+
+    tracker = _worker_trackers.get(session_id)
+    if tracker is not None:
+        _worker_trackers.move_to_end(session_id)
+        return tracker
+
+    from app.services.hands import create_tracker
+
+    try:
+        tracker = create_tracker()
+    except Exception as e:
+        print(f"Frame worker {os.getpid()}: tracker unavailable: {e}")
+        return None
+    if tracker is None:
+        return None
+
+    _worker_trackers[session_id] = tracker
+    # Evict the least recently used tracker if a release was never delivered
+    while len(_worker_trackers) > _worker_max_sessions:
+        _, stale = _worker_trackers.popitem(last=False)
+        stale.close()
+    return tracker
+
+
+def _release_session(session_id: str) -> None:
+    tracker = _worker_trackers.pop(session_id, None)
+    if tracker is not None:
+        tracker.close()
+
+
+def _start_worker_profile(interval: float) -> None:
+    global _worker_profile
+    from app.services.profiler import StackSampler
+
+    if _worker_profile is None:
+        _worker_profile = StackSampler(interval)
+        _worker_profile.start()
+
+
+def _stop_worker_profile() -> dict:
+    global _worker_profile
+    if _worker_profile is None:
+        return {}
+    _worker_profile.stop()
+    counts = _worker_profile.snapshot()
+    _worker_profile = None
+    return counts
+
+
+def _worker_background_profile(reset: bool) -> Optional[dict]:
+    from app.services.profiler import get_background_profiler
+
+    sampler = get_background_profiler()
+    return sampler.snapshot(reset=reset) if sampler is not None else None
+
+
+def _decode_and_process(image_data: str, profile: Optional[EncodingProfile], session_id: Optional[str]):
+    """Decode a base64 frame and run it through analyze_frame."""
+    from app.services.video import decode_frame, analyze_frame
+
+    timings = {}
+    decoded = decode_frame(image_data, timings=timings, profile=profile)
+    if decoded is None:
+        return None
+    image, jpeg = decoded
+    return analyze_frame(image, hands=_session_tracker(session_id), timings=timings, jpeg=jpeg, profile=profile)
+
+
+def _decode_bytes_and_process(data: bytes, offset: int, profile: Optional[EncodingProfile], session_id: Optional[str]):
+    """Decode a raw compressed frame (starting at offset) and run it through analyze_frame."""
+    from app.services.video import decode_frame, analyze_frame
+
+    timings = {}
+    decoded = decode_frame(data, offset, timings=timings, profile=profile)
+    if decoded is None:
+        return None
+    image, jpeg = decoded
+    return analyze_frame(image, hands=_session_tracker(session_id), timings=timings, jpeg=jpeg, profile=profile)
+
+
+# ---------------------------------------------------------------------------
+# Parent process side
+# ---------------------------------------------------------------------------
+
+
+class FrameExecutor:
+    """
+    Process pool for CPU-bound frame preprocessing.
+
+    The pool is made of single-process shards so that a streaming session can
+    be pinned to one worker, keeping its MediaPipe tracker warm between
+    frames. Stateless requests go to whichever shard has the least work.
+    A shard whose worker died (crash, OOM kill) is replaced by a fresh one;
+    sessions pinned to it stay pinned and get new trackers there.
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout: float, max_sessions: int = 32):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_sessions = max_sessions
+        self._ctx = multiprocessing.get_context("spawn")
+
+        self._shards = [self._new_shard() for _ in range(workers)]
+        self._pending = [0] * workers
+        self._sessions: dict[str, int] = {}
+        self._session_ids = itertools.count(1)
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarted = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _new_shard(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._ctx,
+            initializer=_init_worker,
+            initargs=(self.max_sessions,),
+        )
+
+    def _replace_shard(self, shard: int, broken: ProcessPoolExecutor) -> None:
+        """Swap a shard whose worker died for a new one (once, however many frames saw it die)."""
+        if self._shards[shard] is not broken:
+            return
+        logger.warning("Frame worker %d died, starting a new one", shard)
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._shards[shard] = self._new_shard()
+        self.restarted += 1
+
+    async def start(self) -> None:
+        """Spawn every worker up front so the first requests don't pay for it."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(shard, _worker_ready) for shard in self._shards
+        ])
+
+    def shutdown(self) -> None:
+        for shard in self._shards:
+            shard.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(self._pending)
+
+    def open_session(self) -> str:
+        """Register a streaming session and pin it to the least loaded shard."""
+        session_id = f"{os.getpid()}-{next(self._session_ids)}"
+        counts = [0] * self.workers
+        for shard in self._sessions.values():
+            counts[shard] += 1
+        self._sessions[session_id] = min(range(self.workers), key=lambda i: (counts[i], self._pending[i]))
+        return session_id
+
+    def close_session(self, session_id: str) -> None:
+        """Release a session's tracker in its worker."""
+        shard = self._sessions.pop(session_id, None)
+        if shard is not None:
+            try:
+                self._shards[shard].submit(_release_session, session_id)
+            except RuntimeError:
+                pass  # Executor already shut down
+
+    async def process(
+        self,
+        image_data: str,
+        session_id: Optional[str] = None,
+        profile: Optional[EncodingProfile] = None,
+    ) -> Optional[ProcessedFrame]:
+        """
+        Decode and preprocess a base64 frame in a worker process.
+
+        Args:
+            image_data: Base64 encoded image (may include data URL prefix)
+            session_id: Streaming session from open_session(), if any
+            profile: Encoding profile to prepare the frame for Gemini with
+                (see ProcessedFrame.model_image()), if any
+
+        Returns:
+            ProcessedFrame (image, landmarks, thumbnail), or None if the image could not be decoded
+
+        Raises:
+            ExecutorBusyError: If the queue is full
+            asyncio.TimeoutError: If the job does not finish within the timeout
+        """
+        return await self._submit(_decode_and_process, image_data, profile, session_id=session_id)
+
+    async def process_bytes(
+        self,
+        data: bytes,
+        offset: int = 0,
+        session_id: Optional[str] = None,
+        profile: Optional[EncodingProfile] = None,
+    ) -> Optional[ProcessedFrame]:
+        """
+        Decode and preprocess raw compressed image bytes in a worker process.
+
+        The buffer is passed as-is with the payload offset, so a binary
+        WebSocket message is never sliced or re-encoded on the event loop.
+
+        Args:
+            data: Buffer containing the compressed image
+            offset: Where the image starts in the buffer
+            session_id: Streaming session from open_session(), if any
+            profile: Encoding profile to prepare the frame for Gemini with, if any
+
+        Returns:
+            ProcessedFrame (image, landmarks, thumbnail), or None if the image could not be decoded
+        """
+        return await self._submit(_decode_bytes_and_process, data, offset, profile, session_id=session_id)
+
+    async def _submit(self, fn, *args, session_id: Optional[str] = None) -> Optional[ProcessedFrame]:
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorBusyError("Frame preprocessing queue is full")
+
+        if session_id is not None and session_id in self._sessions:
+            shard = self._sessions[session_id]
+        else:
+            session_id = None
+            shard = min(range(self.workers), key=lambda i: self._pending[i])
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        executor = self._shards[shard]
+        try:
+            job = executor.submit(fn, *args, session_id)
+        except BrokenProcessPool:
+            # Died since its last frame; this frame goes to the replacement
+            self._replace_shard(shard, executor)
+            executor = self._shards[shard]
+            try:
+                job = executor.submit(fn, *args, session_id)
+            except RuntimeError:
+                self.failed += 1
+                raise
+        except RuntimeError:
+            self.failed += 1
+            raise
+        self.submitted += 1
+        self._pending[shard] += 1
+        # A frame that timed out may still be queued or running in the worker,
+        # so it counts against the queue limit until the worker is done with it
+        job.add_done_callback(lambda _: self._call_soon(loop, self._release, shard))
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        except BrokenProcessPool:
+            # The worker died with this frame queued or running; the frame
+            # fails, but later ones go to a new worker
+            self.failed += 1
+            self._replace_shard(shard, executor)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+        elapsed = time.perf_counter() - start
+        self.completed += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        _FRAME_SECONDS.observe(elapsed)
+        timings = result.timings if result is not None and result.timings else {}
+        # Worker stages come back with the frame, since workers can't share metrics
+        for stage, seconds in timings.items():
+            histogram = _STAGE_HISTOGRAMS.get(stage)
+            if histogram is not None:
+                histogram.observe(seconds)
+        self._trace(start, elapsed, shard, timings)
+        return result
+
+    def _release(self, shard: int) -> None:
+        self._pending[shard] -= 1
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback, *args) -> None:
+        # Done callbacks run in the pool's management thread
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # Loop already closed (shutdown)
+
+    @staticmethod
+    def _trace(start: float, elapsed: float, shard: int, timings: dict) -> None:
+        """Record the preprocessing span, split into queueing/transfer and the worker's stages."""
+        span_id = tracing.record("frame_preprocess", elapsed, start=start, worker=shard)
+        if span_id is None:
+            return
+        # Worker stages ran back to back just before the result came back
+        cursor = start + elapsed - sum(timings.values())
+        tracing.record("frame_queue", max(0.0, cursor - start), start=start, parent_id=span_id)
+        for stage, seconds in timings.items():
+            tracing.record(stage, seconds, start=cursor, parent_id=span_id)
+            cursor += seconds
+
+    async def _run_on_all(self, fn, *args) -> list:
+        """Run a function once in every worker process (behind any queued frames)."""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*[loop.run_in_executor(shard, fn, *args) for shard in self._shards])
+
+    async def start_profile(self, interval: float) -> None:
+        """Start sampling stacks in every worker (see app.services.profiler)."""
+        await self._run_on_all(_start_worker_profile, interval)
+
+    async def stop_profile(self) -> list[dict]:
+        """Stop the workers' samplers and return their stack counts, by worker."""
+        return await self._run_on_all(_stop_worker_profile)
+
+    async def background_profile(self, reset: bool = False) -> list[Optional[dict]]:
+        """Get the workers' always-on sampler counts, by worker (None where disabled)."""
+        return await self._run_on_all(_worker_background_profile, reset)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "sessions": len(self._sessions),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "restarted": self.restarted,
+            "avg_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+            "max_seconds": self.max_seconds,
+        }
+
+
+async def init_frame_executor() -> FrameExecutor:
+    """Initialize and warm up the global frame preprocessing executor."""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = FrameExecutor(
+            # Every API worker on the host has its own pool, so share the cores between them
+            workers=settings.frame_workers or max(1, (os.cpu_count() or 1) // max(1, settings.web_concurrency)),
+            max_queue=settings.frame_queue_limit,
+            timeout=settings.frame_timeout,
+            max_sessions=settings.frame_worker_max_sessions,
+        )
+        await _executor.start()
+    return _executor
+
+
+async def get_frame_executor() -> FrameExecutor:
+    """Get the global frame executor, starting it on first use."""
+    if _executor is None:
+        return await init_frame_executor()
+    return _executor
+
+
+def shutdown_frame_executor() -> None:
+    """Shut down the global frame executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _executor_stat(name: str):
+    return lambda: _executor.stats()[name] if _executor is not None else None
+
+
+REGISTRY.callback(
+    "signbridge_frame_queue_depth", "Frames queued or in flight in the preprocessing pool", "gauge",
+    _executor_stat("queue_depth"),
+)
+REGISTRY.callback(
+    "signbridge_frame_sessions", "Streaming sessions pinned to preprocessing workers", "gauge",
+    _executor_stat("sessions"),
+)
+REGISTRY.callback(
+    "signbridge_frames_rejected_total", "Frames rejected because the preprocessing queue was full", "counter",
+    _executor_stat("rejected"),
+)
+REGISTRY.callback(
+    "signbridge_frames_timed_out_total", "Frames whose preprocessing timed out", "counter",
+    _executor_stat("timed_out"),
+)
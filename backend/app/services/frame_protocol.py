@@ -0,0 +1,72 @@
+import struct
+from typing import NamedTuple
+
+# WebSocket subprotocols for /api/translate/stream
+SUBPROTOCOL_BINARY = "signbridge.frames.v1"
+SUBPROTOCOL_JSON = "signbridge.json.v1"
+
+PROTOCOL_VERSION = 1
+
+# Binary frame header, network byte order:
+#   version (uint8), codec (uint8), sequence number (uint32),
+#   capture timestamp in ms (uint64), language code (4 ASCII bytes, NUL padded)
+# followed immediately by the raw compressed image bytes.
+HEADER = struct.Struct("!BBIQ4s")
+
+CODECS = {
+    1: "image/jpeg",
+    2: "image/webp",
+    3: "image/png",
+}
+CODEC_IDS = {mime: codec for codec, mime in CODECS.items()}
+
+
+class FrameProtocolError(ValueError):
+    """Raised when a binary frame is malformed."""
+
+
+class FrameHeader(NamedTuple):
+    seq: int
+    timestamp_ms: int
+    language: str
+    codec: str
+
+
+def parse_frame(data: bytes) -> tuple[FrameHeader, int]:
+    """
+    Parse the header of a binary frame without copying the payload.
+
+    Args:
+        data: The received WebSocket message
+
+    Returns:
+        Tuple of (header, payload offset into data)
+    """
+    if len(data) <= HEADER.size:
+        raise FrameProtocolError("Frame is too short")
+
+    version, codec, seq, timestamp_ms, language = HEADER.unpack_from(data, 0)
+    if version != PROTOCOL_VERSION:
+        raise FrameProtocolError(f"Unsupported frame protocol version {version}")
+    if codec not in CODECS:
+        raise FrameProtocolError(f"Unknown codec {codec}")
+
+    header = FrameHeader(
+        seq=seq,
+        timestamp_ms=timestamp_ms,
+        language=language.rstrip(b"\0").decode("ascii", "replace") or "ASL",
+        codec=CODECS[codec],
+    )
+    return header, HEADER.size
+
+
+def encode_frame(image: bytes, seq: int, timestamp_ms: int, language: str = "ASL", codec: str = "image/jpeg") -> bytes:
+    """Build a binary frame (used by clients and the benchmarks)."""
+    header = HEADER.pack(
+        PROTOCOL_VERSION,
+        CODEC_IDS[codec],
+        seq,
+        timestamp_ms,
+        language.encode("ascii")[:4],
+    )
+    return header + image
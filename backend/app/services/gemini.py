@@ -1,20 +1,22 @@
 import google.generativeai as genai
-from google.generativeai.types import RequestOptions
 from PIL import Image
-import io
-import json
-import re
 import asyncio
-from typing import Optional
+import functools
+import inspect
+from typing import Any, AsyncIterator, Optional, Union
 
 from app.config import get_settings
+from app.services.cache import get_result_cache, cache_key
+from app.services.encoding import EncodingProfile
+from app.services.singleflight import get_group
+from app.services.model_client import ModelResponse, get_model_client, parse_json_response
+from app.services.stream_parser import JsonArrayStreamParser
+from app.services.model_gateway import PRIORITY_LIVE
+from app.services.phrases import split_sign_units
 
 # Global model instance
 _model: Optional[genai.GenerativeModel] = None
 
-# Timeout for Gemini API requests (in seconds)
-GEMINI_TIMEOUT = 30
-
 
 def init_gemini(api_key: str) -> None:
     """Initialize the Gemini API client."""
@@ -35,116 +37,179 @@ def get_model() -> genai.GenerativeModel:
     return _model
 
 
-async def translate_sign_language(
-    image: Image.Image,
-    language: str = "ASL",
-) -> dict:
-    """
-    Translate sign language from an image using Gemini 3.
+class _FallbackResult(dict):
+    """Best-effort result built when the model response could not be parsed (never cached)."""
 
-    Args:
-        image: PIL Image containing sign language gesture
-        language: Sign language type (ASL, BSL, etc.)
 
-    Returns:
-        Dictionary with text, confidence, and raw_response
+def cached_result(function: str):
     """
-    model = get_model()
+    Cache a text endpoint's result keyed on (function, text, language, model).
+
+    The first argument of the decorated coroutine is the prompt text and it
+    must accept a language argument. Fallback results are not cached.
+    Concurrent misses for the same key share a single model call.
+    """
+    flights = get_group("gemini")
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            text = next(iter(bound.arguments.values()))
+            key = cache_key(function, text, bound.arguments["language"], get_settings().gemini_model)
+
+            cache = get_result_cache()
+            result = await cache.aget(key)
+            if result is not None:
+                return result
+
+            async def compute():
+                result = await func(*args, **kwargs)
+                if not isinstance(result, _FallbackResult):
+                    await cache.aset(key, result)
+                return result
+
+            return await flights.do(key, compute)
+
+        return wrapper
+    return decorator
+
 
-    prompt = f"""You are an expert sign language interpreter specializing in {language} (American Sign Language if ASL, British Sign Language if BSL).
+def _translation_result(response: ModelResponse) -> dict:
+    """Build a translation result from a translate_sign_language/translate_sign_clip response."""
+    result = response.data
+    if not isinstance(result, dict):
+        # Fallback: try to extract meaning from plain text
+        if "NO_SIGN_DETECTED" in response.text.upper():
+            return {"text": "", "confidence": 0.0, "raw_response": response.text}
+        return {
+            "text": response.text[:100],  # Truncate if too long
+            "confidence": 0.5,
+            "raw_response": response.text,
+        }
 
-Analyze this image and identify any sign language gestures being made.
+    if not result.get("detected", False) or result.get("text") == "NO_SIGN_DETECTED":
+        return {"text": "", "confidence": 0.0, "raw_response": response.text}
+
+    return {
+        "text": result.get("text", ""),
+        "confidence": float(result.get("confidence", 0.5)),
+        "raw_response": response.text,
+    }
+
+
+def _translation_prompt(language: str, subject: str, instructions: list[str], description: str) -> str:
+    """Prompt for translate_sign_language and translate_sign_clip."""
+    steps = "\n".join(f"{i}. {instruction}" for i, instruction in enumerate(instructions, 1))
+    return f"""You are an expert sign language interpreter specializing in {language} (American Sign Language if ASL, British Sign Language if BSL).
+
+{subject}
 
 Instructions:
-1. Look for hand shapes, positions, and movements
-2. Consider facial expressions if visible (they're part of sign language grammar)
-3. If you can identify a sign, provide the English translation
-4. If no clear sign is visible or the image doesn't show sign language, respond with "NO_SIGN_DETECTED"
+{steps}
 
 Respond in this exact JSON format:
 {{
     "detected": true/false,
     "text": "the translated word or phrase",
     "confidence": 0.0-1.0,
-    "description": "brief description of the hand position/gesture"
+    "description": "{description}"
 }}
 
 Only respond with the JSON, no other text."""
 
-    try:
-        # Use asyncio timeout to prevent long-running requests
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                None,
-                lambda: model.generate_content(
-                    [prompt, image],
-                    request_options=RequestOptions(timeout=GEMINI_TIMEOUT)
-                )
-            ),
-            timeout=GEMINI_TIMEOUT + 5  # Extra buffer for network overhead
-        )
-        response_text = response.text.strip()
-
-        # Try to parse JSON from response
-        try:
-            # Handle markdown code blocks
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(response_text)
-
-            if not result.get("detected", False) or result.get("text") == "NO_SIGN_DETECTED":
-                return {
-                    "text": "",
-                    "confidence": 0.0,
-                    "raw_response": response_text,
-                }
 
-            return {
-                "text": result.get("text", ""),
-                "confidence": float(result.get("confidence", 0.5)),
-                "raw_response": response_text,
-            }
-
-        except json.JSONDecodeError:
-            # Fallback: try to extract meaning from plain text
-            if "NO_SIGN_DETECTED" in response_text.upper():
-                return {
-                    "text": "",
-                    "confidence": 0.0,
-                    "raw_response": response_text,
-                }
+async def _translate(function: str, prompt: str, images: list, priority: int, profile: Optional[EncodingProfile]) -> dict:
+    """Send a translation prompt with its images through the model gateway and parse the answer."""
+    response = await get_model_client().generate_json(
+        function, get_model(), [prompt, *images], priority=priority, image_profile=profile
+    )
+    return _translation_result(response)
 
-            return {
-                "text": response_text[:100],  # Truncate if too long
-                "confidence": 0.5,
-                "raw_response": response_text,
-            }
 
-    except Exception as e:
-        raise ValueError(f"Gemini API error: {str(e)}")
+async def translate_sign_language(
+    image: Union[Image.Image, dict],
+    language: str = "ASL",
+    priority: int = PRIORITY_LIVE,
+    profile: Optional[EncodingProfile] = None,
+) -> dict:
+    """
+    Translate sign language from an image using Gemini 3.
 
+    Args:
+        image: PIL Image containing sign language gesture, or an inline
+            image part ({"mime_type", "data"}, see ProcessedFrame.model_image())
+        language: Sign language type (ASL, BSL, etc.)
+        priority: Model gateway priority class
+        profile: Encoding profile for a PIL image (see app.services.encoding)
 
-async def get_sign_guidance(
-    text: str,
+    Returns:
+        Dictionary with text, confidence, and raw_response
+    """
+    prompt = _translation_prompt(
+        language,
+        "Analyze this image and identify any sign language gestures being made.",
+        [
+            "Look for hand shapes, positions, and movements",
+            "Consider facial expressions if visible (they're part of sign language grammar)",
+            "If you can identify a sign, provide the English translation",
+            "If no clear sign is visible or the image doesn't show sign language, respond with \"NO_SIGN_DETECTED\"",
+        ],
+        "brief description of the hand position/gesture",
+    )
+    return await _translate("translate_sign_language", prompt, [image], priority, profile)
+
+
+async def translate_sign_clip(
+    images: list[Image.Image],
     language: str = "ASL",
+    tiled: bool = False,
+    priority: int = PRIORITY_LIVE,
+    profile: Optional[EncodingProfile] = None,
 ) -> dict:
     """
-    Get step-by-step guidance for signing text.
+    Translate one complete sign from a few keyframes in a single Gemini call.
 
     Args:
-        text: Text to convert to sign language
-        language: Target sign language type
+        images: Keyframes in temporal order, or one contact sheet if tiled
+        language: Sign language type (ASL, BSL, etc.)
+        tiled: True if images[0] is a contact sheet of keyframes
+        priority: Model gateway priority class
+        profile: Encoding profile for the images (see app.services.encoding)
 
     Returns:
-        Dictionary with steps and notes
+        Dictionary with text, confidence, and raw_response
     """
-    model = get_model()
-
-    prompt = f"""You are an expert {language} sign language instructor.
+    if tiled:
+        frames_description = (
+            "The image is a contact sheet of keyframes from ONE sign, in temporal order "
+            "left-to-right, top-to-bottom."
+        )
+    elif len(images) > 1:
+        frames_description = f"The {len(images)} images are keyframes from ONE sign, in temporal order."
+    else:
+        frames_description = "The image shows ONE sign (a held handshape)."
+
+    prompt = _translation_prompt(
+        language,
+        frames_description,
+        [
+            "Follow the hand shapes, positions, and movement across the frames",
+            "Consider facial expressions if visible (they're part of sign language grammar)",
+            "If you can identify the sign, provide the English translation",
+            "If no clear sign is visible, respond with \"NO_SIGN_DETECTED\"",
+        ],
+        "brief description of the movement",
+    )
+    return await _translate("translate_sign_clip", prompt, images, priority, profile)
+
+
+def _sign_guidance_prompt(text: str, language: str) -> str:
+    """Prompt for get_sign_guidance and stream_sign_guidance."""
+    return f"""You are an expert {language} sign language instructor.
 
 Provide detailed, step-by-step instructions for signing the following text:
 "{text}"
@@ -170,70 +235,10 @@ Respond in this exact JSON format:
 
 Only respond with the JSON, no other text."""
 
-    try:
-        # Use asyncio timeout to prevent long-running requests
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                None,
-                lambda: model.generate_content(
-                    prompt,
-                    request_options=RequestOptions(timeout=GEMINI_TIMEOUT)
-                )
-            ),
-            timeout=GEMINI_TIMEOUT + 5
-        )
-        response_text = response.text.strip()
-
-        # Parse JSON
-        try:
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(response_text)
-
-            return {
-                "steps": result.get("steps", []),
-                "notes": result.get("notes"),
-            }
-
-        except json.JSONDecodeError:
-            # Fallback: create basic response
-            return {
-                "steps": [
-                    {
-                        "step": 1,
-                        "description": response_text,
-                        "hand_position": "See description",
-                        "movement": None,
-                    }
-                ],
-                "notes": "Could not parse structured response",
-            }
-
-    except Exception as e:
-        raise ValueError(f"Gemini API error: {str(e)}")
-
-
-async def get_visual_sign_guidance(
-    text: str,
-    language: str = "ASL",
-) -> dict:
-    """
-    Get detailed visual guidance for signing text, including video resource suggestions.
-
-    Args:
-        text: Text to convert to sign language
-        language: Target sign language type
 
-    Returns:
-        Dictionary with steps, video resources, tips, and common mistakes
-    """
-    model = get_model()
-
-    prompt = f"""You are an expert {language} sign language instructor specializing in visual teaching methods.
+def _visual_guidance_prompt(text: str, language: str) -> str:
+    """Prompt for get_word_sign_guidance."""
+    return f"""You are an expert {language} sign language instructor specializing in visual teaching methods.
 
 Provide detailed visual guidance for signing the following text:
 "{text}"
@@ -285,68 +290,291 @@ Respond in this exact JSON format:
 
 Only respond with the JSON, no other text."""
 
-    try:
-        # Use asyncio timeout to prevent long-running requests
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                None,
-                lambda: model.generate_content(
-                    prompt,
-                    request_options=RequestOptions(timeout=GEMINI_TIMEOUT)
-                )
-            ),
-            timeout=GEMINI_TIMEOUT + 5
-        )
-        response_text = response.text.strip()
 
-        # Parse JSON
-        try:
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(response_text)
-
-            return {
-                "steps": result.get("steps", []),
-                "video_resources": result.get("video_resources", []),
-                "tips": result.get("tips"),
-                "common_mistakes": result.get("common_mistakes"),
-            }
-
-        except json.JSONDecodeError:
-            # Fallback: create basic response
-            return {
-                "steps": [
-                    {
-                        "step": 1,
-                        "word": text,
-                        "description": response_text,
-                        "hand_shape": "See description",
-                        "palm_orientation": "See description",
-                        "location": "See description",
-                        "movement": None,
-                        "facial_expression": None,
-                        "video_search_query": f"ASL sign for {text}",
-                    }
-                ],
-                "video_resources": [
-                    {
-                        "title": f"Search for '{text}' on HandSpeak",
-                        "url": f"https://www.handspeak.com/word/search/index.php?id={text.replace(' ', '+')}",
-                        "source": "HandSpeak",
-                    }
-                ],
-                "tips": "Could not parse structured response",
-                "common_mistakes": None,
-            }
-
-    except Exception as e:
-        raise ValueError(f"Gemini API error: {str(e)}")
+def _sign_guidance_result(response_text: str, data) -> dict:
+    """Build a get_sign_guidance result from the parsed response."""
+    if not isinstance(data, dict):
+        # Fallback: create basic response
+        return _FallbackResult({
+            "steps": [
+                {
+                    "step": 1,
+                    "description": response_text,
+                    "hand_position": "See description",
+                    "movement": None,
+                }
+            ],
+            "notes": "Could not parse structured response",
+        })
+
+    return {
+        "steps": data.get("steps", []),
+        "notes": data.get("notes"),
+    }
+
+
+def _visual_guidance_result(text: str, response_text: str, data) -> dict:
+    """Build a get_word_sign_guidance result from the parsed response."""
+    if not isinstance(data, dict):
+        # Fallback: create basic response
+        return _FallbackResult({
+            "steps": [
+                {
+                    "step": 1,
+                    "word": text,
+                    "description": response_text,
+                    "hand_shape": "See description",
+                    "palm_orientation": "See description",
+                    "location": "See description",
+                    "movement": None,
+                    "facial_expression": None,
+                    "video_search_query": f"ASL sign for {text}",
+                }
+            ],
+            "video_resources": [
+                {
+                    "title": f"Search for '{text}' on HandSpeak",
+                    "url": f"https://www.handspeak.com/word/search/index.php?id={text.replace(' ', '+')}",
+                    "source": "HandSpeak",
+                }
+            ],
+            "tips": "Could not parse structured response",
+            "common_mistakes": None,
+        })
+
+    return {
+        "steps": data.get("steps", []),
+        "video_resources": data.get("video_resources", []),
+        "tips": data.get("tips"),
+        "common_mistakes": data.get("common_mistakes"),
+    }
+
+
+@cached_result("sign_guidance")
+async def get_sign_guidance(
+    text: str,
+    language: str = "ASL",
+) -> dict:
+    """
+    Get step-by-step guidance for signing text.
+
+    Args:
+        text: Text to convert to sign language
+        language: Target sign language type
+
+    Returns:
+        Dictionary with steps and notes
+    """
+    model = get_model()
+    prompt = _sign_guidance_prompt(text, language)
+
+    response = await get_model_client().generate_json("sign_guidance", model, prompt)
+    return _sign_guidance_result(response.text, response.data)
+
+
+@cached_result("word_sign_guidance")
+async def get_word_sign_guidance(
+    unit: str,
+    language: str = "ASL",
+) -> dict:
+    """
+    Get visual guidance for a single sign unit (a word or a lexicalized phrase).
+
+    Args:
+        unit: Word or phrase signed as one unit (see split_sign_units())
+        language: Target sign language type
+
+    Returns:
+        Dictionary with steps, video resources, tips, and common mistakes
+    """
+    model = get_model()
+    prompt = _visual_guidance_prompt(unit, language)
+
+    response = await get_model_client().generate_json("word_sign_guidance", model, prompt)
+    return _visual_guidance_result(unit, response.text, response.data)
+
+
+def _merge_visual_guidance(units: list[str], results: list[dict]) -> dict:
+    """Merge word-level guidance in signing order, renumbering the steps."""
+    if len(results) == 1:
+        return results[0]
+
+    steps = []
+    video_resources = []
+    seen_urls = set()
+    tips = []
+    common_mistakes = []
+    for unit, result in zip(units, results):
+        for step in result.get("steps", []):
+            if isinstance(step, dict):
+                steps.append({**step, "step": len(steps) + 1})
+        for resource in result.get("video_resources", []):
+            url = resource.get("url") if isinstance(resource, dict) else None
+            if url not in seen_urls:
+                seen_urls.add(url)
+                video_resources.append(resource)
+        if result.get("tips"):
+            tips.append(f"{unit}: {result['tips']}")
+        if result.get("common_mistakes"):
+            common_mistakes.append(f"{unit}: {result['common_mistakes']}")
+
+    merged = {
+        "steps": steps,
+        "video_resources": video_resources,
+        "tips": "\n".join(tips) or None,
+        "common_mistakes": "\n".join(common_mistakes) or None,
+    }
+    # A phrase with any unparsed word is not cached either
+    if any(isinstance(result, _FallbackResult) for result in results):
+        return _FallbackResult(merged)
+    return merged
+
+
+def _sign_units(text: str) -> list[str]:
+    """Split text into sign units for visual guidance, at most settings.guidance_max_units."""
+    units = split_sign_units(text) or [text]
+    limit = get_settings().guidance_max_units
+    if len(units) > limit:
+        raise ValueError(f"Text has {len(units)} signs; at most {limit} are supported per request")
+    return units
+
+
+@cached_result("visual_sign_guidance")
+async def get_visual_sign_guidance(
+    text: str,
+    language: str = "ASL",
+) -> dict:
+    """
+    Get detailed visual guidance for signing text, including video resource suggestions.
 
+    The text is split into sign units and each unit's guidance comes from
+    the word-level cache, so only new words cost a model call; misses are
+    requested concurrently, settings.guidance_unit_concurrency at a time.
 
+    Args:
+        text: Text to convert to sign language
+        language: Target sign language type
+
+    Returns:
+        Dictionary with steps, video resources, tips, and common mistakes
+
+    Raises:
+        ValueError: If the text has more than settings.guidance_max_units sign units
+    """
+    units = _sign_units(text)
+    semaphore = asyncio.Semaphore(max(1, get_settings().guidance_unit_concurrency))
+
+    async def unit_guidance(unit: str) -> dict:
+        async with semaphore:
+            return await get_word_sign_guidance(unit, language)
+
+    results = await asyncio.gather(*(unit_guidance(unit) for unit in units))
+    return _merge_visual_guidance(units, list(results))
+
+
+async def _stream_guidance(function: str, prompt: str, text: str, language: str, build_result) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Stream guidance steps as each one is generated.
+
+    Yields ("step", step) for every step, then ("done", full result). A
+    cached result is replayed at once; a freshly streamed one is cached
+    for the non-streaming endpoint too.
+    """
+    cache = get_result_cache()
+    key = cache_key(function, text, language, get_settings().gemini_model)
+    result = await cache.aget(key)
+    if result is not None:
+        for step in result["steps"]:
+            yield "step", step
+        yield "done", result
+        return
+
+    parser = JsonArrayStreamParser("steps")
+    streamed = 0
+    async for chunk in get_model_client().stream(f"{function}_stream", get_model(), prompt, json_response=True):
+        for step in parser.feed(chunk):
+            streamed += 1
+            yield "step", step
+
+    result = build_result(*parse_json_response(parser.text))
+    if not isinstance(result, _FallbackResult):
+        await cache.aset(key, result)
+
+    # Steps the incremental parser couldn't pick out (e.g. the fallback step)
+    for step in result["steps"][streamed:]:
+        yield "step", step
+    yield "done", result
+
+
+def stream_sign_guidance(text: str, language: str = "ASL") -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming get_sign_guidance: yields ("step", step) as each step is generated, then ("done", result).
+
+    Args:
+        text: Text to convert to sign language
+        language: Target sign language type
+    """
+    return _stream_guidance(
+        "sign_guidance", _sign_guidance_prompt(text, language), text, language, _sign_guidance_result,
+    )
+
+
+async def stream_visual_sign_guidance(text: str, language: str = "ASL") -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming get_visual_sign_guidance: yields ("step", step) as each step is generated, then ("done", result).
+
+    Units are streamed settings.guidance_unit_concurrency at a time, each
+    through the word-level cache like stream_sign_guidance. Steps are sent
+    in signing order: the current unit's steps as the model generates them,
+    later units' steps as soon as every unit before them has finished.
+
+    Args:
+        text: Text to convert to sign language
+        language: Target sign language type
+
+    Raises:
+        ValueError: If the text has more than settings.guidance_max_units sign units
+    """
+    units = _sign_units(text)
+    semaphore = asyncio.Semaphore(max(1, get_settings().guidance_unit_concurrency))
+    queues = [asyncio.Queue() for _ in units]
+
+    async def stream_unit(unit: str, queue: asyncio.Queue) -> None:
+        try:
+            async with semaphore:
+                async for event in _stream_guidance(
+                    "word_sign_guidance",
+                    _visual_guidance_prompt(unit, language),
+                    unit,
+                    language,
+                    functools.partial(_visual_guidance_result, unit),
+                ):
+                    queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(("error", e))
+
+    tasks = [asyncio.ensure_future(stream_unit(unit, queue)) for unit, queue in zip(units, queues)]
+    try:
+        results = []
+        number = 0
+        for queue in queues:
+            while True:
+                kind, data = await queue.get()
+                if kind == "error":
+                    raise data
+                if kind == "done":
+                    results.append(data)
+                    break
+                if isinstance(data, dict):
+                    number += 1
+                    yield "step", {**data, "step": number}
+        yield "done", _merge_visual_guidance(units, results)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@cached_result("hand_pose")
 async def generate_hand_pose(
     sign: str,
     language: str = "ASL",
@@ -395,51 +623,25 @@ Respond in this exact JSON format:
 Be precise with the values to accurately represent the {language} sign for "{sign}".
 Only respond with the JSON, no other text."""
 
-    try:
-        # Use asyncio timeout to prevent long-running requests
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                None,
-                lambda: model.generate_content(
-                    prompt,
-                    request_options=RequestOptions(timeout=GEMINI_TIMEOUT)
-                )
-            ),
-            timeout=GEMINI_TIMEOUT + 5
-        )
-        response_text = response.text.strip()
-
-        # Parse JSON
-        try:
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(response_text)
-
-            return {
-                "sign": sign,
-                "pose": result.get("pose", {}),
-                "description": result.get("description", ""),
-            }
-
-        except json.JSONDecodeError:
-            # Fallback: return default pose
-            return {
-                "sign": sign,
-                "pose": {
-                    "thumb": {"curl": 0.2, "spread": 0.3},
-                    "index": {"curl": 0.1, "spread": 0.0},
-                    "middle": {"curl": 0.1, "spread": 0.0},
-                    "ring": {"curl": 0.1, "spread": 0.0},
-                    "pinky": {"curl": 0.1, "spread": 0.0},
-                    "wrist_rotation": {"x": 0, "y": 0, "z": 0},
-                    "palm_direction": "forward",
-                },
-                "description": "Default relaxed hand position. Could not parse specific pose.",
-            }
-
-    except Exception as e:
-        raise ValueError(f"Gemini API error: {str(e)}")
+    response = await get_model_client().generate_json("hand_pose", model, prompt)
+    if not isinstance(response.data, dict):
+        # Fallback: return default pose
+        return _FallbackResult({
+            "sign": sign,
+            "pose": {
+                "thumb": {"curl": 0.2, "spread": 0.3},
+                "index": {"curl": 0.1, "spread": 0.0},
+                "middle": {"curl": 0.1, "spread": 0.0},
+                "ring": {"curl": 0.1, "spread": 0.0},
+                "pinky": {"curl": 0.1, "spread": 0.0},
+                "wrist_rotation": {"x": 0, "y": 0, "z": 0},
+                "palm_direction": "forward",
+            },
+            "description": "Default relaxed hand position. Could not parse specific pose.",
+        })
+
+    return {
+        "sign": sign,
+        "pose": response.data.get("pose", {}),
+        "description": response.data.get("description", ""),
+    }
@@ -0,0 +1,166 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import mediapipe as mp
+
+    MEDIAPIPE_AVAILABLE = True
+except ImportError:
+    MEDIAPIPE_AVAILABLE = False
+
+from app.config import get_settings
+
+# Global detector pool instance
+_pool: Optional["HandsPool"] = None
+_pool_lock = threading.Lock()
+
+
+def create_hands(static_image_mode: bool = True):
+    """
+    Create a MediaPipe Hands detector using the configured settings.
+
+    Args:
+        static_image_mode: True runs full palm detection on every image,
+            False enables MediaPipe's tracking path for consecutive frames
+
+    Returns:
+        A MediaPipe Hands instance (caller is responsible for closing it)
+    """
+    settings = get_settings()
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=settings.hands_max_num_hands,
+        min_detection_confidence=settings.hands_min_detection_confidence,
+        min_tracking_confidence=settings.hands_min_tracking_confidence,
+    )
+
+
+class HandsPool:
+    """
+    Bounded pool of long-lived MediaPipe Hands detectors.
+
+    Building a Hands instance loads the TFLite graph, which costs far more
+    than running inference on a single frame, so detectors are created once
+    and checked out per frame instead.
+    """
+
+    def __init__(self, size: int, checkout_timeout: float = 10.0):
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        self._all: list = []
+        self._closed = False
+
+        for _ in range(size):
+            hands = create_hands(static_image_mode=True)
+            self._all.append(hands)
+            self._idle.put(hands)
+
+    @contextmanager
+    def checkout(self) -> Iterator:
+        """
+        Borrow a detector for the duration of a with block.
+
+        Blocks until a detector is free, raising RuntimeError if none becomes
+        available within the checkout timeout.
+        """
+        if self._closed:
+            raise RuntimeError("Hands pool is closed")
+
+        try:
+            hands = self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise RuntimeError("Timed out waiting for a MediaPipe Hands detector")
+
+        try:
+            yield hands
+        finally:
+            self._idle.put(hands)
+
+    def close(self) -> None:
+        """Release every detector owned by the pool."""
+        self._closed = True
+        for hands in self._all:
+            try:
+                hands.close()
+            except Exception as e:
+                print(f"Error closing MediaPipe Hands: {e}")
+        self._all = []
+
+
+def init_hands_pool(size: Optional[int] = None) -> Optional[HandsPool]:
+    """
+    Initialize the global MediaPipe Hands detector pool.
+
+    Args:
+        size: Number of detectors to create (defaults to settings.hands_pool_size)
+
+    Returns:
+        The pool, or None if MediaPipe is not installed
+    """
+    global _pool
+    if not MEDIAPIPE_AVAILABLE:
+        return None
+
+    settings = get_settings()
+    with _pool_lock:
+        if _pool is None:
+            _pool = HandsPool(
+                size=size or settings.hands_pool_size,
+                checkout_timeout=settings.hands_checkout_timeout,
+            )
+    return _pool
+
+
+def get_hands_pool() -> Optional[HandsPool]:
+    """Get the global detector pool, creating it on first use."""
+    if _pool is None:
+        return init_hands_pool()
+    return _pool
+
+
+def close_hands_pool() -> None:
+    """Close the global detector pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def hands_detector(hands=None) -> Iterator:
+    """
+    Yield a detector to run a single frame through.
+
+    Uses the given detector (e.g. a per-connection tracker) when provided,
+    otherwise checks one out of the global pool.
+    """
+    if hands is not None:
+        yield hands
+        return
+
+    pool = get_hands_pool()
+    if pool is None:
+        raise RuntimeError("MediaPipe is not available")
+
+    with pool.checkout() as pooled:
+        yield pooled
+
+
+def create_tracker():
+    """
+    Create a per-connection Hands tracker for streaming.
+
+    Runs with static_image_mode=False so consecutive frames from the same
+    client take MediaPipe's cheap tracking path instead of full palm
+    detection. The caller must close() it when the connection ends.
+
+    Returns:
+        A MediaPipe Hands instance, or None if MediaPipe is not installed
+    """
+    if not MEDIAPIPE_AVAILABLE:
+        return None
+    return create_hands(static_image_mode=False)
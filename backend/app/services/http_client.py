@@ -0,0 +1,78 @@
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import get_settings
+
+# Global shared client instance
+_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (installed by httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def init_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Initialize the shared HTTP client used to fetch sign media.
+
+    One pooled client keeps connections to Lifeprint and HandSpeak alive
+    across lookups, so DNS, TCP and TLS handshakes are paid once per host
+    instead of once per word.
+
+    Args:
+        **kwargs: Extra httpx.AsyncClient arguments (e.g. event_hooks, transport)
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    global _client
+    settings = get_settings()
+
+    _client = httpx.AsyncClient(
+        http2=settings.http_http2 and http2_available(),
+        follow_redirects=True,
+        timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        headers={"User-Agent": f"{settings.app_name}/{settings.app_version}"},
+        **kwargs,
+    )
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    if _client is None or _client.is_closed:
+        return init_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def host_timeout(url: str) -> httpx.Timeout:
+    """
+    Get the request timeout for a URL's host.
+
+    Hosts listed in settings.http_host_timeouts override the default total
+    timeout; the connect timeout is shared.
+    """
+    settings = get_settings()
+    host = urlsplit(url).hostname or ""
+    total = settings.http_host_timeouts.get(host, settings.http_timeout)
+    return httpx.Timeout(total, connect=min(settings.http_connect_timeout, total))
@@ -0,0 +1,658 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Optional
+
+from app.config import get_settings
+from app.services.video_pipeline import translate_video_file
+
+logger = logging.getLogger(__name__)
+
+# Global job manager instance
+_manager: Optional["JobManager"] = None
+
+# Job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_INTERRUPTED = "interrupted"  # Stopped by a shutdown; any worker picks it up again
+CLAIMABLE_STATUSES = (JOB_QUEUED, JOB_INTERRUPTED)
+TERMINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+# Columns of the jobs table, in table order
+JOB_FIELDS = [
+    "id",
+    "status",
+    "language",
+    "mode",
+    "video_path",
+    "checkpoint_frame",
+    "frames_done",
+    "total_frames",
+    "error",
+    "created_at",
+    "updated_at",
+    "owner",
+    "heartbeat_at",
+]
+
+# Columns of the job_results table after job_id, in table order
+RESULT_FIELDS = ["start_frame", "end_frame", "start", "end", "kind", "text", "confidence"]
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many jobs are queued or running to accept another."""
+
+
+class JobStore:
+    """
+    Persistent video job records and partial transcripts, backed by SQLite.
+
+    Each job keeps a checkpoint frame: every result before it has been
+    stored, so a job interrupted by a restart resumes decoding from there.
+
+    The database is shared by every API worker process on the host. A job
+    is run by the worker that claimed it (its owner); the other workers
+    only see it through the database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Other worker processes write to the same file
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, language TEXT NOT NULL, mode TEXT, "
+            "video_path TEXT NOT NULL, checkpoint_frame INTEGER NOT NULL DEFAULT 0, "
+            "frames_done INTEGER NOT NULL DEFAULT 0, total_frames INTEGER NOT NULL DEFAULT 0, "
+            "error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_results ("
+            "job_id TEXT NOT NULL, start_frame INTEGER NOT NULL, end_frame INTEGER NOT NULL, "
+            "start REAL NOT NULL, end REAL NOT NULL, kind TEXT NOT NULL, text TEXT NOT NULL, "
+            "confidence REAL NOT NULL, PRIMARY KEY (job_id, start_frame))"
+        )
+        # Added after the first release: upgrade older databases in place
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        if "heartbeat_at" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL NOT NULL DEFAULT 0")
+
+    def create(self, job_id: str, video_path: str, language: str, mode: Optional[str]) -> dict:
+        now = time.time()
+        job = {
+            "id": job_id,
+            "status": JOB_QUEUED,
+            "language": language,
+            "mode": mode,
+            "video_path": video_path,
+            "checkpoint_frame": 0,
+            "frames_done": 0,
+            "total_frames": 0,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "owner": None,
+            "heartbeat_at": 0.0,
+        }
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(JOB_FIELDS)}) VALUES ({', '.join('?' * len(JOB_FIELDS))})",
+                tuple(job[field] for field in JOB_FIELDS),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(JOB_FIELDS, row)) if row else None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(JOB_FIELDS, row)) for row in rows]
+
+    def claimable(self, stale_before: float, limit: int) -> list[str]:
+        """
+        IDs of jobs waiting for a worker, oldest first.
+
+        That is queued and interrupted jobs, and running jobs whose owner
+        hasn't sent a heartbeat since stale_before (its process died).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) OR (status = ? AND heartbeat_at < ?) "
+                "ORDER BY created_at LIMIT ?",
+                (*CLAIMABLE_STATUSES, JOB_RUNNING, stale_before, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, job_id: str, owner: str, stale_before: float) -> bool:
+        """
+        Atomically take a claimable job and mark it running.
+
+        Returns:
+            True if this owner got the job, False if another worker did (or it finished)
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET owner = ?, status = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND (status IN (?, ?) OR (status = ? AND heartbeat_at < ?))",
+                (owner, JOB_RUNNING, now, now, job_id, *CLAIMABLE_STATUSES, JOB_RUNNING, stale_before),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, owner: str, status: str = JOB_INTERRUPTED) -> bool:
+        """Hand a job this owner is running back for any worker to claim."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET owner = NULL, status = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (status, time.time(), job_id, owner, JOB_RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, owner: str) -> None:
+        """Mark every job this owner is running as still alive."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?",
+                (time.time(), owner, JOB_RUNNING),
+            )
+
+    def active(self) -> int:
+        """Jobs queued, interrupted or running, across every worker."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?, ?)", (*CLAIMABLE_STATUSES, JOB_RUNNING)
+            ).fetchone()
+        return row[0]
+
+    def update(self, job_id: str, owner: Optional[str] = None, **fields) -> bool:
+        """
+        Update a job that hasn't finished.
+
+        Args:
+            job_id: Job ID
+            owner: If given, only update the job while this owner is running it
+            **fields: Columns to set
+
+        Returns:
+            False if the job already finished (e.g. it was cancelled) or, with
+            owner, is no longer running under that owner
+        """
+        fields["updated_at"] = time.time()
+        where = f"id = ? AND status NOT IN ({', '.join('?' * len(TERMINAL_STATUSES))})"
+        params = [job_id, *TERMINAL_STATUSES]
+        if owner is not None:
+            where += " AND owner = ? AND status = ?"
+            params += [owner, JOB_RUNNING]
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE {where}",
+                (*fields.values(), *params),
+            )
+        return cursor.rowcount == 1
+
+    def add_result(self, job_id: str, result: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO job_results (job_id, {', '.join(RESULT_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(RESULT_FIELDS))})",
+                (job_id, *(result[field] for field in RESULT_FIELDS)),
+            )
+
+    def results(self, job_id: str) -> list[dict]:
+        """Stored results for a job, in video order."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(RESULT_FIELDS)} FROM job_results WHERE job_id = ? ORDER BY start_frame",
+                (job_id,),
+            ).fetchall()
+        return [dict(zip(RESULT_FIELDS, row)) for row in rows]
+
+    def results_since(self, job_id: str, after: int = 0) -> tuple[list[dict], int]:
+        """
+        Results stored for a job after a position, in the order they were stored.
+
+        Args:
+            job_id: Job ID
+            after: Position returned by a previous call (0 for every result)
+
+        Returns:
+            Tuple of (results, position of the last one)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT rowid, {', '.join(RESULT_FIELDS)} FROM job_results WHERE job_id = ? AND rowid > ? "
+                "ORDER BY rowid",
+                (job_id, after),
+            ).fetchall()
+        position = rows[-1][0] if rows else after
+        return [dict(zip(RESULT_FIELDS, row[1:])) for row in rows], position
+
+    def purge(self, before: float) -> list[dict]:
+        """
+        Delete finished jobs last updated before a timestamp.
+
+        Returns:
+            The deleted jobs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE status IN (?, ?, ?) AND updated_at < ?",
+                (*TERMINAL_STATUSES, before),
+            ).fetchall()
+            jobs = [dict(zip(JOB_FIELDS, row)) for row in rows]
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for job in jobs:
+                    self._conn.execute("DELETE FROM job_results WHERE job_id = ?", (job["id"],))
+                    self._conn.execute("DELETE FROM jobs WHERE id = ?", (job["id"],))
+                self._conn.execute("COMMIT")
+            except Exception:
+                # Don't leave the shared connection inside the failed transaction
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                raise
+        return jobs
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def job_view(job: dict, results: Optional[list[dict]] = None) -> dict:
+    """Public view of a job record, optionally with its partial transcript."""
+    view = {
+        "id": job["id"],
+        "status": job["status"],
+        "language": job["language"],
+        "mode": job["mode"],
+        "progress": min(1.0, job["frames_done"] / job["total_frames"]) if job["total_frames"] else 0.0,
+        "frames_done": job["frames_done"],
+        "total_frames": job["total_frames"],
+        "checkpoint_frame": job["checkpoint_frame"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+    if job["status"] == JOB_COMPLETED:
+        view["progress"] = 1.0
+    if results is not None:
+        view["results"] = results
+        view["transcript"] = " ".join(result["text"] for result in results if result["text"])
+    return view
+
+
+class JobManager:
+    """
+    Runs video translation jobs in the background, at most max_concurrent at a time in this process.
+
+    Every API worker on the host shares the JobStore and polls it every
+    poll_interval: it claims waiting jobs while it has free slots (a claim
+    is one atomic update, so each job runs in exactly one worker), sends
+    heartbeats for the jobs it runs, stops jobs cancelled from another
+    worker, and purges old finished jobs every purge_interval. Jobs a dead
+    worker left running are taken over once their heartbeat is older than
+    stale_seconds; jobs stopped by a shutdown are taken over right away.
+
+    Job store calls run in a thread: with several workers writing, one can
+    wait up to the busy timeout for the database lock, which must not stall
+    the event loop (and every live stream with it).
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        jobs_dir: str,
+        max_concurrent: int = 2,
+        max_queued: int = 32,
+        checkpoint_interval: float = 2.0,
+        poll_interval: float = 1.0,
+        stale_seconds: float = 30.0,
+        retention_seconds: float = 7 * 24 * 3600,
+        purge_interval: float = 3600.0,
+    ):
+        self.store = store
+        self.jobs_dir = jobs_dir
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max_queued
+        self.checkpoint_interval = checkpoint_interval
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.retention_seconds = retention_seconds
+        self.purge_interval = purge_interval
+        # Unique even if the process ID is reused after a crash
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._poller: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+        os.makedirs(jobs_dir, exist_ok=True)
+
+        self.submitted = 0
+        self.claimed = 0
+
+    def start(self) -> None:
+        """Start polling the job store (from the running event loop)."""
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def check_capacity(self) -> None:
+        """Raise JobQueueFullError if no more jobs can be accepted."""
+        if await asyncio.to_thread(self.store.active) >= self.max_queued:
+            raise JobQueueFullError("Too many video jobs queued")
+
+    async def submit(self, video_path: str, language: str = "ASL", mode: Optional[str] = None) -> dict:
+        """
+        Queue a job for an uploaded video.
+
+        Args:
+            video_path: Uploaded file; it is moved into jobs_dir and deleted when the job finishes
+            language: Sign language type
+            mode: "segment" or "frame", defaults to settings.stream_mode
+
+        Returns:
+            The job record
+        """
+        await self.check_capacity()
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self.jobs_dir, f"{job_id}.video")
+        os.replace(video_path, path)
+
+        job = await asyncio.to_thread(self.store.create, job_id, path, language, mode)
+        self.submitted += 1
+        # Claim it here if there is a free slot, rather than at the next poll
+        self._wakeup.set()
+        return job
+
+    async def claim_jobs(self) -> int:
+        """Claim waiting jobs while this process has free slots."""
+        free = self.max_concurrent - len(self._tasks)
+        if free <= 0:
+            return 0
+        stale_before = time.time() - self.stale_seconds
+        count = 0
+        # Other workers may win some of the claims, so look a bit further ahead
+        for job_id in await asyncio.to_thread(self.store.claimable, stale_before, limit=free * 4):
+            if count >= free:
+                break
+            if job_id in self._tasks:
+                continue
+            if await asyncio.to_thread(self.store.claim, job_id, self.owner, stale_before):
+                self._start(job_id)
+                count += 1
+        self.claimed += count
+        return count
+
+    async def purge(self) -> int:
+        """Delete finished jobs older than the retention period, and their videos."""
+        jobs = await asyncio.to_thread(self.store.purge, time.time() - self.retention_seconds)
+        for job in jobs:
+            self._remove_video(job["video_path"])
+        return len(jobs)
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancel a queued or running job, whichever worker runs it.
+
+        Returns:
+            The updated job record, or None if there is no such job
+        """
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return None
+        if job["status"] in TERMINAL_STATUSES or not await asyncio.to_thread(
+            self.store.update, job_id, status=JOB_CANCELLED
+        ):
+            return await asyncio.to_thread(self.store.get, job_id)
+
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        elif job["status"] in CLAIMABLE_STATUSES:
+            self._remove_video(job["video_path"])
+        # Otherwise another worker runs it: it stops at its next checkpoint or
+        # poll and deletes the video
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def events(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        Follow a job through the job store, whichever worker runs it.
+
+        Yields {"type": "job", "data": <job with results so far>} first, then
+        a {"type": "translation"} event per new result, {"type": "progress"}
+        when the checkpoint moves and {"type": "status"} when the status
+        changes, every poll_interval. Ends after a final status (or
+        {"type": "error"} if there is no such job).
+        """
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            yield {"type": "error", "error": "Job not found"}
+            return
+
+        results, position = await asyncio.to_thread(self.store.results_since, job_id)
+        results.sort(key=lambda result: result["start_frame"])
+        yield {"type": "job", "data": job_view(job, results)}
+
+        while job["status"] not in TERMINAL_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            # Results first: everything stored before a final status is sent before it
+            current = await asyncio.to_thread(self.store.get, job_id)
+            results, position = await asyncio.to_thread(self.store.results_since, job_id, position)
+            for result in results:
+                yield {"type": "translation", **result}
+            if current is None:
+                return  # Purged
+            if current["updated_at"] == job["updated_at"]:
+                continue
+
+            if (current["frames_done"], current["checkpoint_frame"]) != (job["frames_done"], job["checkpoint_frame"]):
+                yield {
+                    "type": "progress",
+                    "frame": current["frames_done"],
+                    "checkpoint": current["checkpoint_frame"],
+                    "total_frames": current["total_frames"],
+                }
+            if current["status"] != job["status"]:
+                yield {"type": "status", "status": current["status"], "error": current["error"]}
+            job = current
+
+    async def _poll(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._maintain()
+            except Exception as e:
+                logger.warning("Video job poll failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _maintain(self) -> None:
+        if self._tasks:
+            await asyncio.to_thread(self.store.heartbeat, self.owner)
+            # Cancelled from another worker
+            for job_id, task in list(self._tasks.items()):
+                job = await asyncio.to_thread(self.store.get, job_id)
+                if job is None or job["status"] == JOB_CANCELLED:
+                    task.cancel()
+
+        await self.claim_jobs()
+
+        now = time.monotonic()
+        if not self._last_purge or now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            await self.purge()
+
+    def _start(self, job_id: str) -> None:
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._finished(job_id))
+
+    def _finished(self, job_id: str) -> None:
+        self._tasks.pop(job_id, None)
+        # A slot is free
+        self._wakeup.set()
+
+    @staticmethod
+    def _remove_video(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass  # Already removed by the worker that cancelled or purged the job
+
+    async def _cleanup_if_cancelled(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is not None and job["status"] == JOB_CANCELLED:
+            self._remove_video(job["video_path"])
+
+    async def _run(self, job_id: str) -> None:
+        try:
+            await self._translate(job_id)
+        except asyncio.CancelledError:
+            # Cancelled by the user, or by shutdown (the job is then handed to
+            # whichever worker polls next, and resumes from its checkpoint)
+            await asyncio.to_thread(self.store.release, job_id, self.owner, JOB_INTERRUPTED)
+            await self._cleanup_if_cancelled(job_id)
+            raise
+
+    async def _translate(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] != JOB_RUNNING or job["owner"] != self.owner:
+            return
+        if not os.path.exists(job["video_path"]):
+            await asyncio.to_thread(
+                self.store.update, job_id, owner=self.owner, status=JOB_FAILED, error="Video file is missing"
+            )
+            return
+
+        status, error = JOB_FAILED, None
+        events = translate_video_file(
+            job["video_path"],
+            language=job["language"],
+            mode=job["mode"],
+            start_frame=job["checkpoint_frame"],
+            progress_interval=self.checkpoint_interval,
+        )
+        try:
+            async for event in events:
+                if event["type"] == "translation":
+                    await asyncio.to_thread(self.store.add_result, job_id, event)
+                elif event["type"] == "progress":
+                    # Also where a cancellation from another worker (or a takeover) is noticed
+                    if not await asyncio.to_thread(
+                        self.store.update,
+                        job_id,
+                        owner=self.owner,
+                        checkpoint_frame=event["checkpoint"],
+                        frames_done=event["frame"],
+                        total_frames=event["total_frames"],
+                    ):
+                        await self._cleanup_if_cancelled(job_id)
+                        return
+                elif event["type"] == "done":
+                    await asyncio.to_thread(
+                        self.store.update,
+                        job_id,
+                        owner=self.owner,
+                        frames_done=event["frames"],
+                        total_frames=event["total_frames"],
+                    )
+                    status = JOB_COMPLETED
+                elif event.get("fatal"):
+                    error = event["error"]
+
+        except Exception as e:
+            error = str(e)
+        finally:
+            await events.aclose()
+
+        # Never overwrites a status set meanwhile (e.g. cancelled)
+        if await asyncio.to_thread(self.store.update, job_id, owner=self.owner, status=status, error=error):
+            self._remove_video(job["video_path"])
+        else:
+            await self._cleanup_if_cancelled(job_id)
+
+    async def close(self) -> None:
+        """Stop polling and stop running jobs, handing them back to resume from their checkpoints."""
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stats(self) -> dict:
+        return {
+            "active": len(self._tasks),
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "submitted": self.submitted,
+            "claimed": self.claimed,
+            "statuses": await asyncio.to_thread(self.store.counts),
+        }
+
+
+def init_job_manager() -> JobManager:
+    """
+    Initialize the global job manager and start claiming jobs (including unfinished ones).
+
+    Must be called from the running event loop (e.g. the app lifespan).
+    """
+    global _manager
+    if _manager is None:
+        settings = get_settings()
+        store = JobStore(settings.jobs_db_path)
+        _manager = JobManager(
+            store,
+            jobs_dir=settings.jobs_dir,
+            max_concurrent=settings.jobs_max_concurrent,
+            max_queued=settings.jobs_max_queued,
+            checkpoint_interval=settings.jobs_checkpoint_interval,
+            poll_interval=settings.jobs_poll_interval,
+            stale_seconds=settings.jobs_stale_seconds,
+            retention_seconds=settings.jobs_retention_seconds,
+            purge_interval=settings.jobs_purge_interval,
+        )
+        _manager.start()
+    return _manager
+
+
+def get_job_manager() -> JobManager:
+    """Get the global job manager, starting it on first use."""
+    if _manager is None:
+        return init_job_manager()
+    return _manager
+
+
+async def close_job_manager() -> None:
+    """Stop running jobs and close the job store."""
+    global _manager
+    if _manager is not None:
+        await _manager.close()
+        _manager.store.close()
+        _manager = None
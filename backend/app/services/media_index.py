@@ -0,0 +1,278 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import IO, Iterable, Optional
+
+from app.config import get_settings
+from app.services.cache import normalize_text
+from app.services.metrics import REGISTRY
+
+# Global index instance
+_index: Optional["MediaIndex"] = None
+
+# Columns in export/import records, in table order
+FIELDS = [
+    "word",
+    "found",
+    "gif_url",
+    "media_type",
+    "source",
+    "page_url",
+    "alt_sources",
+    "updated_at",
+    "expires_at",
+]
+
+
+class IndexEntry:
+    """A resolved (or known-missing) word read from the media index."""
+
+    __slots__ = ("record", "stale")
+
+    def __init__(self, record: dict, stale: bool):
+        self.record = record
+        self.stale = stale
+
+    def result(self, word: str) -> dict:
+        """Build a fetch_sign_gif result dictionary for the requested word."""
+        return {
+            "word": word,
+            "gif_url": self.record["gif_url"],
+            "page_url": self.record["page_url"],
+            "source": self.record["source"],
+            "found": self.record["found"],
+            "alt_sources": self.record["alt_sources"],
+            "media_type": self.record["media_type"],
+        }
+
+
+class MediaIndex:
+    """
+    Persistent word-to-media index backed by SQLite.
+
+    Resolved words are kept for positive_ttl seconds and words that no source
+    has are kept for the shorter negative_ttl, so they aren't re-probed on
+    every request. A hit from an incomplete lookup (a better-ranked source
+    failed or timed out) is kept for incomplete_ttl only, so the better
+    source gets another chance soon. Expired entries are still returned
+    (marked stale) so the caller can serve them while refreshing in the
+    background.
+    """
+
+    def __init__(self, path: str, positive_ttl: float, negative_ttl: float, incomplete_ttl: Optional[float] = None):
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.incomplete_ttl = incomplete_ttl if incomplete_ttl is not None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Several API workers (and the pre-crawl tool) write to the same file
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "word TEXT PRIMARY KEY, found INTEGER NOT NULL, gif_url TEXT, media_type TEXT NOT NULL, "
+            "source TEXT NOT NULL, page_url TEXT NOT NULL, alt_sources TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def _record(row: tuple) -> dict:
+        record = dict(zip(FIELDS, row))
+        record["found"] = bool(record["found"])
+        record["alt_sources"] = json.loads(record["alt_sources"])
+        return record
+
+    def lookup(self, word: str) -> Optional[IndexEntry]:
+        """Look up a word, returning None if it has never been resolved."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(FIELDS)} FROM media WHERE word = ?", (normalize_text(word),)
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        record = self._record(row)
+        stale = record["expires_at"] < time.time()
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return IndexEntry(record, stale)
+
+    def store(self, word: str, result: dict, complete: bool = True) -> None:
+        """
+        Store a fetch result.
+
+        Args:
+            word: The word looked up
+            result: Fetch result dictionary
+            complete: False if a better-ranked source failed or timed out, so
+                the hit may not be the preferred one (kept for incomplete_ttl)
+        """
+        now = time.time()
+        if not result["found"]:
+            ttl = self.negative_ttl
+        elif complete:
+            ttl = self.positive_ttl
+        else:
+            ttl = self.incomplete_ttl
+        self._upsert([{
+            "word": normalize_text(word),
+            "found": bool(result["found"]),
+            "gif_url": result.get("gif_url"),
+            "media_type": result.get("media_type", "image"),
+            "source": result["source"],
+            "page_url": result["page_url"],
+            "alt_sources": result.get("alt_sources", []),
+            "updated_at": now,
+            "expires_at": now + ttl,
+        }])
+
+    def _upsert(self, records: Iterable[dict]) -> int:
+        rows = [
+            tuple(
+                json.dumps(record[field]) if field == "alt_sources" else record[field]
+                for field in FIELDS
+            )
+            for record in records
+        ]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO media ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                # Don't leave the shared connection inside the failed transaction
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                raise
+        return len(rows)
+
+    def delete(self, word: str) -> bool:
+        """Remove a word so the next lookup resolves it from the network."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM media WHERE word = ?", (normalize_text(word),))
+        return cursor.rowcount > 0
+
+    def export_jsonl(self, fp: IO[str]) -> int:
+        """
+        Write every entry as JSON Lines (one object per word, keys as in FIELDS).
+
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(FIELDS)} FROM media ORDER BY word").fetchall()
+        for row in rows:
+            fp.write(json.dumps(self._record(row)) + "\n")
+        return len(rows)
+
+    def import_jsonl(self, fp: IO[str], batch_size: int = 500) -> int:
+        """
+        Load entries written by export_jsonl (or by the pre-crawl tool).
+
+        Only word, found, source and page_url are required; missing timestamps
+        are filled in with the index TTLs from now.
+
+        Returns:
+            Number of entries imported
+        """
+        now = time.time()
+        count = 0
+        batch = []
+        for line in fp:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            found = bool(data["found"])
+            batch.append({
+                "word": normalize_text(data["word"]),
+                "found": found,
+                "gif_url": data.get("gif_url"),
+                "media_type": data.get("media_type", "image"),
+                "source": data["source"],
+                "page_url": data["page_url"],
+                "alt_sources": data.get("alt_sources", []),
+                "updated_at": data.get("updated_at", now),
+                "expires_at": data.get("expires_at", now + (self.positive_ttl if found else self.negative_ttl)),
+            })
+            if len(batch) >= batch_size:
+                count += self._upsert(batch)
+                batch = []
+        if batch:
+            count += self._upsert(batch)
+        return count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def init_media_index(path: Optional[str] = None) -> Optional[MediaIndex]:
+    """
+    Initialize the global media index.
+
+    Args:
+        path: SQLite file (defaults to settings.media_index_path)
+
+    Returns:
+        The index, or None if disabled in settings
+    """
+    global _index
+    settings = get_settings()
+    if not settings.media_index_enabled:
+        return None
+
+    if _index is None:
+        _index = MediaIndex(
+            path or settings.media_index_path,
+            positive_ttl=settings.media_index_ttl_seconds,
+            negative_ttl=settings.media_index_negative_ttl_seconds,
+            incomplete_ttl=settings.media_index_incomplete_ttl_seconds,
+        )
+    return _index
+
+
+def get_media_index() -> Optional[MediaIndex]:
+    """Get the global media index, opening it on first use."""
+    if _index is None:
+        return init_media_index()
+    return _index
+
+
+def close_media_index() -> None:
+    """Close the global media index."""
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
+
+
+REGISTRY.callback(
+    "signbridge_media_index_lookups_total", "Sign media index lookups by outcome", "counter",
+    lambda: (
+        {"hit": _index.hits, "stale": _index.stale_hits, "miss": _index.misses} if _index is not None else None
+    ),
+    labelnames=("result",),
+)
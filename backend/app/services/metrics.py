@@ -0,0 +1,383 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds (upper bounds); Gemini calls take 0.5-10s typically
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Observing only increments counters in preallocated lists, so it is cheap
+    enough to call on every request.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile, interpolating within the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else lower
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+# Buckets for per-stage timings (decode, resize, MediaPipe take 0.5-50ms typically)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonic counter."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class MetricFamily:
+    """
+    A named metric and its labelled children.
+
+    Look children up once with labels() and keep them, so recording a value
+    is a plain attribute update with no label handling on the hot path.
+    """
+
+    def __init__(self, name: str, help: str, kind: str, factory: Callable[[], Any], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: dict[tuple, Any] = {}
+
+    def labels(self, *values: str) -> Any:
+        """Get (or create) the child for these label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._factory()
+        return child
+
+    def samples(self) -> Iterable[tuple[dict, Any]]:
+        for values, child in list(self._children.items()):
+            yield dict(zip(self.labelnames, values)), child
+
+
+class _CallbackFamily:
+    """A metric read from existing state when /metrics is scraped."""
+
+    def __init__(self, name: str, help: str, kind: str, fn: Callable[[], Any], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._fn = fn
+
+    def samples(self) -> Iterable[tuple[dict, Any]]:
+        value = self._fn()
+        if value is None:
+            return
+        if not self.labelnames:
+            yield {}, value
+            return
+        for values, child in value.items():
+            values = values if isinstance(values, tuple) else (values,)
+            yield dict(zip(self.labelnames, values)), child
+
+
+class Registry:
+    """Metric families rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._families: dict[str, Any] = {}
+
+    def _register(self, family):
+        if family.name in self._families:
+            raise ValueError(f"Metric {family.name} is already registered")
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """Register a counter; returns the Counter itself when it has no labels."""
+        family = self._register(MetricFamily(name, help, "counter", Counter, labelnames))
+        return family if labelnames else family.labels()
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """Register a gauge; returns the Gauge itself when it has no labels."""
+        family = self._register(MetricFamily(name, help, "gauge", Gauge, labelnames))
+        return family if labelnames else family.labels()
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), bounds: Sequence[float] = LATENCY_BUCKETS):
+        """Register a histogram; returns the Histogram itself when it has no labels."""
+        family = self._register(MetricFamily(name, help, "histogram", lambda: Histogram(bounds), labelnames))
+        return family if labelnames else family.labels()
+
+    def callback(self, name: str, help: str, kind: str, fn: Callable[[], Any], labelnames: Sequence[str] = ()) -> None:
+        """
+        Register a metric computed at scrape time.
+
+        fn returns a number (or Histogram) without labels, a dict of label
+        value(s) to numbers with labels, or None to omit the metric.
+        """
+        self._register(_CallbackFamily(name, help, kind, fn, labelnames))
+
+    def snapshot(self) -> dict:
+        """Current values as plain JSON data, for merging with other processes (see render())."""
+        families = {}
+        for family in self._families.values():
+            samples = [[labels, _snapshot_value(value)] for labels, value in family.samples()]
+            if samples:
+                families[family.name] = {"help": family.help, "kind": family.kind, "samples": samples}
+        return families
+
+    def render(self, others: Sequence[dict] = ()) -> str:
+        """
+        Render in the Prometheus text format.
+
+        Args:
+            others: snapshot()s of other worker processes; counters, gauges and
+                histograms with the same labels are summed with this process's
+        """
+        families = self.snapshot()
+        for snapshot in others:
+            _merge_snapshot(families, snapshot)
+
+        lines = []
+        for name, family in families.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['kind']}")
+            for labels, value in family["samples"]:
+                if isinstance(value, dict):
+                    lines += _render_histogram(name, labels, value)
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _snapshot_value(value: Any) -> Any:
+    if isinstance(value, Histogram):
+        return {"bounds": list(value.bounds), "counts": list(value.counts), "sum": value.sum, "count": value.count}
+    return float(value.value if isinstance(value, (Counter, Gauge)) else value)
+
+
+def _merge_snapshot(families: dict, snapshot: dict) -> None:
+    """Add one snapshot's samples into another, in place."""
+    for name, family in snapshot.items():
+        target = families.setdefault(name, {"help": family["help"], "kind": family["kind"], "samples": []})
+        index = {tuple(sorted(sample[0].items())): sample for sample in target["samples"]}
+        for labels, value in family["samples"]:
+            key = tuple(sorted(labels.items()))
+            sample = index.get(key)
+            if sample is None:
+                sample = [labels, value if not isinstance(value, dict) else {**value, "counts": list(value["counts"])}]
+                target["samples"].append(sample)
+                index[key] = sample
+            elif isinstance(value, dict):
+                if value["bounds"] != sample[1]["bounds"]:
+                    continue  # Buckets changed between deploys; skip rather than mix them
+                sample[1]["counts"] = [a + b for a, b in zip(sample[1]["counts"], value["counts"])]
+                sample[1]["sum"] += value["sum"]
+                sample[1]["count"] += value["count"]
+            else:
+                sample[1] += value
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _render_histogram(name: str, labels: dict, histogram: dict) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*histogram["bounds"], float("inf")), histogram["counts"]):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram['sum'])}")
+    lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+    return lines
+
+
+# The process-wide registry served at /metrics
+REGISTRY = Registry()
+
+# Time spent in each stage of a request: frame decode/resize/MediaPipe, JSON parsing, sign site fetches
+STAGE_SECONDS = REGISTRY.histogram(
+    "signbridge_stage_seconds",
+    "Time spent in each processing stage",
+    labelnames=("stage",),
+    bounds=STAGE_BUCKETS,
+)
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+# Directory shared by the API worker processes on the host, and this worker's snapshot writer
+_snapshot_dir: Optional[str] = None
+_snapshot_task: Optional[asyncio.Task] = None
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"{pid}.json")
+
+
+def _write_snapshot(directory: str, snapshot: dict) -> None:
+    path = _snapshot_path(directory, os.getpid())
+    with open(path + ".tmp", "w", encoding="utf-8") as fp:
+        json.dump(snapshot, fp)
+    os.replace(path + ".tmp", path)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_worker_snapshots() -> list[dict]:
+    """
+    Latest snapshots of the other API worker processes.
+
+    Snapshots left by workers that have exited are deleted, so their
+    counters drop out of the totals (Prometheus treats that as a reset).
+    """
+    if _snapshot_dir is None:
+        return []
+    snapshots = []
+    for filename in os.listdir(_snapshot_dir):
+        stem, ext = os.path.splitext(filename)
+        if ext != ".json" or not stem.isdigit() or int(stem) == os.getpid():
+            continue
+        path = os.path.join(_snapshot_dir, filename)
+        try:
+            if not _process_alive(int(stem)):
+                os.unlink(path)
+                continue
+            with open(path, encoding="utf-8") as fp:
+                snapshots.append(json.load(fp))
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping metrics snapshot %s: %s", filename, e)
+    return snapshots
+
+
+def render_metrics() -> str:
+    """Metrics for /metrics: this worker's, plus every other worker's latest snapshot if shared."""
+    return REGISTRY.render(read_worker_snapshots())
+
+
+async def _write_snapshots(directory: str, interval: float) -> None:
+    while True:
+        try:
+            # Taken on the event loop, where the metrics are updated; written off it
+            await asyncio.to_thread(_write_snapshot, directory, REGISTRY.snapshot())
+        except Exception as e:
+            logger.warning("Metrics snapshot failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+def init_metrics_snapshots(directory: str, interval: float = 5.0) -> None:
+    """
+    Share this worker's metrics with the other API workers on the host.
+
+    Every worker writes a snapshot to the directory every `interval`
+    seconds, and whichever worker is scraped merges the others' into its
+    response, so /metrics covers the whole host. Must be called from the
+    running event loop (e.g. the app lifespan).
+    """
+    global _snapshot_dir, _snapshot_task
+    if _snapshot_task is None:
+        os.makedirs(directory, exist_ok=True)
+        _snapshot_dir = directory
+        _snapshot_task = asyncio.create_task(_write_snapshots(directory, interval))
+
+
+async def close_metrics_snapshots() -> None:
+    """Stop sharing metrics and remove this worker's snapshot."""
+    global _snapshot_dir, _snapshot_task
+    if _snapshot_task is not None:
+        _snapshot_task.cancel()
+        await asyncio.gather(_snapshot_task, return_exceptions=True)
+        try:
+            os.unlink(_snapshot_path(_snapshot_dir, os.getpid()))
+        except FileNotFoundError:
+            pass
+        _snapshot_dir = None
+        _snapshot_task = None
@@ -0,0 +1,426 @@
+import asyncio
+import io
+import json
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from PIL import Image
+from google.generativeai.types import GenerationConfig, RequestOptions
+
+from app.config import get_settings
+from app.services import tracing
+from app.services.encoding import EncodingProfile, encode_image
+from app.services.metrics import REGISTRY, STAGE_SECONDS
+from app.services.model_gateway import PRIORITY_LEARNING, estimate_tokens, get_model_gateway, is_overload_error
+
+# Global client instance
+_client: Optional["ModelClient"] = None
+
+# Timeout for a single Gemini request (in seconds)
+GEMINI_TIMEOUT = 30
+
+# End of a streamed response
+_END = object()
+
+# Metrics, labelled by calling function
+_LATENCY = REGISTRY.histogram("signbridge_gemini_request_seconds", "Gemini call latency including retries", ("function",))
+_FIRST_CHUNK = REGISTRY.histogram(
+    "signbridge_gemini_first_chunk_seconds", "Time to the first chunk of a streamed Gemini call", ("function",)
+)
+_CALLS = REGISTRY.counter("signbridge_gemini_calls_total", "Gemini calls", ("function",))
+_RETRIES = REGISTRY.counter("signbridge_gemini_retries_total", "Gemini call retries", ("function",))
+_ERRORS = REGISTRY.counter("signbridge_gemini_errors_total", "Failed Gemini calls by error type", ("function", "type"))
+_PARSE_FAILURES = REGISTRY.counter(
+    "signbridge_gemini_parse_failures_total", "Gemini responses that were not valid JSON", ("function",)
+)
+_PROMPT_TOKENS = REGISTRY.counter("signbridge_gemini_prompt_tokens_total", "Prompt tokens used", ("function",))
+_OUTPUT_TOKENS = REGISTRY.counter("signbridge_gemini_output_tokens_total", "Output tokens generated", ("function",))
+_PROMPT_BYTES = REGISTRY.counter(
+    "signbridge_gemini_prompt_bytes_total", "Prompt bytes sent (text and encoded images)", ("function",)
+)
+_GEMINI_CALL = STAGE_SECONDS.labels("gemini_call")
+_JSON_PARSE = STAGE_SECONDS.labels("json_parse")
+
+
+class ModelResponse(NamedTuple):
+    text: str  # Response text with any markdown code fence removed
+    data: Any  # Parsed JSON, or None if the response wasn't JSON
+    usage: dict  # Token counts from usage_metadata (empty if not reported)
+
+
+def parse_json_response(text: str) -> tuple[str, Any]:
+    """
+    Parse a model response as JSON.
+
+    Plain JSON (what JSON mode returns) is parsed directly; otherwise a
+    markdown code fence or the outermost {...} is extracted first.
+
+    Returns:
+        Tuple of (cleaned text, parsed JSON or None)
+    """
+    text = text.strip()
+    if text[:1] in ("{", "["):
+        try:
+            return text, json.loads(text)
+        except json.JSONDecodeError:
+            pass
+
+    if "```" in text:
+        block = text.split("```", 2)[1]
+        if block.startswith("json"):
+            block = block[4:]
+        text = block.strip()
+    else:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return text, None
+        text = text[start:end + 1]
+
+    try:
+        return text, json.loads(text)
+    except json.JSONDecodeError:
+        return text, None
+
+
+def encode_contents(contents: Any, quality: int, profile: Optional[EncodingProfile] = None) -> tuple[list, int]:
+    """
+    Encode PIL images as JPEG inline parts, or per an encoding profile.
+
+    The SDK would otherwise send lossless WebP, which is slower to encode
+    and several times larger. Parts that are already inline blobs
+    ({"mime_type", "data"}, e.g. a frame's original JPEG) are sent as-is.
+
+    Returns:
+        Tuple of (parts for generate_content, total prompt bytes)
+    """
+    parts = []
+    size = 0
+    for part in contents if isinstance(contents, (list, tuple)) else [contents]:
+        if isinstance(part, Image.Image):
+            if profile is not None:
+                blob = encode_image(part, profile)
+            else:
+                buffer = io.BytesIO()
+                part.save(buffer, format="JPEG", quality=quality)
+                blob = {"mime_type": "image/jpeg", "data": buffer.getvalue()}
+            parts.append(blob)
+            size += len(blob["data"])
+        else:
+            if isinstance(part, str):
+                size += len(part.encode("utf-8"))
+            elif isinstance(part, dict) and "data" in part:
+                size += len(part["data"])
+            parts.append(part)
+    return parts, size
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """True for errors worth retrying: quota/overload and transient server errors."""
+    if is_overload_error(error):
+        return True
+    if getattr(error, "code", None) in (500, 502, 504):
+        return True
+    return isinstance(error, ConnectionError) or type(error).__name__ in (
+        "InternalServerError",
+        "DeadlineExceeded",
+        "BadGateway",
+    )
+
+
+class _FunctionMetrics:
+    __slots__ = ("function", "latency", "first_chunk", "calls", "retries", "parse_failures",
+                 "prompt_tokens", "output_tokens", "errors", "prompt_bytes", "response_bytes")
+
+    def __init__(self, function: str):
+        # Shared with /metrics, so recording a call is a counter update
+        self.function = function
+        self.latency = _LATENCY.labels(function)
+        self.first_chunk = _FIRST_CHUNK.labels(function)  # Streamed calls only
+        self.calls = _CALLS.labels(function)
+        self.retries = _RETRIES.labels(function)
+        self.parse_failures = _PARSE_FAILURES.labels(function)
+        self.prompt_tokens = _PROMPT_TOKENS.labels(function)
+        self.output_tokens = _OUTPUT_TOKENS.labels(function)
+        self.errors = 0
+        self.prompt_bytes = _PROMPT_BYTES.labels(function)
+        self.response_bytes = 0
+
+    def error(self, error: BaseException) -> None:
+        self.errors += 1
+        _ERRORS.labels(self.function, type(error).__name__).inc()
+
+    def stats(self) -> dict:
+        return {
+            "calls": int(self.calls.value),
+            "errors": self.errors,
+            "retries": int(self.retries.value),
+            "parse_failures": int(self.parse_failures.value),
+            "latency_seconds": self.latency.stats(),
+            "first_chunk_seconds": self.first_chunk.stats() if self.first_chunk.count else None,
+            "prompt_bytes": int(self.prompt_bytes.value),
+            "response_bytes": self.response_bytes,
+            "prompt_tokens": int(self.prompt_tokens.value),
+            "output_tokens": int(self.output_tokens.value),
+        }
+
+
+class ModelClient:
+    """
+    The one place a Gemini request is made, timed and parsed.
+
+    Every call goes through the model gateway. A call is retried with full
+    jitter on quota, overload and transient errors, as long as the
+    remaining time allows it. Latency, prompt and response bytes and token
+    usage are recorded per calling function.
+    """
+
+    def __init__(
+        self,
+        timeout: float = GEMINI_TIMEOUT,
+        retries: int = 2,
+        retry_base_delay: float = 0.5,
+        image_quality: int = 85,
+        json_mode: bool = True,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_base_delay = retry_base_delay
+        self.image_quality = image_quality
+        self.json_mode = json_mode
+        self._metrics: dict[str, _FunctionMetrics] = {}
+
+    def _metrics_for(self, function: str) -> _FunctionMetrics:
+        metrics = self._metrics.get(function)
+        if metrics is None:
+            metrics = self._metrics[function] = _FunctionMetrics(function)
+        return metrics
+
+    async def generate(
+        self,
+        function: str,
+        model,
+        contents: Any,
+        priority: int = PRIORITY_LEARNING,
+        json_response: bool = False,
+        image_profile: Optional[EncodingProfile] = None,
+    ) -> ModelResponse:
+        """
+        Call the model and return its (optionally JSON-parsed) response.
+
+        Args:
+            function: Name the call is recorded under, e.g. "translate_sign_language"
+            model: Gemini GenerativeModel
+            contents: Prompt string or list of prompt parts (strings, PIL images)
+            priority: Model gateway priority class
+            json_response: Ask for JSON output and parse it
+            image_profile: Encoding profile for PIL images (default: JPEG at image_quality)
+
+        Returns:
+            ModelResponse; data is None if a JSON response could not be parsed
+
+        Raises:
+            ValueError: If the request failed (after retries) or timed out
+        """
+        metrics = self._metrics_for(function)
+        metrics.calls.inc()
+        loop = asyncio.get_running_loop()
+        # The deadline covers queueing in the gateway and every attempt
+        deadline = loop.time() + self.timeout + 5  # Extra buffer for network overhead
+        tokens = estimate_tokens(contents)
+        kwargs = {"request_options": RequestOptions(timeout=self.timeout)}
+        if json_response and self.json_mode:
+            kwargs["generation_config"] = GenerationConfig(response_mime_type="application/json")
+
+        encoded = None
+
+        def call():
+            # Encode in the worker thread, once for every attempt
+            nonlocal encoded
+            if encoded is None:
+                encoded = encode_contents(contents, self.image_quality, image_profile)
+            return model.generate_content(encoded[0], **kwargs)
+
+        started = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = await asyncio.wait_for(
+                        get_model_gateway().run(call, priority=priority, tokens=tokens),
+                        timeout=max(0.0, deadline - loop.time()),
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    delay = random.uniform(0, self.retry_base_delay * 2 ** attempt)
+                    if attempt >= self.retries or not is_retryable_error(e) or loop.time() + delay >= deadline:
+                        raise
+                    attempt += 1
+                    metrics.retries.inc()
+                    await asyncio.sleep(delay)
+
+            response_text = response.text
+        except asyncio.TimeoutError as e:
+            metrics.error(e)
+            raise ValueError("Gemini API error: request timed out")
+        except Exception as e:
+            metrics.error(e)
+            raise ValueError(f"Gemini API error: {str(e)}")
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.latency.observe(elapsed)
+            _GEMINI_CALL.observe(elapsed)
+            tracing.record("gemini_call", elapsed, start=started, function=function)
+            metrics.prompt_bytes.inc(encoded[1] if encoded else 0)
+
+        metrics.response_bytes += len(response_text.encode("utf-8"))
+        usage = self._record_usage(metrics, response)
+
+        if not json_response:
+            return ModelResponse(response_text.strip(), None, usage)
+
+        started = time.perf_counter()
+        text, data = parse_json_response(response_text)
+        elapsed = time.perf_counter() - started
+        _JSON_PARSE.observe(elapsed)
+        tracing.record("json_parse", elapsed, start=started)
+        if data is None:
+            metrics.parse_failures.inc()
+        return ModelResponse(text, data, usage)
+
+    async def generate_json(
+        self,
+        function: str,
+        model,
+        contents: Any,
+        priority: int = PRIORITY_LEARNING,
+        image_profile: Optional[EncodingProfile] = None,
+    ) -> ModelResponse:
+        """Shorthand for generate(..., json_response=True)."""
+        return await self.generate(
+            function, model, contents, priority=priority, json_response=True, image_profile=image_profile
+        )
+
+    async def stream(
+        self,
+        function: str,
+        model,
+        contents: Any,
+        priority: int = PRIORITY_LEARNING,
+        json_response: bool = False,
+        image_profile: Optional[EncodingProfile] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the response text chunk by chunk (generate_content(stream=True)).
+
+        The call holds a gateway slot until the stream ends. It is not
+        retried, since chunks may already have been delivered. Time to the
+        first chunk is recorded alongside the total latency.
+
+        Args:
+            function: Name the call is recorded under
+            model: Gemini GenerativeModel
+            contents: Prompt string or list of prompt parts
+            priority: Model gateway priority class
+            json_response: Ask for JSON output
+            image_profile: Encoding profile for PIL images (default: JPEG at image_quality)
+
+        Yields:
+            Response text chunks
+
+        Raises:
+            ValueError: If the request failed or timed out
+        """
+        metrics = self._metrics_for(function)
+        metrics.calls.inc()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout + 5
+        kwargs = {"request_options": RequestOptions(timeout=self.timeout)}
+        if json_response and self.json_mode:
+            kwargs["generation_config"] = GenerationConfig(response_mime_type="application/json")
+
+        chunks: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        encoded = None
+
+        def call():
+            nonlocal encoded
+            encoded = encode_contents(contents, self.image_quality, image_profile)
+            response = model.generate_content(encoded[0], stream=True, **kwargs)
+            for chunk in response:
+                if stop.is_set():
+                    break  # Consumer went away; stop reading the stream
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk.text)
+            return response
+
+        started = time.perf_counter()
+        task = asyncio.ensure_future(
+            get_model_gateway().run(call, priority=priority, tokens=estimate_tokens(contents))
+        )
+        # Runs after every chunk callback the thread scheduled, so it always comes last
+        task.add_done_callback(lambda _: chunks.put_nowait(_END))
+        response = None
+        size = 0
+
+        try:
+            while True:
+                chunk = await asyncio.wait_for(chunks.get(), timeout=max(0.0, deadline - loop.time()))
+                if chunk is _END:
+                    break
+                if not size:
+                    metrics.first_chunk.observe(time.perf_counter() - started)
+                size += len(chunk.encode("utf-8"))
+                yield chunk
+            response = task.result()
+        except asyncio.TimeoutError as e:
+            metrics.error(e)
+            raise ValueError("Gemini API error: request timed out")
+        except Exception as e:
+            metrics.error(e)
+            raise ValueError(f"Gemini API error: {str(e)}")
+        finally:
+            stop.set()
+            if not task.done():
+                task.cancel()
+            elapsed = time.perf_counter() - started
+            metrics.latency.observe(elapsed)
+            _GEMINI_CALL.observe(elapsed)
+            tracing.record("gemini_call", elapsed, start=started, function=function)
+            metrics.prompt_bytes.inc(encoded[1] if encoded else 0)
+            metrics.response_bytes += size
+
+        self._record_usage(metrics, response)
+
+    @staticmethod
+    def _record_usage(metrics: _FunctionMetrics, response) -> dict:
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if usage_metadata is None:
+            return {}
+        usage = {
+            "prompt_tokens": getattr(usage_metadata, "prompt_token_count", 0) or 0,
+            "output_tokens": getattr(usage_metadata, "candidates_token_count", 0) or 0,
+            "total_tokens": getattr(usage_metadata, "total_token_count", 0) or 0,
+        }
+        metrics.prompt_tokens.inc(usage["prompt_tokens"])
+        metrics.output_tokens.inc(usage["output_tokens"])
+        return usage
+
+    def stats(self) -> dict:
+        return {function: metrics.stats() for function, metrics in self._metrics.items()}
+
+
+def get_model_client() -> ModelClient:
+    """Get the global model client, creating it from settings on first use."""
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = ModelClient(
+            retries=settings.gemini_retries,
+            retry_base_delay=settings.gemini_retry_base_delay,
+            image_quality=settings.frame_quality,
+            json_mode=settings.gemini_json_mode,
+        )
+    return _client
@@ -0,0 +1,333 @@
+import asyncio
+import heapq
+import itertools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from PIL import Image
+
+from app.config import get_settings
+from app.services import tracing
+from app.services.metrics import REGISTRY
+
+# Global gateway instance
+_gateway: Optional["ModelGateway"] = None
+
+# Priority classes, most urgent first
+PRIORITY_LIVE = 0  # Live stream frames and clips, /translate/frame
+PRIORITY_LEARNING = 1  # Learning-page lookups (guidance, hand poses)
+PRIORITY_BATCH = 2  # Uploaded videos and background jobs
+PRIORITY_NAMES = {PRIORITY_LIVE: "live", PRIORITY_LEARNING: "learning", PRIORITY_BATCH: "batch"}
+
+# Rough token costs used before the real usage is known
+IMAGE_TOKENS = 258
+OUTPUT_TOKENS = 512
+
+
+def estimate_tokens(contents: Any) -> int:
+    """Estimate the tokens a generate_content call will use (prompt, images and output)."""
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    tokens = OUTPUT_TOKENS
+    for part in parts:
+        if isinstance(part, str):
+            tokens += len(part) // 4 + 1
+        elif isinstance(part, Image.Image) or (isinstance(part, dict) and part.get("mime_type", "").startswith("image/")):
+            tokens += IMAGE_TOKENS
+    return tokens
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """True for quota (429) and overload (503) errors from the Gemini API."""
+    code = getattr(error, "code", None)
+    if code in (429, 503):
+        return True
+    name = type(error).__name__
+    if name in ("ResourceExhausted", "ServiceUnavailable", "TooManyRequests"):
+        return True
+    message = str(error)
+    return message.startswith(("429", "503")) or "RESOURCE_EXHAUSTED" in message
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        # A request larger than the bucket waits for a full bucket instead of forever
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount: float) -> None:
+        """Consume tokens; the balance may go negative (debt paid back by refill)."""
+        self._refill()
+        self.tokens -= amount
+
+
+class ModelGateway:
+    """
+    Single entry point for every Gemini call made by this process.
+
+    Calls run on a dedicated, sized thread pool. A call is admitted when a
+    concurrency slot is free and both the requests/min and tokens/min
+    buckets can pay for it; waiting calls are admitted in priority order
+    (then FIFO). The concurrency limit adapts AIMD-style: it grows by about
+    one per limit's worth of successful calls and halves on a 429/503,
+    which also pauses admissions for backoff_seconds.
+
+    The limits are per process: each API worker has its own gateway, so
+    init_model_gateway() gives each one an equal share of the key's quota.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        workers: int = 0,
+        min_concurrency: int = 1,
+        backoff_seconds: float = 2.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.backoff_seconds = backoff_seconds
+        self.limit = float(self.max_concurrency)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or self.max_concurrency,
+            thread_name_prefix="gemini",
+        )
+        self._requests = TokenBucket(requests_per_minute / 60, requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+        self._waiters: list = []  # Heap of [priority, seq, tokens, future]
+        self._seq = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self.calls = 0
+        self.completed = 0
+        self.failed = 0
+        self.throttled = 0
+        self.total_wait = {name: 0.0 for name in PRIORITY_NAMES.values()}
+        self.max_wait = {name: 0.0 for name in PRIORITY_NAMES.values()}
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+
+    async def run(self, fn: Callable[[], Any], priority: int = PRIORITY_LEARNING, tokens: int = 0) -> Any:
+        """
+        Run a blocking model call once the limits allow it.
+
+        Args:
+            fn: Blocking call, e.g. lambda: model.generate_content(...)
+            priority: PRIORITY_LIVE, PRIORITY_LEARNING or PRIORITY_BATCH
+            tokens: Estimated tokens (see estimate_tokens()); corrected from
+                the response's usage_metadata afterwards
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            Whatever fn raises
+        """
+        loop = asyncio.get_running_loop()
+        self.calls += 1
+        waited = await self._acquire(priority, tokens)
+
+        name = PRIORITY_NAMES.get(priority, str(priority))
+        self.admitted[name] = self.admitted.get(name, 0) + 1
+        self.total_wait[name] = self.total_wait.get(name, 0.0) + waited
+        self.max_wait[name] = max(self.max_wait.get(name, 0.0), waited)
+        tracing.record("gemini_queue", waited, priority=name)
+
+        # The slot is held until the thread finishes, even if the caller stops
+        # waiting, since the request still counts against the quota
+        future: Future = self._executor.submit(fn)
+        future.add_done_callback(lambda f: self._call_soon(loop, self._finish, f, tokens))
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback, *args) -> None:
+        # Done callbacks run in the pool's threads, which can outlive the loop at shutdown
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    async def _acquire(self, priority: int, tokens: int) -> float:
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._seq), tokens, future]
+        heapq.heappush(self._waiters, entry)
+        self._wake()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                entry[3] = None  # Skipped when it reaches the top of the heap
+            else:
+                # Admitted just as the caller gave up: hand the slot back
+                self._active -= 1
+                self._wake()
+            raise
+        return time.monotonic() - started
+
+    def _wake(self) -> None:
+        """Admit waiting calls while slots and rate budget allow."""
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future is None or future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= int(self.limit):
+                return
+
+            delay = max(
+                self._paused_until - time.monotonic(),
+                self._requests.delay(1),
+                self._tokens.delay(tokens),
+            )
+            if delay > 0:
+                self._wake_handle = asyncio.get_running_loop().call_later(delay, self._wake)
+                return
+
+            heapq.heappop(self._waiters)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._active += 1
+            future.set_result(None)
+
+    def _finish(self, future: Future, estimated: int) -> None:
+        self._active -= 1
+        error = None if future.cancelled() else future.exception()
+
+        if error is None and not future.cancelled():
+            self.completed += 1
+            # Additive increase: roughly +1 per `limit` successful calls
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            usage = getattr(future.result(), "usage_metadata", None)
+            actual = getattr(usage, "total_token_count", None)
+            if isinstance(actual, int) and actual > 0:
+                self._tokens.take(actual - estimated)
+        elif error is not None:
+            self.failed += 1
+            if is_overload_error(error):
+                # Multiplicative decrease, and give the quota a moment to recover
+                self.throttled += 1
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self._paused_until = time.monotonic() + self.backoff_seconds
+
+        self._wake()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for entry in self._waiters if entry[3] is not None and not entry[3].done())
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, _, future in self._waiters:
+            if future is not None and not future.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                depth[name] = depth.get(name, 0) + 1
+
+        return {
+            "limit": round(self.limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queue_depth": sum(depth.values()),
+            "queue_depth_by_priority": depth,
+            "calls": self.calls,
+            "completed": self.completed,
+            "failed": self.failed,
+            "throttled": self.throttled,
+            "avg_wait_seconds": {
+                name: self.total_wait[name] / self.admitted[name] if self.admitted[name] else 0.0
+                for name in self.admitted
+            },
+            "max_wait_seconds": dict(self.max_wait),
+            "paused": self._paused_until > time.monotonic(),
+        }
+
+
+def init_model_gateway() -> ModelGateway:
+    """
+    Initialize the global model gateway from settings.
+
+    The requests/min and tokens/min quotas are for the whole API key, so
+    they are split evenly between the settings.web_concurrency worker
+    processes that share it.
+    """
+    global _gateway
+    if _gateway is None:
+        settings = get_settings()
+        workers = max(1, settings.web_concurrency)
+        _gateway = ModelGateway(
+            max_concurrency=settings.gemini_max_concurrency,
+            requests_per_minute=settings.gemini_requests_per_minute / workers,
+            tokens_per_minute=settings.gemini_tokens_per_minute / workers,
+            workers=settings.gemini_workers,
+            min_concurrency=settings.gemini_min_concurrency,
+            backoff_seconds=settings.gemini_backoff_seconds,
+        )
+    return _gateway
+
+
+def get_model_gateway() -> ModelGateway:
+    """Get the global model gateway, creating it on first use."""
+    if _gateway is None:
+        return init_model_gateway()
+    return _gateway
+
+
+def shutdown_model_gateway() -> None:
+    """Shut down the gateway's thread pool."""
+    global _gateway
+    if _gateway is not None:
+        _gateway.shutdown()
+        _gateway = None
+
+
+def _queue_depth_by_priority() -> Optional[dict]:
+    if _gateway is None:
+        return None
+    return _gateway.stats()["queue_depth_by_priority"]
+
+
+REGISTRY.callback(
+    "signbridge_gemini_queue_depth", "Gemini calls waiting in the gateway by priority", "gauge",
+    _queue_depth_by_priority, labelnames=("priority",),
+)
+REGISTRY.callback(
+    "signbridge_gemini_active", "Gemini calls in flight", "gauge",
+    lambda: _gateway._active if _gateway is not None else None,
+)
+REGISTRY.callback(
+    "signbridge_gemini_concurrency_limit", "Current adaptive Gemini concurrency limit", "gauge",
+    lambda: _gateway.limit if _gateway is not None else None,
+)
+REGISTRY.callback(
+    "signbridge_gemini_throttled_total", "Gemini calls that hit a quota or overload error", "counter",
+    lambda: _gateway.throttled if _gateway is not None else None,
+)
@@ -0,0 +1,129 @@
+from typing import Optional
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.video import ProcessedFrame
+
+# Skip reasons reported to the client
+SKIP_NO_HANDS = "no_hands"
+SKIP_STILL = "still"
+
+
+def pixel_delta(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean absolute difference between two grayscale thumbnails, 0 to 1."""
+    if a.shape != b.shape:
+        return 1.0
+    return float(np.mean(np.abs(a.astype(np.int16) - b.astype(np.int16)))) / 255.0
+
+
+def landmark_points(landmarks: dict) -> np.ndarray:
+    """Stack every hand's (x, y) landmark coordinates into an (N, 2) array."""
+    return np.array(
+        [(point["x"], point["y"]) for hand in landmarks["hands"] for point in hand["landmarks"]],
+        dtype=np.float32,
+    )
+
+
+def landmark_delta(a: dict, b: dict) -> float:
+    """
+    Mean landmark displacement between two frames, in normalized image units.
+
+    Returns infinity when the number of hands changed.
+    """
+    if len(a["hands"]) != len(b["hands"]):
+        return float("inf")
+    pa, pb = landmark_points(a), landmark_points(b)
+    if pa.shape != pb.shape:
+        return float("inf")
+    return float(np.mean(np.linalg.norm(pa - pb, axis=1)))
+
+
+class MotionGate:
+    """
+    Decide whether a preprocessed frame is worth sending to the model.
+
+    Frames with no hands, or that barely differ from the last frame that was
+    sent (both in pixels and in hand landmarks), are skipped. The reference
+    frame only moves when a frame passes, so slow drift still adds up.
+    """
+
+    def __init__(
+        self,
+        pixel_threshold: float,
+        landmark_threshold: float,
+        require_hands: bool = True,
+    ):
+        self.pixel_threshold = pixel_threshold
+        self.landmark_threshold = landmark_threshold
+        self.require_hands = require_hands
+        self._reference: Optional[ProcessedFrame] = None
+
+        self.checked = 0
+        self.passed = 0
+        self.skipped = {SKIP_NO_HANDS: 0, SKIP_STILL: 0}
+
+    def check(self, frame: ProcessedFrame) -> Optional[str]:
+        """
+        Check a frame against the last one sent.
+
+        Args:
+            frame: Output of analyze_frame()
+
+        Returns:
+            None if the frame should be translated, otherwise the skip reason
+        """
+        self.checked += 1
+
+        # hands_detected is None when MediaPipe could not run, so don't gate on it
+        if self.require_hands and frame.hands_detected is False:
+            self.skipped[SKIP_NO_HANDS] += 1
+            return SKIP_NO_HANDS
+
+        reference = self._reference
+        if reference is not None and self._is_still(reference, frame):
+            self.skipped[SKIP_STILL] += 1
+            return SKIP_STILL
+
+        self._reference = frame
+        self.passed += 1
+        return None
+
+    def _is_still(self, reference: ProcessedFrame, frame: ProcessedFrame) -> bool:
+        if reference.thumbnail is not None and frame.thumbnail is not None:
+            if pixel_delta(reference.thumbnail, frame.thumbnail) >= self.pixel_threshold:
+                return False
+
+        if reference.landmarks is not None and frame.landmarks is not None:
+            if landmark_delta(reference.landmarks, frame.landmarks) >= self.landmark_threshold:
+                return False
+        elif (reference.landmarks is None) != (frame.landmarks is None):
+            # Hands appeared or disappeared
+            return False
+
+        return True
+
+    @property
+    def skip_ratio(self) -> float:
+        return (self.checked - self.passed) / self.checked if self.checked else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "checked": self.checked,
+            "passed": self.passed,
+            "skipped_no_hands": self.skipped[SKIP_NO_HANDS],
+            "skipped_still": self.skipped[SKIP_STILL],
+            "skip_ratio": self.skip_ratio,
+        }
+
+
+def create_motion_gate() -> Optional[MotionGate]:
+    """Create a gate from settings, or None if motion gating is disabled."""
+    settings = get_settings()
+    if not settings.motion_gate_enabled:
+        return None
+    return MotionGate(
+        pixel_threshold=settings.motion_pixel_threshold,
+        landmark_threshold=settings.motion_landmark_threshold,
+        require_hands=settings.motion_require_hands,
+    )
@@ -0,0 +1,53 @@
+import re
+
+# Multi-word expressions signed as a single unit, not word by word
+LEXICALIZED_PHRASES = {
+    "thank you",
+    "thank you very much",
+    "you're welcome",
+    "excuse me",
+    "i love you",
+    "how are you",
+    "good morning",
+    "good afternoon",
+    "good night",
+    "see you later",
+    "nice to meet you",
+    "what's up",
+    "no problem",
+    "of course",
+    "all right",
+    "happy birthday",
+    "sign language",
+}
+
+_MAX_PHRASE_WORDS = max(len(phrase.split()) for phrase in LEXICALIZED_PHRASES)
+
+_WORD_PATTERN = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+
+
+def split_sign_units(text: str) -> list[str]:
+    """
+    Split text into the units that are each signed on their own.
+
+    Words are separated on whitespace and punctuation; known multi-word
+    expressions ("thank you", "nice to meet you") are kept together, longest
+    match first. Units are lowercased so they share word-level cache entries.
+
+    Args:
+        text: Word or phrase to sign
+
+    Returns:
+        Units in signing order (empty if the text has no words)
+    """
+    words = [word.replace("’", "'") for word in _WORD_PATTERN.findall(text.casefold())]
+    units = []
+    i = 0
+    while i < len(words):
+        for size in range(min(_MAX_PHRASE_WORDS, len(words) - i), 0, -1):
+            candidate = " ".join(words[i:i + size])
+            if size == 1 or candidate in LEXICALIZED_PHRASES:
+                units.append(candidate)
+                i += size
+                break
+    return units
@@ -0,0 +1,142 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+from app.config import get_settings
+
+# Global always-on sampler (this process only)
+_background: Optional["StackSampler"] = None
+
+# Leaf frames of threads that are waiting for work rather than running
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("queues.py", "get"),
+    ("connection.py", "_recv"),
+    ("connection.py", "wait"),
+}
+
+# Stacks beyond this many distinct ones are counted under a single entry
+_TRUNCATED = "[truncated]"
+
+
+class StackSampler:
+    """
+    Statistical profiler for the live process.
+
+    A daemon thread snapshots every thread's Python stack with
+    sys._current_frames() each `interval` seconds and counts identical
+    stacks, so the cost is a few microseconds per thread per sample and
+    does not depend on how much code runs in between. Results are in
+    collapsed stack format ("thread;outer;...;inner count"), which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, interval: float = 0.01, idle: bool = False, max_stacks: int = 10_000):
+        self.interval = interval
+        self.idle = idle
+        self.max_stacks = max_stacks
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            code = frame.f_code
+            if not self.idle and (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            stacks.append(";".join(reversed(stack)))
+
+        with self._lock:
+            self.samples += 1
+            for key in stacks:
+                if key in self.counts or len(self.counts) < self.max_stacks:
+                    self.counts[key] += 1
+                else:
+                    self.counts[_TRUNCATED] += 1
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """Copy the stack counts so far, optionally starting over."""
+        with self._lock:
+            counts = dict(self.counts)
+            if reset:
+                self.counts = Counter()
+                self.samples = 0
+        return counts
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "samples": self.samples,
+            "stacks": len(self.counts),
+            "running": self._thread is not None,
+        }
+
+
+def merge_stacks(target: Counter, counts: dict, prefix: str) -> None:
+    """Add another sampler's counts under a root frame (e.g. "frame-worker-0")."""
+    for stack, count in counts.items():
+        target[f"{prefix};{stack}"] += count
+
+
+def format_collapsed(counts: dict) -> str:
+    """Render counts as collapsed stack lines, heaviest first."""
+    lines = [f"{stack} {count}" for stack, count in sorted(counts.items(), key=lambda item: -item[1])]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def init_profiler() -> Optional[StackSampler]:
+    """Start the always-on low-rate sampler if settings.profiler_background_interval is set."""
+    global _background
+    interval = get_settings().profiler_background_interval
+    if interval > 0 and _background is None:
+        _background = StackSampler(interval)
+        _background.start()
+    return _background
+
+
+def get_background_profiler() -> Optional[StackSampler]:
+    """Get the always-on sampler (None if disabled)."""
+    return _background
+
+
+def close_profiler() -> None:
+    """Stop the always-on sampler."""
+    global _background
+    if _background is not None:
+        _background.stop()
+        _background = None
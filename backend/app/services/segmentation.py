@@ -0,0 +1,291 @@
+import math
+from collections import deque
+from typing import NamedTuple, Optional
+
+from PIL import Image
+
+from app.config import get_settings
+from app.services.motion import landmark_delta, pixel_delta
+from app.services.video import ProcessedFrame
+
+# Segmenter states
+IDLE = "idle"
+ACTIVE = "active"
+
+
+class ClipFrame(NamedTuple):
+    image: Image.Image  # Downscaled to the tile size
+    timestamp: float
+    seq: Optional[int]
+
+
+class SignClip(NamedTuple):
+    """Frames spanning one sign, from motion start to motion end."""
+
+    frames: list[ClipFrame]
+    start: float
+    end: float
+    # "motion" for a moving sign, "hold" for a static handshape (e.g. fingerspelling)
+    kind: str
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class SignSegmenter:
+    """
+    Split a stream of preprocessed frames into individual signs.
+
+    Hand velocity (landmark displacement per second, or thumbnail difference
+    per second when landmarks are unavailable) marks a sign's start when it
+    stays above start_velocity and its end when it stays below end_velocity
+    or the hands leave the frame. A handshape held still for hold_seconds is
+    emitted as a one-frame "hold" clip so static signs still get translated.
+
+    Frames must arrive in capture order. With several frames preprocessed at
+    once (stream_max_in_flight > 1) they can finish out of order, so a frame
+    older than the last one pushed is skipped.
+    """
+
+    def __init__(
+        self,
+        start_velocity: float,
+        end_velocity: float,
+        pixel_scale: float,
+        start_frames: int = 2,
+        end_frames: int = 3,
+        min_duration: float = 0.25,
+        max_duration: float = 4.0,
+        hold_seconds: float = 0.8,
+        max_frames: int = 16,
+        tile_size: int = 384,
+    ):
+        self.start_velocity = start_velocity
+        self.end_velocity = end_velocity
+        self.pixel_scale = pixel_scale
+        self.start_frames = start_frames
+        self.end_frames = end_frames
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.hold_seconds = hold_seconds
+        self.max_frames = max_frames
+        self.tile_size = tile_size
+
+        self.state = IDLE
+        self._previous: Optional[tuple[ProcessedFrame, float]] = None
+        self._preroll: deque = deque(maxlen=start_frames)
+        self._frames: list[ClipFrame] = []
+        self._start = 0.0
+        self._above = 0
+        self._below = 0
+        self._still_since: Optional[float] = None
+        self._hold_emitted = False
+
+        self.clips = 0
+        self.holds = 0
+        self.frames_seen = 0
+        self.out_of_order = 0
+
+    def velocity(self, frame: ProcessedFrame, timestamp: float) -> Optional[float]:
+        """Hand speed since the previous frame, or None if it can't be measured."""
+        if self._previous is None:
+            return None
+        previous, previous_ts = self._previous
+        dt = max(timestamp - previous_ts, 1e-3)
+
+        if previous.landmarks is not None and frame.landmarks is not None:
+            delta = landmark_delta(previous.landmarks, frame.landmarks)
+            if math.isinf(delta):
+                # Hand count changed: treat as a large movement
+                return self.start_velocity * 2
+            return delta / dt
+
+        if previous.thumbnail is not None and frame.thumbnail is not None:
+            return pixel_delta(previous.thumbnail, frame.thumbnail) * self.pixel_scale / dt
+
+        return None
+
+    def push(self, frame: ProcessedFrame, timestamp: float, seq: Optional[int] = None) -> Optional[SignClip]:
+        """
+        Feed the next frame.
+
+        Args:
+            frame: Output of analyze_frame()
+            timestamp: Capture or receive time in seconds
+            seq: Client sequence number, if any
+
+        Returns:
+            A finished SignClip, or None
+        """
+        if self._previous is not None and timestamp < self._previous[1]:
+            self.out_of_order += 1
+            return None
+        self.frames_seen += 1
+        velocity = self.velocity(frame, timestamp)
+        self._previous = (frame, timestamp)
+        no_hands = frame.hands_detected is False
+        clip_frame = self._clip_frame(frame, timestamp, seq)
+
+        if self.state == IDLE:
+            self._preroll.append(clip_frame)
+
+            if no_hands or velocity is None:
+                self._above = 0
+                self._still_since = None
+                self._hold_emitted = False
+                return None
+
+            if velocity >= self.start_velocity:
+                self._above += 1
+                self._still_since = None
+                self._hold_emitted = False
+                if self._above >= self.start_frames:
+                    self.state = ACTIVE
+                    self._frames = list(self._preroll)
+                    self._start = self._frames[0].timestamp
+                    self._below = 0
+                return None
+
+            self._above = 0
+            if velocity < self.end_velocity:
+                if self._still_since is None:
+                    self._still_since = timestamp
+                elif not self._hold_emitted and timestamp - self._still_since >= self.hold_seconds:
+                    self._hold_emitted = True
+                    self.holds += 1
+                    return SignClip(frames=[clip_frame], start=self._still_since, end=timestamp, kind="hold")
+            return None
+
+        # ACTIVE
+        self._append(clip_frame)
+
+        if no_hands or (velocity is not None and velocity < self.end_velocity):
+            self._below += 1
+        else:
+            self._below = 0
+
+        if self._below >= self.end_frames or timestamp - self._start >= self.max_duration:
+            return self._finish(timestamp)
+        return None
+
+    def flush(self) -> Optional[SignClip]:
+        """Emit whatever sign is in progress (e.g. when the stream ends)."""
+        if self.state != ACTIVE or not self._frames:
+            return None
+        return self._finish(self._frames[-1].timestamp)
+
+    def _finish(self, end: float) -> Optional[SignClip]:
+        frames = self._frames
+        start = self._start
+        self.state = IDLE
+        self._frames = []
+        self._preroll.clear()
+        self._above = 0
+        self._below = 0
+        self._still_since = None
+        self._hold_emitted = True  # Don't re-emit the resting pose as a hold
+
+        if end - start < self.min_duration:
+            return None
+        self.clips += 1
+        return SignClip(frames=frames, start=start, end=end, kind="motion")
+
+    def _append(self, clip_frame: ClipFrame) -> None:
+        self._frames.append(clip_frame)
+        if len(self._frames) > self.max_frames:
+            # Decimate (keeping the first and latest frames) so memory stays bounded
+            # while the clip keeps even coverage of the whole sign
+            self._frames = self._frames[:-1:2] + [self._frames[-1]]
+
+    def _clip_frame(self, frame: ProcessedFrame, timestamp: float, seq: Optional[int]) -> ClipFrame:
+        image = frame.image
+        if max(image.size) > self.tile_size:
+            image = image.copy()
+            image.thumbnail((self.tile_size, self.tile_size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+        return ClipFrame(image=image, timestamp=timestamp, seq=seq)
+
+    @property
+    def pending_seq(self) -> Optional[int]:
+        """Seq of the oldest frame held for a sign that hasn't been emitted yet."""
+        frames = self._frames if self.state == ACTIVE else self._preroll
+        return frames[0].seq if frames else None
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "frames_seen": self.frames_seen,
+            "clips": self.clips,
+            "holds": self.holds,
+            "out_of_order": self.out_of_order,
+        }
+
+
+def select_keyframes(clip: SignClip, count: int) -> list[ClipFrame]:
+    """Pick `count` frames spread evenly over the clip's duration (always first and last)."""
+    frames = clip.frames
+    if len(frames) <= count:
+        return list(frames)
+    if count == 1:
+        return [frames[len(frames) // 2]]
+
+    selected = []
+    for i in range(count):
+        target = clip.start + clip.duration * i / (count - 1)
+        best = min(frames, key=lambda f: abs(f.timestamp - target))
+        if best not in selected:
+            selected.append(best)
+    return selected
+
+
+def contact_sheet(images: list[Image.Image], columns: Optional[int] = None) -> Image.Image:
+    """
+    Tile images left-to-right, top-to-bottom into one image.
+
+    Args:
+        images: Frames in temporal order (same size or smaller than the first)
+        columns: Tiles per row (defaults to a near-square grid)
+
+    Returns:
+        The tiled contact sheet
+    """
+    columns = columns or math.ceil(math.sqrt(len(images)))
+    rows = math.ceil(len(images) / columns)
+    tile_w = max(image.size[0] for image in images)
+    tile_h = max(image.size[1] for image in images)
+
+    sheet = Image.new("RGB", (tile_w * columns, tile_h * rows))
+    for i, image in enumerate(images):
+        sheet.paste(image, ((i % columns) * tile_w, (i // columns) * tile_h))
+    return sheet
+
+
+def clip_images(clip: SignClip) -> tuple[list[Image.Image], bool]:
+    """
+    Images to send to the model for a clip, per settings.segment_batch.
+
+    Returns:
+        Tuple of (images, tiled) where tiled is True for a single contact sheet
+    """
+    settings = get_settings()
+    keyframes = [frame.image for frame in select_keyframes(clip, settings.segment_keyframes)]
+    if settings.segment_batch == "sheet" and len(keyframes) > 1:
+        return [contact_sheet(keyframes)], True
+    return keyframes, False
+
+
+def create_segmenter() -> SignSegmenter:
+    """Create a segmenter from settings."""
+    settings = get_settings()
+    return SignSegmenter(
+        start_velocity=settings.segment_start_velocity,
+        end_velocity=settings.segment_end_velocity,
+        pixel_scale=settings.segment_pixel_scale,
+        start_frames=settings.segment_start_frames,
+        end_frames=settings.segment_end_frames,
+        min_duration=settings.segment_min_duration,
+        max_duration=settings.segment_max_duration,
+        hold_seconds=settings.segment_hold_seconds,
+        max_frames=settings.segment_max_frames,
+        tile_size=settings.segment_tile_size,
+    )
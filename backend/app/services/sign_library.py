@@ -0,0 +1,185 @@
+import json
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.config import get_settings
+from app.models.schemas import HandPoseData, SignGuidanceStep
+from app.services.cache import normalize_text
+from app.services.metrics import REGISTRY
+
+# Global library instance
+_library: Optional["SignLibrary"] = None
+
+# Library shipped with the app (built by app.tools.build_sign_library)
+DEFAULT_LIBRARY_PATH = Path(__file__).resolve().parent.parent / "data" / "sign_library.json"
+
+# Numeric pose columns, in row order
+POSE_FIELDS = [
+    "thumb.curl", "thumb.spread",
+    "index.curl", "index.spread",
+    "middle.curl", "middle.spread",
+    "ring.curl", "ring.spread",
+    "pinky.curl", "pinky.spread",
+    "wrist.x", "wrist.y", "wrist.z",
+]
+# Full row: sign, the numeric fields, palm_direction, description
+POSE_COLUMNS = ["sign", *POSE_FIELDS, "palm_direction", "description"]
+
+_FINGERS = ("thumb", "index", "middle", "ring", "pinky")
+_STRIDE = len(POSE_FIELDS)
+
+
+def pose_to_row(sign: str, pose: dict, description: str) -> list:
+    """Flatten a HandPoseData-shaped dict into a library row."""
+    wrist = pose.get("wrist_rotation") or {}
+    values = []
+    for finger in _FINGERS:
+        values += [pose[finger]["curl"], pose[finger]["spread"]]
+    values += [wrist.get("x", 0), wrist.get("y", 0), wrist.get("z", 0)]
+    return [sign, *(round(float(value), 3) for value in values), pose.get("palm_direction", "forward"), description]
+
+
+def row_to_pose(values) -> dict:
+    """Rebuild the pose dict (without palm_direction) from a row's numeric fields."""
+    pose = {finger: {"curl": values[2 * i], "spread": values[2 * i + 1]} for i, finger in enumerate(_FINGERS)}
+    pose["wrist_rotation"] = {"x": values[10], "y": values[11], "z": values[12]}
+    return pose
+
+
+class SignLibrary:
+    """
+    Precomputed hand poses and fingerspelling guidance, loaded once at startup.
+
+    Known signs (the alphabet, numbers and common vocabulary) are served from
+    here with no model call. Pose values are kept in one flat float array,
+    POSE_FIELDS per sign, rather than as thousands of small dicts. Every row
+    is validated against HandPoseData on load; invalid rows are skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self._values = array("f")
+        self._index: dict[tuple[str, str], int] = {}  # (language, sign) -> row number
+        self._palm: list[str] = []
+        self._descriptions: list[str] = []
+        self._alphabet: dict[tuple[str, str], dict] = {}  # (language, letter) -> guidance step
+
+        with open(path, encoding="utf-8") as fp:
+            self._load(json.load(fp))
+
+    def _load(self, data: dict) -> None:
+        self.version = data.get("version", 0)
+        if data.get("pose_columns", POSE_COLUMNS) != POSE_COLUMNS:
+            raise ValueError(f"Unsupported pose columns in {self.path}")
+
+        for language, entries in data.get("languages", {}).items():
+            language = language.strip().upper()
+            for row in entries.get("poses", []):
+                try:
+                    sign, *values, palm_direction, description = row
+                    # Each row must fill exactly one stride of the flat array
+                    if len(values) != _STRIDE:
+                        raise ValueError(f"expected {_STRIDE} pose values, got {len(values)}")
+                    values = [float(value) for value in values]
+                    pose = row_to_pose(values)
+                    HandPoseData(**pose, palm_direction=palm_direction)
+                except (ValueError, TypeError, IndexError, ValidationError):
+                    self.skipped += 1
+                    continue
+                self._index[(language, normalize_text(sign))] = len(self._palm)
+                self._values.extend(values)
+                self._palm.append(palm_direction)
+                self._descriptions.append(description)
+
+            for letter, step in entries.get("alphabet", {}).items():
+                try:
+                    self._alphabet[(language, letter.upper())] = SignGuidanceStep(**step).model_dump()
+                except (TypeError, ValidationError):
+                    self.skipped += 1
+
+    def pose(self, sign: str, language: str = "ASL") -> Optional[dict]:
+        """
+        Look up a precomputed hand pose.
+
+        Returns:
+            generate_hand_pose()-style result, or None if the sign isn't in the library
+        """
+        row = self._index.get((language.strip().upper(), normalize_text(sign)))
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        offset = row * _STRIDE
+        pose = row_to_pose([round(value, 3) for value in self._values[offset:offset + _STRIDE]])
+        pose["palm_direction"] = self._palm[row]
+        return {"sign": sign, "pose": pose, "description": self._descriptions[row]}
+
+    def alphabet(self, letter: str, language: str = "ASL") -> Optional[dict]:
+        """Look up the guidance step for a fingerspelled letter (None if unknown)."""
+        step = self._alphabet.get((language.strip().upper(), letter.upper()))
+        if step is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(step)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "poses": len(self._palm),
+            "alphabet": len(self._alphabet),
+            "skipped": self.skipped,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def init_sign_library(path: Optional[str] = None) -> Optional[SignLibrary]:
+    """
+    Load the global sign library.
+
+    Args:
+        path: Library file (defaults to settings.sign_library_path, then the bundled library)
+
+    Returns:
+        The library, or None if it is disabled or could not be loaded
+    """
+    global _library
+    settings = get_settings()
+    if not settings.sign_library_enabled:
+        return None
+    if _library is None:
+        path = path or settings.sign_library_path or str(DEFAULT_LIBRARY_PATH)
+        try:
+            _library = SignLibrary(path)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Sign library not loaded from {path}: {e}")
+            return None
+    return _library
+
+
+def get_sign_library() -> Optional[SignLibrary]:
+    """Get the global sign library (None if disabled or not loaded)."""
+    return _library
+
+
+def close_sign_library() -> None:
+    """Drop the global sign library."""
+    global _library
+    _library = None
+
+
+REGISTRY.callback(
+    "signbridge_sign_library_lookups_total", "Precomputed sign library lookups by outcome", "counter",
+    lambda: {"hit": _library.hits, "miss": _library.misses} if _library is not None else None,
+    labelnames=("result",),
+)
@@ -1,209 +1,374 @@
+import asyncio
 import httpx
+import logging
 import re
+import time
+from abc import ABC, abstractmethod
 from typing import Optional
 from urllib.parse import quote
 
+from app.config import get_settings
+from app.services.http_client import get_http_client, host_timeout
+from app.services.media_index import get_media_index
+from app.services.metrics import REGISTRY, STAGE_SECONDS
+from app.services import tracing
+from app.services.singleflight import get_group
 
-async def fetch_lifeprint_gif(word: str) -> dict:
-    """
-    Fetch sign language video/GIF from Lifeprint (ASL University).
+logger = logging.getLogger(__name__)
 
-    Args:
-        word: The word to search for
+# Background refresh tasks for stale index entries (kept so they aren't garbage collected)
+_refresh_tasks: set[asyncio.Task] = set()
 
-    Returns:
-        Dictionary with gif_url (or video_url), page_url, source, found status
+# Metrics
+_SCRAPE_SECONDS = STAGE_SECONDS.labels("sign_site_scrape")
+_SCRAPE_ERRORS = REGISTRY.counter(
+    "signbridge_sign_site_errors_total", "Sign site page fetches that failed", ("provider",)
+)
+
+
+class SignMediaProvider(ABC):
+    """
+    A sign language dictionary that can be searched for demonstration media.
+
+    Subclasses list the page URLs to try for a word (in priority order) and
+    extract a media URL from a fetched page. Register new dictionaries with
+    register_provider() and enable them via settings.sign_media_providers.
     """
-    word_lower = word.lower().strip()
-    first_letter = word_lower[0] if word_lower else 'a'
 
-    # Normalize word for URL (Lifeprint uses various formats)
-    # Try without spaces first, then with hyphens
-    word_normalized = word_lower.replace(' ', '')
-    word_hyphenated = word_lower.replace(' ', '-')
+    name = ""
+    source = ""
+
+    @abstractmethod
+    def page_urls(self, word: str) -> list[str]:
+        """Candidate page URLs for a word, most likely first."""
+
+    @abstractmethod
+    def parse(self, html: str, page_url: str) -> Optional[tuple[str, str]]:
+        """Extract (media_url, media_type) from a page, or None if it has no media."""
+
+    def alt_sources(self, word: str) -> list[dict]:
+        """Alternative places to look for the sign."""
+        return []
+
+    def result(self, word: str, page_url: Optional[str] = None, media: Optional[tuple[str, str]] = None) -> dict:
+        """Build a fetch result dictionary for this source."""
+        return {
+            "word": word,
+            "gif_url": media[0] if media else None,
+            "page_url": page_url or self.page_urls(word)[0],
+            "source": self.source,
+            "found": media is not None,
+            "alt_sources": self.alt_sources(word),
+            "media_type": media[1] if media else "image",
+        }
+
+
+class LifeprintProvider(SignMediaProvider):
+    """Lifeprint (ASL University) sign pages."""
 
-    # Lifeprint URL patterns - try multiple formats
-    url_variants = [
-        f"https://www.lifeprint.com/asl101/pages-signs/{first_letter}/{word_normalized}.htm",
-        f"https://www.lifeprint.com/asl101/pages-signs/{first_letter}/{word_hyphenated}.htm",
-        f"https://www.lifeprint.com/asl101/pages-signs/{first_letter}/{word_lower.replace(' ', '_')}.htm",
+    name = "lifeprint"
+    source = "Lifeprint (ASL University)"
+
+    # Skip tiny icons, navigation gifs, and generic images
+    skip_patterns = [
+        'icon', 'button', 'nav', 'logo', 'banner', 'spacer',
+        'concepts', 'layout', 'menu', 'header', 'footer',
+        'background', 'arrow', 'bullet'
     ]
 
-    page_url = url_variants[0]
+    def page_urls(self, word: str) -> list[str]:
+        lifeprint = get_settings().lifeprint_base_url.rstrip('/')
+        word_lower = word.lower().strip()
+        first_letter = word_lower[0] if word_lower else 'a'
+
+        # Normalize word for URL (Lifeprint uses various formats)
+        # Try without spaces first, then with hyphens
+        word_normalized = word_lower.replace(' ', '')
+        word_hyphenated = word_lower.replace(' ', '-')
+
+        return [
+            f"{lifeprint}/asl101/pages-signs/{first_letter}/{word_normalized}.htm",
+            f"{lifeprint}/asl101/pages-signs/{first_letter}/{word_hyphenated}.htm",
+            f"{lifeprint}/asl101/pages-signs/{first_letter}/{word_lower.replace(' ', '_')}.htm",
+        ]
+
+    def parse(self, html: str, page_url: str) -> Optional[tuple[str, str]]:
+        lifeprint = get_settings().lifeprint_base_url.rstrip('/')
+
+        # Look for video first (Lifeprint now uses MP4 videos)
+        video_patterns = [
+            r'<video[^>]*src=["\']([^"\']+\.mp4)["\']',
+            r'<source[^>]+src=["\']([^"\']+\.mp4)["\']',
+            r'src=["\']([^"\']+/videos/[^"\']+\.mp4)["\']',
+            r'src=["\'](\.\./\.\./videos/[^"\']+\.mp4)["\']',
+        ]
+
+        for pattern in video_patterns:
+            for match in re.findall(pattern, html, re.IGNORECASE):
+                # Make URL absolute
+                if match.startswith('http'):
+                    media_url = match
+                elif match.startswith('../../'):
+                    # Relative path like ../../videos/hi.mp4
+                    media_url = f"{lifeprint}/asl101/{match.replace('../../', '')}"
+                elif match.startswith('/'):
+                    media_url = f"{lifeprint}{match}"
+                else:
+                    base_path = page_url.rsplit('/', 1)[0]
+                    media_url = f"{base_path}/{match}"
+
+                return media_url, "video"
+
+        # If no video, look for GIF
+        gif_patterns = [
+            r'<img[^>]+src=["\']([^"\']*\.gif)["\']',
+            r'src=["\']([^"\']+/signs/[^"\']+\.gif)["\']',
+        ]
+
+        for pattern in gif_patterns:
+            for match in re.findall(pattern, html, re.IGNORECASE):
+                if any(skip in match.lower() for skip in self.skip_patterns):
+                    continue
+
+                # Make URL absolute and resolve relative paths
+                if match.startswith('http'):
+                    gif_url = match
+                elif match.startswith('../../'):
+                    # Resolve relative path like ../../images/sign.gif
+                    gif_url = f"{lifeprint}/asl101/{match.replace('../../', '')}"
+                elif match.startswith('../'):
+                    gif_url = f"{lifeprint}/asl101/pages-signs/{match.replace('../', '')}"
+                elif match.startswith('/'):
+                    gif_url = f"{lifeprint}{match}"
+                else:
+                    base_path = page_url.rsplit('/', 1)[0]
+                    gif_url = f"{base_path}/{match}"
+
+                return gif_url, "image"
+
+        return None
+
+    def alt_sources(self, word: str) -> list[dict]:
+        return [
+            {
+                "name": "HandSpeak",
+                "url": f"https://www.handspeak.com/word/search/index.php?id={quote(word)}",
+                "type": "search"
+            },
+            {
+                "name": "SigningSavvy",
+                "url": f"https://www.signingsavvy.com/search/{quote(word)}",
+                "type": "search"
+            },
+            {
+                "name": "YouTube",
+                "url": f"https://www.youtube.com/results?search_query=ASL+sign+for+{quote(word)}",
+                "type": "video_search"
+            }
+        ]
+
+
+class HandSpeakProvider(SignMediaProvider):
+    """
+    HandSpeak word search.
 
-    result = {
-        "word": word,
-        "gif_url": None,
-        "page_url": page_url,
-        "source": "Lifeprint (ASL University)",
-        "found": False,
-        "alt_sources": [],
-        "media_type": "image"
-    }
+    HandSpeak uses video format, so we return the page URL for embedding.
+    """
 
-    try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-            # Try multiple URL variants
-            html = None
-            for url in url_variants:
-                response = await client.get(url)
-                if response.status_code == 200:
-                    html = response.text
-                    page_url = url
-                    result["page_url"] = page_url
-                    break
+    name = "handspeak"
+    source = "HandSpeak"
 
-            if html:
-                # Look for video first (Lifeprint now uses MP4 videos)
-                video_patterns = [
-                    r'<video[^>]*src=["\']([^"\']+\.mp4)["\']',
-                    r'<source[^>]+src=["\']([^"\']+\.mp4)["\']',
-                    r'src=["\']([^"\']+/videos/[^"\']+\.mp4)["\']',
-                    r'src=["\'](\.\./\.\./videos/[^"\']+\.mp4)["\']',
-                ]
-
-                for pattern in video_patterns:
-                    matches = re.findall(pattern, html, re.IGNORECASE)
-                    for match in matches:
-                        # Make URL absolute
-                        if match.startswith('http'):
-                            media_url = match
-                        elif match.startswith('../../'):
-                            # Relative path like ../../videos/hi.mp4
-                            media_url = f"https://www.lifeprint.com/asl101/{match.replace('../../', '')}"
-                        elif match.startswith('/'):
-                            media_url = f"https://www.lifeprint.com{match}"
-                        else:
-                            base_path = page_url.rsplit('/', 1)[0]
-                            media_url = f"{base_path}/{match}"
-
-                        result["gif_url"] = media_url
-                        result["found"] = True
-                        result["media_type"] = "video"
-                        break
-
-                    if result["found"]:
-                        break
-
-                # If no video, look for GIF
-                if not result["found"]:
-                    gif_patterns = [
-                        r'<img[^>]+src=["\']([^"\']*\.gif)["\']',
-                        r'src=["\']([^"\']+/signs/[^"\']+\.gif)["\']',
-                    ]
-
-                    for pattern in gif_patterns:
-                        matches = re.findall(pattern, html, re.IGNORECASE)
-                        for match in matches:
-                            # Skip tiny icons, navigation gifs, and generic images
-                            skip_patterns = [
-                                'icon', 'button', 'nav', 'logo', 'banner', 'spacer',
-                                'concepts', 'layout', 'menu', 'header', 'footer',
-                                'background', 'arrow', 'bullet'
-                            ]
-                            if any(skip in match.lower() for skip in skip_patterns):
-                                continue
-
-                            # Make URL absolute and resolve relative paths
-                            if match.startswith('http'):
-                                gif_url = match
-                            elif match.startswith('../../'):
-                                # Resolve relative path like ../../images/sign.gif
-                                gif_url = f"https://www.lifeprint.com/asl101/{match.replace('../../', '')}"
-                            elif match.startswith('../'):
-                                gif_url = f"https://www.lifeprint.com/asl101/pages-signs/{match.replace('../', '')}"
-                            elif match.startswith('/'):
-                                gif_url = f"https://www.lifeprint.com{match}"
-                            else:
-                                base_path = page_url.rsplit('/', 1)[0]
-                                gif_url = f"{base_path}/{match}"
-
-                            result["gif_url"] = gif_url
-                            result["found"] = True
-                            result["media_type"] = "image"
-                            break
-
-                        if result["found"]:
-                            break
+    def page_urls(self, word: str) -> list[str]:
+        handspeak = get_settings().handspeak_base_url.rstrip('/')
+        return [f"{handspeak}/word/search/index.php?id={quote(word.lower().strip())}"]
 
-    except Exception as e:
-        print(f"Error fetching Lifeprint: {e}")
-
-    # Add alternative sources
-    result["alt_sources"] = [
-        {
-            "name": "HandSpeak",
-            "url": f"https://www.handspeak.com/word/search/index.php?id={quote(word)}",
-            "type": "search"
-        },
-        {
-            "name": "SigningSavvy",
-            "url": f"https://www.signingsavvy.com/search/{quote(word)}",
-            "type": "search"
-        },
-        {
-            "name": "YouTube",
-            "url": f"https://www.youtube.com/results?search_query=ASL+sign+for+{quote(word)}",
-            "type": "video_search"
-        }
-    ]
+    def parse(self, html: str, page_url: str) -> Optional[tuple[str, str]]:
+        handspeak = get_settings().handspeak_base_url.rstrip('/')
+
+        # Look for video or gif content
+        # HandSpeak uses MP4 videos
+        video_patterns = [
+            r'<source[^>]+src=["\']([^"\']+\.mp4)["\']',
+            r'<video[^>]+src=["\']([^"\']+\.mp4)["\']',
+            r'<img[^>]+src=["\']([^"\']*\.gif)["\']',
+        ]
+
+        for pattern in video_patterns:
+            for match in re.findall(pattern, html, re.IGNORECASE):
+                if match.startswith('http'):
+                    media_url = match
+                elif match.startswith('/'):
+                    media_url = f"{handspeak}{match}"
+                else:
+                    continue
+
+                return media_url, "video" if media_url.lower().endswith(".mp4") else "image"
+
+        return None
+
+
+_providers: dict[str, SignMediaProvider] = {}
 
-    return result
 
+def register_provider(provider: SignMediaProvider) -> None:
+    """Register a sign media provider under its name."""
+    _providers[provider.name] = provider
 
-async def fetch_handspeak_gif(word: str) -> dict:
+
+def get_providers(names: Optional[list[str]] = None) -> list[SignMediaProvider]:
     """
-    Fetch sign language GIF/video from HandSpeak.
+    Get providers in priority order.
 
-    HandSpeak uses video format, so we return the page URL for embedding.
+    Args:
+        names: Provider names (defaults to settings.sign_media_providers)
     """
-    word_lower = word.lower().strip()
+    names = names if names is not None else get_settings().sign_media_providers
+    unknown = [name for name in names if name not in _providers]
+    if unknown:
+        raise ValueError(f"Unknown sign media provider(s): {', '.join(unknown)}")
+    return [_providers[name] for name in names]
+
 
-    # HandSpeak search URL
-    search_url = f"https://www.handspeak.com/word/search/index.php?id={quote(word_lower)}"
+register_provider(LifeprintProvider())
+register_provider(HandSpeakProvider())
 
-    result = {
-        "word": word,
-        "gif_url": None,
-        "page_url": search_url,
-        "source": "HandSpeak",
-        "found": False,
-        "alt_sources": []
+
+# Outcome marker for a candidate page that could not be fetched
+_FAILED = object()
+# Statuses meaning the site has no page for the word
+_MISSING_STATUSES = (404, 410)
+
+
+async def _fetch_candidate(
+    client: httpx.AsyncClient,
+    provider: SignMediaProvider,
+    url: str,
+):
+    """Fetch one candidate page and parse it, returning media, None (miss) or _FAILED."""
+    start = time.perf_counter()
+    try:
+        response = await client.get(url, timeout=host_timeout(url))
+        if response.status_code in _MISSING_STATUSES:
+            return None
+        if response.status_code != 200:
+            # Rate limited or down: not an answer, so don't index it as a miss
+            logger.warning("Error fetching %s for %s: HTTP %d", provider.source, url, response.status_code)
+            _SCRAPE_ERRORS.labels(provider.name).inc()
+            return _FAILED
+        return provider.parse(response.text, url)
+    except Exception as e:
+        logger.warning("Error fetching %s for %s: %s", provider.source, url, e)
+        _SCRAPE_ERRORS.labels(provider.name).inc()
+        return _FAILED
+    finally:
+        # Includes fetches cancelled once a better candidate won
+        elapsed = time.perf_counter() - start
+        _SCRAPE_SECONDS.observe(elapsed)
+        tracing.record("sign_site_scrape", elapsed, start=start, provider=provider.name)
+
+
+async def resolve_sign_media(
+    word: str,
+    providers: Optional[list[SignMediaProvider]] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    deadline: Optional[float] = None,
+) -> tuple[dict, bool]:
+    """
+    Resolve sign media for a word by querying every candidate page concurrently.
+
+    Candidates are ranked by provider priority, then by URL order within a
+    provider. The best-ranked hit wins as soon as every better-ranked
+    candidate has come back empty; the remaining requests are cancelled.
+
+    Args:
+        word: The word to search for
+        providers: Providers in priority order (defaults to the configured list)
+        client: HTTP client to use (defaults to the shared pooled client)
+        deadline: Overall time budget in seconds (defaults to settings.sign_media_deadline)
+
+    Returns:
+        Tuple of (result dictionary, complete) where complete is False if the
+        answer may be wrong because a better-ranked candidate failed or the
+        deadline expired
+    """
+    providers = providers if providers is not None else get_providers()
+    client = client or get_http_client()
+    deadline = deadline if deadline is not None else get_settings().sign_media_deadline
+
+    candidates = [
+        (provider, url)
+        for provider in providers
+        for url in provider.page_urls(word)
+    ]
+    tasks = {
+        asyncio.ensure_future(_fetch_candidate(client, provider, url)): rank
+        for rank, (provider, url) in enumerate(candidates)
     }
+    outcomes: dict[int, object] = {}
+    expires_at = time.monotonic() + deadline
+    pending = set(tasks)
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-            response = await client.get(search_url)
-
-            if response.status_code == 200:
-                html = response.text
-
-                # Look for video or gif content
-                # HandSpeak uses MP4 videos
-                video_patterns = [
-                    r'<source[^>]+src=["\']([^"\']+\.mp4)["\']',
-                    r'<video[^>]+src=["\']([^"\']+\.mp4)["\']',
-                    r'<img[^>]+src=["\']([^"\']*\.gif)["\']',
-                ]
-
-                for pattern in video_patterns:
-                    matches = re.findall(pattern, html, re.IGNORECASE)
-                    for match in matches:
-                        if match.startswith('http'):
-                            result["gif_url"] = match
-                        elif match.startswith('/'):
-                            result["gif_url"] = f"https://www.handspeak.com{match}"
-
-                        if result["gif_url"]:
-                            result["found"] = True
-                            break
-
-                    if result["found"]:
-                        break
+        while pending:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                outcomes[tasks[task]] = task.result()
+
+            # Winner: the first hit with no better-ranked candidate still running
+            for rank in range(len(candidates)):
+                if rank not in outcomes:
+                    break
+                if outcomes[rank] not in (None, _FAILED):
+                    provider, url = candidates[rank]
+                    complete = _FAILED not in (outcomes[r] for r in range(rank))
+                    return provider.result(word, url, outcomes[rank]), complete
+    finally:
+        for task in pending:
+            task.cancel()
+
+    # Deadline expired or nothing found: fall back to the best hit we have
+    for rank in sorted(outcomes):
+        if outcomes[rank] not in (None, _FAILED):
+            provider, url = candidates[rank]
+            return provider.result(word, url, outcomes[rank]), False
+
+    complete = len(outcomes) == len(candidates) and _FAILED not in outcomes.values()
+    if not providers:
+        return {
+            "word": word, "gif_url": None, "page_url": "", "source": "", "found": False,
+            "alt_sources": [], "media_type": "image",
+        }, complete
+
+    # Return the first provider's result with alt sources even if not found
+    return providers[0].result(word), complete
+
+
+async def fetch_lifeprint_gif(word: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+    """
+    Fetch sign language video/GIF from Lifeprint (ASL University).
 
-    except Exception as e:
-        print(f"Error fetching HandSpeak: {e}")
+    Args:
+        word: The word to search for
+        client: HTTP client to use (defaults to the shared pooled client)
 
+    Returns:
+        Dictionary with gif_url (or video_url), page_url, source, found status
+    """
+    result, _ = await resolve_sign_media(word, providers=get_providers(["lifeprint"]), client=client)
+    return result
+
+
+async def fetch_handspeak_gif(word: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+    """
+    Fetch sign language GIF/video from HandSpeak.
+
+    HandSpeak uses video format, so we return the page URL for embedding.
+    """
+    result, _ = await resolve_sign_media(word, providers=get_providers(["handspeak"]), client=client)
     return result
 
 
@@ -211,19 +376,64 @@ async def fetch_sign_gif(word: str) -> dict:
     """
     Fetch sign language GIF from multiple sources.
 
-    Tries Lifeprint first, then HandSpeak.
+    Consults the media index first and only touches the network for words
+    it has never seen; stale entries are served while being refreshed in the
+    background. Otherwise queries every configured source concurrently,
+    preferring Lifeprint over HandSpeak. Concurrent lookups of the same word
+    share one fetch.
     """
-    # Try Lifeprint first
-    result = await fetch_lifeprint_gif(word)
+    key = " ".join(word.split()).casefold()
+    result = await get_group("sign_media").do(key, lambda: _fetch_sign_gif(word))
+    # Waiters share the result, so give each caller its own copy
+    return {**result, "word": word}
+
+
+async def _fetch_sign_gif(word: str) -> dict:
+    index = get_media_index()
+    if index is not None:
+        # SQLite reads can block on disk or on a writer, so keep them off the event loop
+        entry = await asyncio.to_thread(index.lookup, word)
+        if entry is not None:
+            if entry.stale:
+                _schedule_refresh(word)
+            return entry.result(word)
 
-    if result["found"]:
-        return result
+    return await resolve_and_index(word)
 
-    # Try HandSpeak as fallback
-    handspeak_result = await fetch_handspeak_gif(word)
 
-    if handspeak_result["found"]:
-        return handspeak_result
+async def resolve_and_index(word: str, **kwargs) -> dict:
+    """
+    Resolve a word from the network and record the result in the media index.
+
+    Misses are only recorded (as negative entries) when every source answered,
+    so a timeout or network error doesn't hide a word for the negative TTL.
+    Hits from an incomplete lookup are recorded with a short TTL, so a
+    fallback source isn't pinned for a month because the preferred one timed out.
 
-    # Return Lifeprint result with alt sources even if not found
+    Args:
+        word: The word to resolve
+        **kwargs: Passed through to resolve_sign_media
+
+    Returns:
+        Fetch result dictionary
+    """
+    result, complete = await resolve_sign_media(word, **kwargs)
+
+    index = get_media_index()
+    if index is not None and (result["found"] or complete):
+        await asyncio.to_thread(index.store, word, result, complete)
     return result
+
+
+def _schedule_refresh(word: str) -> None:
+    key = " ".join(word.split()).casefold()
+
+    async def refresh():
+        try:
+            await get_group("sign_media_refresh").do(key, lambda: resolve_and_index(word))
+        except Exception as e:
+            logger.warning("Error refreshing sign media for %r: %s", word, e)
+
+    task = asyncio.ensure_future(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
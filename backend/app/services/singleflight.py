@@ -0,0 +1,89 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+# Named groups so each service gets its own key space and counters
+_groups: dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one in-flight task.
+
+    Callers with the same key await the same task, so its result or
+    exception is delivered to every waiter. If every waiter goes away
+    (e.g. all clients disconnect) the task is cancelled.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless an identical call is already in flight, then await it.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            The (shared) result of fn()
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self.cancelled += 1
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
+
+
+def get_group(name: str) -> SingleFlight:
+    """Get (or create) the named single-flight group."""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def stats() -> dict:
+    """Counters for every single-flight group."""
+    return {name: group.stats() for name, group in _groups.items()}
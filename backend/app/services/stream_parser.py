@@ -0,0 +1,99 @@
+import json
+import re
+from typing import Any, Iterator
+
+# States
+_SEEK = 0  # Looking for the array's key
+_ARRAY = 1  # Inside the array, between or within elements
+_DONE = 2  # Array closed
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally extract the elements of one array field from streamed JSON.
+
+    Feed response chunks as they arrive; each object (or array) element of
+    the `key` array is returned as soon as it closes, without waiting for the
+    rest of the document. Text before the array (e.g. a markdown fence) is
+    skipped. The full text is kept so the complete document can still be
+    parsed at the end.
+    """
+
+    def __init__(self, key: str):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._text = ""
+        self._pos = 0
+        self._state = _SEEK
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start = -1
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._text
+
+    @property
+    def done(self) -> bool:
+        """True once the array has closed."""
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> list[Any]:
+        """
+        Add a chunk of the response.
+
+        Returns:
+            Array elements completed by this chunk (elements that fail to
+            parse are skipped)
+        """
+        self._text += chunk
+        return list(self._scan())
+
+    def _scan(self) -> Iterator[Any]:
+        text = self._text
+
+        if self._state == _SEEK:
+            match = self._key_pattern.search(text, self._pos)
+            if match is None:
+                # Keep enough tail to match a key split across chunks
+                self._pos = max(self._pos, len(text) - len(self._key_pattern.pattern) - 16)
+                return
+            self._state = _ARRAY
+            self._pos = match.end()
+
+        if self._state != _ARRAY:
+            return
+
+        i = self._pos
+        end = len(text)
+        while i < end:
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # The array itself closed
+                    self._state = _DONE
+                    self._pos = i + 1
+                    return
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        yield json.loads(text[self._start:i + 1])
+                    except json.JSONDecodeError:
+                        pass
+                    self._start = -1
+            i += 1
+        self._pos = i
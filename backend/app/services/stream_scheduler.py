@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class LatestFrameScheduler:
+    """
+    Per-connection scheduler that decouples receiving frames from translating them.
+
+    The receive loop submits every frame without waiting. Only the newest
+    `buffer_size` frames are kept; older ones are dropped. Up to
+    `max_in_flight` inference tasks each pick up the freshest pending frame
+    as soon as they are free, and the older pending frames are dropped with
+    it, so latency stays bounded no matter how fast the client sends and a
+    stale frame is never translated after a newer one. With
+    newest_first=False pending items are handled in arrival order instead
+    (e.g. finished sign clips, where order matters).
+    Drops are also counted on `dropped_counter` (a metrics Counter), if given.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        buffer_size: int = 1,
+        max_in_flight: int = 1,
+        newest_first: bool = True,
+        dropped_counter=None,
+    ):
+        self.handler = handler
+        self.buffer_size = max(1, buffer_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.newest_first = newest_first
+        self.dropped_counter = dropped_counter
+        self._buffer: deque = deque()
+        self._ready = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+        self.received = 0
+        self.dropped = 0
+        self.processed = 0
+        self.in_flight = 0
+
+    def start(self) -> None:
+        """Start the inference tasks."""
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.max_in_flight)]
+
+    async def stop(self) -> None:
+        """Cancel the inference tasks and discard pending frames."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._buffer.clear()
+
+    def submit(self, frame: Any) -> None:
+        """Queue a frame, evicting the oldest pending frame if the buffer is full."""
+        self.received += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._buffer.popleft()
+            self._drop(1)
+        self._buffer.append(frame)
+        self._ready.set()
+
+    def _drop(self, count: int) -> None:
+        self.dropped += count
+        if self.dropped_counter is not None:
+            self.dropped_counter.inc(count)
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def _run(self) -> None:
+        while True:
+            while not self._buffer:
+                self._ready.clear()
+                await self._ready.wait()
+
+            if self.newest_first:
+                # Freshest frame; anything older is already stale
+                frame = self._buffer.pop()
+                if self._buffer:
+                    self._drop(len(self._buffer))
+                    self._buffer.clear()
+            else:
+                frame = self._buffer.popleft()
+            self.in_flight += 1
+            try:
+                await self.handler(frame)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Stream handler error: %s", e)
+            finally:
+                self.in_flight -= 1
+                self.processed += 1
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,421 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple, Optional
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Slow requests are logged one JSON object per line on their own logger
+slow_request_logger = logging.getLogger("signbridge.slow_requests")
+
+# Trace of the request being handled; asyncio tasks inherit it from their creator
+_current: ContextVar[Optional["Trace"]] = ContextVar("signbridge_trace", default=None)
+# Span that new spans are nested under (None = the trace's root span)
+_parent: ContextVar[Optional[str]] = ContextVar("signbridge_span", default=None)
+
+# Global OTLP exporter instance
+_exporter: Optional["OTLPExporter"] = None
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+class Span(NamedTuple):
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float  # time.perf_counter()
+    duration: float  # Seconds
+    attributes: dict
+
+
+class Trace:
+    """
+    Timings recorded while handling one request (or one streamed frame).
+
+    Spans are appended to a flat list; recording one is a tuple append, so
+    instrumented code costs next to nothing when it isn't being traced.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start", "start_ns", "end", "status", "error", "spans")
+
+    def __init__(self, name: str, traceparent: Optional[str] = None, **attributes):
+        self.name = name
+        self.trace_id, self.parent_id = _parse_traceparent(traceparent)
+        self.span_id = _new_id(8)
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.start_ns = time.time_ns()
+        self.end: Optional[float] = None
+        self.status: Optional[int] = None
+        self.error = False
+        self.spans: list[Span] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def add(self, name: str, start: float, duration: float, parent_id: Optional[str] = None, **attributes) -> str:
+        """Record a finished span and return its id."""
+        span_id = _new_id(8)
+        if self.end is None:  # Late spans from background work are dropped
+            self.spans.append(Span(name, span_id, parent_id or self.span_id, start, duration, attributes))
+        return span_id
+
+    def stage_durations(self) -> dict[str, float]:
+        """Total seconds per span name, in the order stages first ran."""
+        durations: dict[str, float] = {}
+        for span in self.spans:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration
+        return durations
+
+    def server_timing(self) -> str:
+        """
+        Format the stages recorded so far as a Server-Timing header value.
+
+        Spans with the same name (e.g. several sign site fetches) are summed.
+        """
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stage_durations().items()]
+        entries.append(f"total;dur={self.duration * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_log(self) -> dict:
+        return {
+            "event": "slow_request",
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "status": self.status,
+            "error": self.error,
+            "duration_ms": round(self.duration * 1000, 1),
+            **self.attributes,
+            "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in self.stage_durations().items()},
+            "spans": [
+                {
+                    "name": span.name,
+                    "offset_ms": round((span.start - self.start) * 1000, 1),
+                    "duration_ms": round(span.duration * 1000, 1),
+                    **span.attributes,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+def _parse_traceparent(traceparent: Optional[str]) -> tuple[str, Optional[str]]:
+    """Continue a W3C traceparent ("00-<trace id>-<span id>-<flags>") if one was sent."""
+    if traceparent:
+        parts = traceparent.strip().split("-")
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+            try:
+                int(parts[1], 16), int(parts[2], 16)
+                return parts[1], parts[2]
+            except ValueError:
+                pass
+    return _new_id(16), None
+
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace of the request being handled, if any."""
+    return _current.get()
+
+
+def record(name: str, seconds: float, start: Optional[float] = None, parent_id: Optional[str] = None, **attributes) -> Optional[str]:
+    """
+    Record an already measured stage on the current trace.
+
+    Args:
+        name: Stage name, e.g. "gemini_call"
+        seconds: Stage duration
+        start: When the stage started (time.perf_counter()); defaults to `seconds` ago
+        parent_id: Span to nest under (defaults to the enclosing span())
+        **attributes: Extra span attributes
+
+    Returns:
+        The new span's id, or None if no trace is active
+    """
+    trace = _current.get()
+    if trace is None:
+        return None
+    if start is None:
+        start = time.perf_counter() - seconds
+    return trace.add(name, start, seconds, parent_id or _parent.get(), **attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a span of the current trace (spans inside it are nested)."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+
+    span_id = _new_id(8)
+    token = _parent.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _parent.reset(token)
+        if trace.end is None:
+            trace.spans.append(Span(name, span_id, _parent.get() or trace.span_id, start,
+                                    time.perf_counter() - start, attributes))
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes):
+    """
+    Trace a request: stages recorded inside the block (including in tasks it
+    starts) are collected, then the trace is logged if it was slow and exported.
+    """
+    trace = Trace(name, traceparent, **attributes)
+    token = _current.set(trace)
+    parent_token = _parent.set(None)
+    try:
+        yield trace
+    except BaseException:
+        trace.error = True
+        raise
+    finally:
+        _parent.reset(parent_token)
+        _current.reset(token)
+        _finish(trace)
+
+
+def traced(handler, name: str, **attributes):
+    """Wrap an async handler so each call is traced on its own (e.g. one streamed frame)."""
+    if not get_settings().tracing_enabled:
+        return handler
+
+    async def run(*args, **kwargs):
+        with start_trace(name, **attributes):
+            return await handler(*args, **kwargs)
+
+    return run
+
+
+def _finish(trace: Trace) -> None:
+    trace.end = time.perf_counter()
+    settings = get_settings()
+    if trace.duration * 1000 >= settings.trace_slow_request_ms and random.random() < settings.trace_slow_sample_rate:
+        slow_request_logger.warning(json.dumps(trace.to_log()))
+    if _exporter is not None and random.random() < settings.trace_otlp_sample_rate:
+        _exporter.submit(trace)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces every HTTP request.
+
+    Adds a Server-Timing header with the stages that finished before the
+    response started (for streamed responses that is only the setup work;
+    the full trace still goes to the slow request log and the exporter).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope.get("headers", []):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        with start_trace(f"{scope['method']} {scope['path']}", traceparent,
+                         method=scope["method"], path=scope["path"]) as trace:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    trace.status = message["status"]
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+
+# ---------------------------------------------------------------------------
+# OTLP export
+# ---------------------------------------------------------------------------
+
+
+def _attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_spans(trace: Trace) -> list[dict]:
+    def unix_ns(start: float) -> int:
+        return trace.start_ns + int((start - trace.start) * 1e9)
+
+    root = {
+        "traceId": trace.trace_id,
+        "spanId": trace.span_id,
+        "name": trace.name,
+        "kind": 2,  # SERVER
+        "startTimeUnixNano": str(trace.start_ns),
+        "endTimeUnixNano": str(unix_ns(trace.end or time.perf_counter())),
+        "attributes": [_attribute(key, value) for key, value in trace.attributes.items()],
+        "status": {"code": 2 if trace.error or (trace.status or 0) >= 500 else 0},
+    }
+    if trace.parent_id:
+        root["parentSpanId"] = trace.parent_id
+    if trace.status is not None:
+        root["attributes"].append(_attribute("http.status_code", trace.status))
+
+    spans = [root]
+    for span in trace.spans:
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id,
+            "name": span.name,
+            "kind": 1,  # INTERNAL
+            "startTimeUnixNano": str(unix_ns(span.start)),
+            "endTimeUnixNano": str(unix_ns(span.start + span.duration)),
+            "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+        })
+    return spans
+
+
+class OTLPExporter:
+    """
+    Batches finished traces and posts them to an OTLP/HTTP collector as JSON.
+
+    Export runs in a background task, so requests never wait on the
+    collector. When it falls behind, new traces are dropped rather than
+    buffered without bound.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, interval: float = 2.0, max_queue: int = 1024,
+                 max_batch: int = 128, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.interval = interval
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self._client = httpx.AsyncClient(timeout=timeout)
+        self._queue: list[Trace] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, trace: Trace) -> None:
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(trace)
+        if len(self._queue) >= self.max_batch:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        while self._queue:
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            payload = {
+                "resourceSpans": [{
+                    "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [{
+                        "scope": {"name": "signbridge"},
+                        "spans": [span for trace in batch for span in _otlp_spans(trace)],
+                    }],
+                }],
+            }
+            try:
+                response = await self._client.post(self.url, json=payload)
+                response.raise_for_status()
+                self.exported += len(batch)
+            except httpx.HTTPError as e:
+                self.failed += len(batch)
+                logger.warning("OTLP export to %s failed: %s", self.url, e)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.flush()
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "endpoint": self.url,
+            "queued": len(self._queue),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+def init_tracing() -> Optional[OTLPExporter]:
+    """
+    Set up the slow request log and, if an endpoint is configured, OTLP export.
+
+    Returns:
+        The exporter, or None if export is disabled
+    """
+    global _exporter
+    settings = get_settings()
+
+    if not slow_request_logger.handlers:
+        # Plain JSON lines, without the usual log prefix
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        slow_request_logger.addHandler(handler)
+        slow_request_logger.propagate = False
+
+    if settings.trace_otlp_endpoint and _exporter is None:
+        _exporter = OTLPExporter(
+            settings.trace_otlp_endpoint,
+            service_name=settings.app_name,
+            interval=settings.trace_otlp_interval,
+        )
+        _exporter.start()
+    return _exporter
+
+
+def get_exporter() -> Optional[OTLPExporter]:
+    """Get the global OTLP exporter (None if export is disabled)."""
+    return _exporter
+
+
+async def close_tracing() -> None:
+    """Flush pending traces and stop the exporter."""
+    global _exporter
+    if _exporter is not None:
+        await _exporter.close()
+        _exporter = None
@@ -1,8 +1,11 @@
 import base64
 import io
+import logging
+import math
+import time
 from PIL import Image
 import numpy as np
-from typing import Optional
+from typing import NamedTuple, Optional, Union
 
 try:
     import cv2
@@ -13,41 +16,220 @@ except ImportError:
     MEDIAPIPE_AVAILABLE = False
 
 from app.config import get_settings
+from app.services.encoding import EncodingProfile, can_pass_through, encode_image, source_size
+from app.services.hands import hands_detector
 
+logger = logging.getLogger(__name__)
 
-def decode_base64_image(base64_string: str) -> Optional[Image.Image]:
+
+def decode_base64_image(base64_string: str, timings: Optional[dict] = None) -> Optional[Image.Image]:
     """
     Decode a base64 encoded image string to PIL Image.
 
     Args:
         base64_string: Base64 encoded image (may include data URL prefix)
+        timings: If given, seconds spent are recorded under "base64_decode" and "image_decode"
 
     Returns:
         PIL Image or None if decoding fails
     """
     try:
+        start = time.perf_counter()
+
         # Remove data URL prefix if present
         if "," in base64_string:
             base64_string = base64_string.split(",")[1]
 
         # Decode base64
         image_bytes = base64.b64decode(base64_string)
+        decoded = time.perf_counter()
 
         # Convert to PIL Image
         image = Image.open(io.BytesIO(image_bytes))
 
-        # Convert to RGB if necessary
+        # Convert to RGB if necessary (load() decodes now rather than on first use)
         if image.mode != "RGB":
             image = image.convert("RGB")
+        else:
+            image.load()
 
+        if timings is not None:
+            timings["base64_decode"] = decoded - start
+            timings["image_decode"] = time.perf_counter() - decoded
         return image
 
     except Exception as e:
-        print(f"Error decoding image: {e}")
+        logger.warning("Error decoding image: %s", e)
         return None
 
 
-def process_frame(image: Image.Image) -> Image.Image:
+class _MemoryViewReader(io.RawIOBase):
+    """Seekable read-only file over a memoryview, so PIL can decode without a copy."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def decode_image_bytes(data: bytes, offset: int = 0, timings: Optional[dict] = None) -> Optional[Image.Image]:
+    """
+    Decode raw compressed image bytes (JPEG/WebP/PNG) to a PIL Image.
+
+    Args:
+        data: Buffer containing the image, e.g. a binary WebSocket message
+        offset: Where the image starts in the buffer (skips a protocol header)
+        timings: If given, seconds spent are recorded under "image_decode"
+
+    Returns:
+        PIL Image or None if decoding fails
+    """
+    try:
+        start = time.perf_counter()
+        image = Image.open(_MemoryViewReader(memoryview(data)[offset:]))
+
+        # Convert to RGB if necessary (also forces the decode while the buffer is alive)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        else:
+            image.load()
+
+        if timings is not None:
+            timings["image_decode"] = time.perf_counter() - start
+        return image
+
+    except Exception as e:
+        logger.warning("Error decoding image: %s", e)
+        return None
+
+
+def decode_frame(
+    data: Union[str, bytes],
+    offset: int = 0,
+    timings: Optional[dict] = None,
+    profile: Optional[EncodingProfile] = None,
+) -> Optional[tuple[Image.Image, Optional[bytes]]]:
+    """
+    Decode a camera frame for analysis, keeping the original JPEG when it can be sent to Gemini as-is.
+
+    With an encoding profile, a JPEG that needs no resizing is kept as
+    received (see settings.frame_passthrough) and, since analyze_frame()
+    then always sends those bytes, only decoded at
+    settings.frame_analysis_size for MediaPipe and motion detection. Other
+    frames are decoded no larger than needed for the profile (or
+    settings.max_frame_size without one), since the decoded image is what
+    gets encoded for Gemini. Both use draft mode, so libjpeg scales down
+    while decoding instead of producing full-size pixels to be resized
+    afterwards.
+
+    Args:
+        data: Base64 encoded image (may include data URL prefix), or a buffer of raw image bytes
+        offset: Where the image starts in a raw buffer (skips a protocol header)
+        timings: If given, seconds spent are recorded under "base64_decode" (base64 input) and "image_decode"
+        profile: Encoding profile the frame will be sent to Gemini with, if any
+
+    Returns:
+        Tuple of (RGB image, original JPEG bytes or None), or None if decoding fails
+    """
+    settings = get_settings()
+    try:
+        start = time.perf_counter()
+        if isinstance(data, str):
+            # Remove data URL prefix if present
+            if "," in data:
+                data = data.split(",", 1)[1]
+            buffer = base64.b64decode(data)
+            decoded = time.perf_counter()
+            if timings is not None:
+                timings["base64_decode"] = decoded - start
+            start = decoded
+            image = Image.open(io.BytesIO(buffer))
+        else:
+            buffer = memoryview(data)[offset:]
+            image = Image.open(_MemoryViewReader(buffer))
+
+        jpeg = None
+        target = _frame_size(profile)
+        # Without a profile the caller may encode the image itself, so it keeps full size
+        passthrough = settings.frame_passthrough and profile is not None and can_pass_through(profile)
+        if image.format == "JPEG":
+            if passthrough and image.mode in ("RGB", "L") and max(image.size) <= min(target, profile.max_size):
+                jpeg = bytes(buffer)
+                target = settings.frame_analysis_size or target
+            if max(image.size) > target:
+                ratio = target / max(image.size)
+                image.draft(None, (math.ceil(image.size[0] * ratio), math.ceil(image.size[1] * ratio)))
+
+        # Convert to RGB if necessary (load() decodes now rather than on first use)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        else:
+            image.load()
+
+        if timings is not None:
+            timings["image_decode"] = time.perf_counter() - start
+        return image, jpeg
+
+    except Exception as e:
+        logger.warning("Error decoding image: %s", e)
+        return None
+
+
+def _frame_size(profile: Optional[EncodingProfile]) -> int:
+    """Longest side a frame is analyzed at: what the encoding profile needs, capped at settings.max_frame_size."""
+    settings = get_settings()
+    if profile is None:
+        return settings.max_frame_size
+    return min(settings.max_frame_size, max(source_size(profile), settings.frame_analysis_size))
+
+
+class ProcessedFrame(NamedTuple):
+    """A preprocessed frame plus the signals used to decide whether to translate it."""
+
+    # The analyzed frame (at settings.frame_analysis_size when the original JPEG was kept)
+    image: Image.Image
+    # extract_hand_landmarks() format, or None if no hands were found
+    landmarks: Optional[dict]
+    # True/False once MediaPipe has run, None if hand detection was unavailable
+    hands_detected: Optional[bool]
+    # Small grayscale copy (uint8 array) for cheap frame differencing
+    thumbnail: Optional[np.ndarray]
+    # Seconds per stage ("base64_decode", "image_decode", "resize", "mediapipe", "encode") if timed
+    timings: Optional[dict] = None
+    # Inline image part ({"mime_type", "data"}) to send to Gemini instead of
+    # encoding the image: the original JPEG, or the frame encoded per a profile
+    encoded: Optional[dict] = None
+
+    def model_image(self) -> Union[Image.Image, dict]:
+        """The frame to send to Gemini: the encoded part when there is one, else the image."""
+        if self.encoded is not None:
+            return self.encoded
+        return self.image
+
+
+def process_frame(image: Image.Image, hands=None) -> Image.Image:
     """
     Process a video frame for sign language detection.
 
@@ -56,36 +238,107 @@ def process_frame(image: Image.Image) -> Image.Image:
 
     Args:
         image: PIL Image to process
+        hands: Optional MediaPipe Hands tracker to use instead of the shared pool
 
     Returns:
         Processed PIL Image
     """
+    return analyze_frame(image, hands=hands, thumbnail=False).image
+
+
+def analyze_frame(
+    image: Image.Image,
+    hands=None,
+    thumbnail: bool = True,
+    timings: Optional[dict] = None,
+    jpeg: Optional[bytes] = None,
+    profile: Optional[EncodingProfile] = None,
+) -> ProcessedFrame:
+    """
+    Process a video frame and keep the hand landmarks MediaPipe found.
+
+    Runs hand detection once and reuses it for both the landmark overlay and
+    the landmark data, so streaming can gate on motion without a second pass.
+
+    Args:
+        image: PIL Image to process
+        hands: Optional MediaPipe Hands tracker to use instead of the shared pool
+        thumbnail: Also build the grayscale thumbnail used for motion detection
+        timings: If given, seconds spent are recorded under "resize",
+            "mediapipe" and "encode" and the dict is returned in the ProcessedFrame
+        jpeg: Original JPEG bytes of the frame (from decode_frame()); sent
+            to Gemini as-is, so the landmark overlay is only drawn on frames
+            without one (those are encoded from the image anyway)
+        profile: If given, the frame is also encoded for Gemini with this
+            encoding profile (cropped to the hands, downscaled, compressed)
+
+    Returns:
+        ProcessedFrame with the processed image, landmarks and thumbnail
+    """
     settings = get_settings()
+    start = time.perf_counter()
 
-    # Resize if too large
+    # Resize if too large, or larger than the encoding profile needs (a profile
+    # that crops to the hands crops first, so the encoder resizes fewer pixels)
     max_size = settings.max_frame_size
+    if profile is not None and not profile.crop_to_hands:
+        max_size = _frame_size(profile)
     if max(image.size) > max_size:
         ratio = max_size / max(image.size)
         new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-        image = image.resize(new_size, Image.Resampling.LANCZOS)
+        image = image.resize(new_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+    small = None
+    if thumbnail:
+        width = settings.motion_thumbnail_width
+        height = max(1, round(image.size[1] * width / image.size[0]))
+        small = np.asarray(image.convert("L").resize((width, height), Image.Resampling.BILINEAR))
+
+    resized = time.perf_counter()
 
     # Optional: Use MediaPipe for hand detection and cropping
+    landmarks = None
+    hands_detected = None
     if MEDIAPIPE_AVAILABLE:
         try:
-            image = enhance_with_mediapipe(image)
+            image, landmarks = detect_hands(image, hands=hands, draw=jpeg is None)
+            hands_detected = landmarks is not None
         except Exception as e:
-            print(f"MediaPipe processing failed: {e}")
+            logger.warning("MediaPipe processing failed: %s", e)
             # Continue with original image
 
-    return image
+    detected = time.perf_counter()
+
+    encoded = None
+    if jpeg is not None:
+        encoded = {"mime_type": "image/jpeg", "data": jpeg}
+    elif profile is not None:
+        encoded = encode_image(image, profile, landmarks)
 
+    if timings is not None:
+        timings["resize"] = resized - start
+        if hands_detected is not None:
+            timings["mediapipe"] = detected - resized
+        if encoded is not None and jpeg is None:
+            timings["encode"] = time.perf_counter() - detected
 
-def enhance_with_mediapipe(image: Image.Image) -> Image.Image:
+    return ProcessedFrame(
+        image=image,
+        landmarks=landmarks,
+        hands_detected=hands_detected,
+        thumbnail=small,
+        timings=timings,
+        encoded=encoded,
+    )
+
+
+def enhance_with_mediapipe(image: Image.Image, hands=None) -> Image.Image:
     """
     Use MediaPipe to detect hands and optionally enhance the image.
 
     Args:
         image: PIL Image
+        hands: Optional MediaPipe Hands tracker; a pooled detector is used otherwise
 
     Returns:
         Enhanced PIL Image with hand region highlighted
@@ -93,44 +346,62 @@ def enhance_with_mediapipe(image: Image.Image) -> Image.Image:
     if not MEDIAPIPE_AVAILABLE:
         return image
 
-    # Convert PIL to OpenCV format
-    cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+    return detect_hands(image, hands=hands)[0]
+
+
+def detect_hands(image: Image.Image, hands=None, draw: bool = True) -> tuple[Image.Image, Optional[dict]]:
+    """
+    Detect hands once, drawing the landmarks and returning their coordinates.
+
+    Args:
+        image: PIL Image
+        hands: Optional MediaPipe Hands tracker; a pooled detector is used otherwise
+        draw: Draw the landmarks onto a copy of the image (False returns the image unchanged)
+
+    Returns:
+        Tuple of (image with hand landmarks drawn, landmark dictionary or None)
+    """
+    # One writable RGB buffer (what MediaPipe expects) for detection and drawing
+    pixels = np.array(image)
 
-    # Initialize MediaPipe Hands
     mp_hands = mp.solutions.hands
 
-    with mp_hands.Hands(
-        static_image_mode=True,
-        max_num_hands=2,
-        min_detection_confidence=0.5,
-    ) as hands:
+    with hands_detector(hands) as detector:
         # Process the image
-        results = hands.process(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+        results = detector.process(pixels)
+
+    if not results.multi_hand_landmarks:
+        return image, None
+    if not draw:
+        return image, _landmarks_from_results(results)
+
+    # The drawing styles are BGR, so swap channels in place around drawing
+    cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR, dst=pixels)
 
-        if results.multi_hand_landmarks:
-            # Draw hand landmarks for better visibility
-            mp_drawing = mp.solutions.drawing_utils
-            mp_drawing_styles = mp.solutions.drawing_styles
+    # Draw hand landmarks for better visibility
+    mp_drawing = mp.solutions.drawing_utils
+    mp_drawing_styles = mp.solutions.drawing_styles
 
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(
-                    cv_image,
-                    hand_landmarks,
-                    mp_hands.HAND_CONNECTIONS,
-                    mp_drawing_styles.get_default_hand_landmarks_style(),
-                    mp_drawing_styles.get_default_hand_connections_style(),
-                )
+    for hand_landmarks in results.multi_hand_landmarks:
+        mp_drawing.draw_landmarks(
+            pixels,
+            hand_landmarks,
+            mp_hands.HAND_CONNECTIONS,
+            mp_drawing_styles.get_default_hand_landmarks_style(),
+            mp_drawing_styles.get_default_hand_connections_style(),
+        )
 
-    # Convert back to PIL
-    return Image.fromarray(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+    cv2.cvtColor(pixels, cv2.COLOR_BGR2RGB, dst=pixels)
+    return Image.fromarray(pixels), _landmarks_from_results(results)
 
 
-def extract_hand_landmarks(image: Image.Image) -> Optional[dict]:
+def extract_hand_landmarks(image: Image.Image, hands=None) -> Optional[dict]:
     """
     Extract hand landmark data from an image using MediaPipe.
 
     Args:
         image: PIL Image
+        hands: Optional MediaPipe Hands tracker; a pooled detector is used otherwise
 
     Returns:
         Dictionary with hand landmarks or None
@@ -141,41 +412,40 @@ def extract_hand_landmarks(image: Image.Image) -> Optional[dict]:
     # Convert PIL to numpy array
     np_image = np.array(image)
 
-    mp_hands = mp.solutions.hands
+    with hands_detector(hands) as detector:
+        results = detector.process(np_image)
+
+    return _landmarks_from_results(results)
 
-    with mp_hands.Hands(
-        static_image_mode=True,
-        max_num_hands=2,
-        min_detection_confidence=0.5,
-    ) as hands:
-        results = hands.process(np_image)
-
-        if not results.multi_hand_landmarks:
-            return None
-
-        hands_data = []
-        for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-            handedness = "Unknown"
-            if results.multi_handedness:
-                handedness = results.multi_handedness[idx].classification[0].label
-
-            landmarks = []
-            for landmark in hand_landmarks.landmark:
-                landmarks.append({
-                    "x": landmark.x,
-                    "y": landmark.y,
-                    "z": landmark.z,
-                })
-
-            hands_data.append({
-                "handedness": handedness,
-                "landmarks": landmarks,
-                "confidence": results.multi_handedness[idx].classification[0].score
-                if results.multi_handedness
-                else 0.5,
+
+def _landmarks_from_results(results) -> Optional[dict]:
+    """Convert MediaPipe Hands results to the landmark dictionary format."""
+    if not results.multi_hand_landmarks:
+        return None
+
+    hands_data = []
+    for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+        handedness = "Unknown"
+        if results.multi_handedness:
+            handedness = results.multi_handedness[idx].classification[0].label
+
+        landmarks = []
+        for landmark in hand_landmarks.landmark:
+            landmarks.append({
+                "x": landmark.x,
+                "y": landmark.y,
+                "z": landmark.z,
             })
 
-        return {"hands": hands_data}
+        hands_data.append({
+            "handedness": handedness,
+            "landmarks": landmarks,
+            "confidence": results.multi_handedness[idx].classification[0].score
+            if results.multi_handedness
+            else 0.5,
+        })
+
+    return {"hands": hands_data}
 
 
 def image_to_base64(image: Image.Image, quality: int = 85) -> str:
@@ -0,0 +1,504 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple, Optional
+
+try:
+    import cv2
+
+    OPENCV_AVAILABLE = True
+except ImportError:
+    OPENCV_AVAILABLE = False
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from app.config import get_settings
+from app.services.encoding import EncodingProfile, get_profile
+from app.services.frame_executor import ExecutorBusyError, get_frame_executor
+from app.services.gemini import translate_sign_language, translate_sign_clip
+from app.services.model_gateway import PRIORITY_BATCH
+from app.services.motion import create_motion_gate
+from app.services.segmentation import SignClip, create_segmenter, clip_images
+from app.services.video import ProcessedFrame
+
+# Global decode thread pool (one thread per video being decoded)
+_decode_pool: Optional[ThreadPoolExecutor] = None
+
+# End of decoded frames
+_END = object()
+
+
+class UploadError(ValueError):
+    """Raised when an upload is malformed or can't be decoded."""
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload exceeds settings.video_max_upload_bytes."""
+
+
+class VideoInfo(NamedTuple):
+    fps: float
+    total_frames: int  # As reported by the container, 0 if unknown
+
+
+class SampledFrame(NamedTuple):
+    data: bytes  # JPEG, no larger than settings.max_frame_size
+    timestamp: float  # Seconds from the start of the video
+    index: int  # Frame number in the source video
+
+
+class VideoFrame(NamedTuple):
+    processed: ProcessedFrame
+    timestamp: float  # Seconds from the start of the video
+    index: int  # Frame number in the source video
+
+
+# ---------------------------------------------------------------------------
+# Upload
+# ---------------------------------------------------------------------------
+
+
+class _FilePartWriter:
+    """Multipart callbacks that stream the first file part straight to disk."""
+
+    def __init__(self, out):
+        self.out = out
+        self.found = False
+        self._field = b""
+        self._value = b""
+        self._in_file = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._field.lower() == b"content-disposition" and not self.found:
+            _, params = parse_options_header(self._value)
+            self._in_file = b"filename" in params
+        self._field = b""
+        self._value = b""
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.out.write(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            self.found = True
+            self._in_file = False
+
+
+async def receive_upload(request, max_bytes: Optional[int] = None, directory: Optional[str] = None) -> str:
+    """
+    Stream an uploaded video to a temporary file as it arrives.
+
+    Accepts either multipart/form-data (the first file field is used) or a
+    raw request body (e.g. Content-Type: video/mp4). The upload is never
+    held in memory as a whole.
+
+    Args:
+        request: Starlette request
+        max_bytes: Upload size limit (defaults to settings.video_max_upload_bytes)
+        directory: Where to write the file (defaults to settings.video_temp_dir)
+
+    Returns:
+        Path of the temporary file; the caller is responsible for deleting it
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes
+        UploadError: If a multipart upload has no file field
+    """
+    settings = get_settings()
+    max_bytes = max_bytes or settings.video_max_upload_bytes
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+
+    fd, path = tempfile.mkstemp(suffix=".video", dir=directory or settings.video_temp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            writer = None
+            parser = None
+            if content_type == b"multipart/form-data":
+                if b"boundary" not in params:
+                    raise UploadError("Missing multipart boundary")
+                writer = _FilePartWriter(out)
+                parser = MultipartParser(params[b"boundary"], writer.callbacks())
+
+            received = 0
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                if parser is not None:
+                    parser.write(chunk)
+                else:
+                    out.write(chunk)
+
+            if parser is not None:
+                parser.finalize()
+                if not writer.found:
+                    raise UploadError("No video file in upload")
+            elif received == 0:
+                raise UploadError("Empty upload")
+
+        return path
+
+    except BaseException:
+        os.unlink(path)
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Decode
+# ---------------------------------------------------------------------------
+
+
+def _get_decode_pool() -> ThreadPoolExecutor:
+    global _decode_pool
+    if _decode_pool is None:
+        _decode_pool = ThreadPoolExecutor(
+            max_workers=get_settings().video_decode_workers,
+            thread_name_prefix="video-decode",
+        )
+    return _decode_pool
+
+
+def shutdown_decode_pool() -> None:
+    """Shut down the video decode threads."""
+    global _decode_pool
+    if _decode_pool is not None:
+        _decode_pool.shutdown(wait=False, cancel_futures=True)
+        _decode_pool = None
+
+
+def _decode_video(
+    path: str,
+    sample_fps: float,
+    loop: asyncio.AbstractEventLoop,
+    queue: asyncio.Queue,
+    stop: threading.Event,
+    start_frame: int = 0,
+) -> dict:
+    """
+    Decode a video frame by frame, sampling about sample_fps frames per second.
+
+    A VideoInfo is queued first. Frames that aren't sampled are only
+    grabbed, never converted. Sampled frames are downscaled to
+    settings.max_frame_size and re-encoded as JPEG (OpenCV releases the GIL
+    for both), then put on the bounded queue (blocking while it is full)
+    for the frame executor to analyze. Decoding starts at start_frame when
+    resuming a checkpointed job.
+
+    Returns:
+        Decode stats (frames, sampled, fps, duration)
+    """
+    capture = cv2.VideoCapture(path)
+    max_size = get_settings().max_frame_size
+    frames = start_frame
+    sampled = 0
+
+    def put(item) -> bool:
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while not stop.is_set():
+            try:
+                future.result(timeout=0.1)
+                return True
+            except FutureTimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    try:
+        if not capture.isOpened():
+            raise UploadError("Could not decode video")
+
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        step = max(1, round(fps / sample_fps))
+        if start_frame:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        if not put(VideoInfo(fps, max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT))))):
+            return {}
+
+        while not stop.is_set() and capture.grab():
+            index = frames
+            frames += 1
+            # Sample on absolute frame numbers so a resumed job picks the same frames
+            if index % step:
+                continue
+
+            ok, bgr = capture.retrieve()
+            if not ok:
+                continue
+            height, width = bgr.shape[:2]
+            if max(width, height) > max_size:
+                ratio = max_size / max(width, height)
+                bgr = cv2.resize(bgr, (round(width * ratio), round(height * ratio)), interpolation=cv2.INTER_AREA)
+            ok, data = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            del bgr
+            if not ok:
+                continue
+
+            sampled += 1
+            if not put(SampledFrame(data.tobytes(), index / fps, index)):
+                break
+
+        return {"frames": frames, "sampled": sampled, "fps": fps, "duration": frames / fps}
+
+    finally:
+        capture.release()
+        put(_END)
+
+
+# ---------------------------------------------------------------------------
+# Translate
+# ---------------------------------------------------------------------------
+
+
+async def translate_video_file(
+    path: str,
+    language: str = "ASL",
+    mode: Optional[str] = None,
+    start_frame: int = 0,
+    progress_interval: Optional[float] = None,
+    profile: Optional[EncodingProfile] = None,
+) -> AsyncIterator[dict]:
+    """
+    Translate a video file, yielding timestamped results as they complete.
+
+    Decoding runs in a thread feeding a bounded queue, MediaPipe runs in
+    the frame executor (one tracker for the whole video), Gemini calls are
+    capped at settings.video_max_concurrency, and finished results are
+    buffered only up to a small bound, so memory stays flat however long
+    the video is. Results may arrive out of order; use start/end to place
+    them.
+
+    Args:
+        path: Video file path
+        language: Sign language type
+        mode: "segment" (one call per sign) or "frame" (one call per gated
+            frame), defaults to settings.stream_mode
+        start_frame: Frame to resume from (a previous progress checkpoint)
+        progress_interval: Seconds of video between {"type": "progress"}
+            events, or None for no progress events
+        profile: Encoding profile for images sent to Gemini, defaults to
+            settings.encoding_profile
+
+    Yields:
+        {"type": "translation", ...} per result, then one {"type": "done", ...}
+        (or {"type": "error", "fatal": True, ...} if the video can't be decoded).
+
+        Progress events carry a checkpoint: the frame from which decoding
+        must restart to reproduce every result not yet yielded. Results
+        before it are always yielded before the progress event.
+    """
+    if not OPENCV_AVAILABLE:
+        raise UploadError("Video decoding requires OpenCV")
+
+    settings = get_settings()
+    mode = mode or settings.stream_mode
+    profile = profile or get_profile()
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+
+    frames: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.video_queue_size))
+    results: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.video_max_concurrency) * 2)
+    semaphore = asyncio.Semaphore(max(1, settings.video_max_concurrency))
+    stop = threading.Event()
+    # In-flight translation tasks and the first frame each one covers
+    tasks: dict[asyncio.Task, int] = {}
+    counts = {"translated": 0, "failed": 0, "skipped": 0}
+    info = VideoInfo(0.0, 0)
+
+    async def translate(span: dict, call: Callable[[], Awaitable[dict]]) -> None:
+        try:
+            result = await call()
+            counts["translated"] += 1
+            await results.put({
+                "type": "translation",
+                **span,
+                "text": result["text"],
+                "confidence": result["confidence"],
+            })
+        except Exception as e:
+            counts["failed"] += 1
+            await results.put({
+                "type": "error",
+                **span,
+                "error": str(e),
+            })
+        finally:
+            semaphore.release()
+
+    async def submit(span: dict, call: Callable[[], Awaitable[dict]]) -> None:
+        # Waiting here stops reading frames, which in turn pauses decoding
+        await semaphore.acquire()
+        task = asyncio.create_task(translate(span, call))
+        tasks[task] = span["start_frame"]
+        task.add_done_callback(lambda t: tasks.pop(t, None))
+
+    async def submit_clip(clip: SignClip) -> None:
+        images, tiled = clip_images(clip)
+        span = {
+            "start": round(clip.start, 3),
+            "end": round(clip.end, 3),
+            "start_frame": clip.frames[0].seq,
+            "end_frame": clip.frames[-1].seq,
+            "kind": clip.kind,
+        }
+        await submit(span, partial(
+            translate_sign_clip, images, language=language, tiled=tiled, priority=PRIORITY_BATCH, profile=profile
+        ))
+
+    # Single frames are encoded for Gemini in the worker; signs once their keyframes are chosen
+    frame_profile = profile if mode != "segment" else None
+
+    async def analyze(sampled: SampledFrame) -> Optional[VideoFrame]:
+        # Frames are analyzed one at a time, in order, so the tracker and segmenter see the video as it plays
+        while True:
+            try:
+                processed = await executor.process_bytes(sampled.data, session_id=session_id, profile=frame_profile)
+                break
+            except ExecutorBusyError:
+                # The pool is shared with live streams: wait for room instead of failing the video
+                await asyncio.sleep(0.05)
+            except asyncio.TimeoutError:
+                counts["skipped"] += 1
+                return None
+        if processed is None:
+            counts["skipped"] += 1
+            return None
+        return VideoFrame(processed, sampled.timestamp, sampled.index)
+
+    async def dispatch() -> dict:
+        try:
+            stats = await segment_and_submit()
+        except Exception:
+            # Re-raised to the consumer when it awaits the dispatcher
+            await results.put(_END)
+            raise
+        await results.put(_END)
+        return stats
+
+    async def segment_and_submit() -> dict:
+        nonlocal info
+        segmenter = create_segmenter() if mode == "segment" else None
+        gate = create_motion_gate() if mode != "segment" else None
+        last_progress = None
+
+        while True:
+            frame = await frames.get()
+            if frame is _END:
+                break
+            if isinstance(frame, VideoInfo):
+                info = frame
+                continue
+            frame = await analyze(frame)
+            if frame is None:
+                continue
+
+            if segmenter is not None:
+                clip = segmenter.push(frame.processed, frame.timestamp, frame.index)
+                if clip is not None:
+                    await submit_clip(clip)
+            elif gate is None or gate.check(frame.processed) is None:
+                span = {
+                    "start": round(frame.timestamp, 3),
+                    "end": round(frame.timestamp, 3),
+                    "start_frame": frame.index,
+                    "end_frame": frame.index,
+                    "kind": "frame",
+                }
+                await submit(span, partial(
+                    translate_sign_language, frame.processed.model_image(), language=language, priority=PRIORITY_BATCH,
+                    profile=profile,
+                ))
+
+            if progress_interval is not None and (
+                last_progress is None or frame.timestamp - last_progress >= progress_interval
+            ):
+                last_progress = frame.timestamp
+                # Everything before the oldest frame still held by the segmenter
+                # or an in-flight call has already been put on the results queue
+                pending = [frame.index + 1, *tasks.values()]
+                if segmenter is not None and segmenter.pending_seq is not None:
+                    pending.append(segmenter.pending_seq)
+                await results.put({
+                    "type": "progress",
+                    "frame": frame.index,
+                    "checkpoint": min(pending),
+                    "total_frames": info.total_frames,
+                    "timestamp": round(frame.timestamp, 3),
+                })
+
+        if segmenter is not None:
+            clip = segmenter.flush()
+            if clip is not None:
+                await submit_clip(clip)
+
+        if tasks:
+            await asyncio.wait(list(tasks))
+        return await decoder
+
+    executor = await get_frame_executor()
+    session_id = executor.open_session()
+    decoder = loop.run_in_executor(
+        _get_decode_pool(), _decode_video, path, settings.video_sample_fps, loop, frames, stop, start_frame,
+    )
+    dispatcher = asyncio.create_task(dispatch())
+
+    try:
+        while True:
+            item = await results.get()
+            if item is _END:
+                break
+            yield item
+
+        stats = await dispatcher
+        yield {
+            "type": "done",
+            "mode": mode,
+            "total_frames": info.total_frames,
+            **stats,
+            **counts,
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+
+    except Exception as e:
+        yield {"type": "error", "fatal": True, "error": str(e)}
+
+    finally:
+        stop.set()
+        dispatcher.cancel()
+        pending = list(tasks)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(dispatcher, *pending, return_exceptions=True)
+        await asyncio.gather(decoder, return_exceptions=True)
+        executor.close_session(session_id)
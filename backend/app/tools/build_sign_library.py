@@ -0,0 +1,254 @@
+"""
+Build the precomputed sign library (hand poses and alphabet guidance).
+
+Merges the existing library with the hand poses defined in the frontend
+(frontend/lib/handPoses.ts) and, for a word list, poses generated by Gemini,
+so the API serves known signs without a model call. Every entry is
+validated before it is written and the library version is bumped whenever
+its contents change.
+
+Usage:
+    python -m app.tools.build_sign_library [--words words.txt] [--alphabet] [--refresh]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.config import get_settings
+from app.models.schemas import HandPoseData, SignGuidanceStep
+from app.services.cache import normalize_text
+from app.services.gemini import _FallbackResult, generate_hand_pose, get_sign_guidance
+from app.services.sign_library import DEFAULT_LIBRARY_PATH, POSE_COLUMNS, pose_to_row, row_to_pose
+from app.tools.precrawl import read_words
+
+DEFAULT_FRONTEND_POSES = Path(__file__).resolve().parents[3] / "frontend" / "lib" / "handPoses.ts"
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+_POSE_PATTERN = re.compile(
+    r"(?P<key>'[^']+'|[A-Za-z]\w*):\s*\[?\s*\{(?P<body>[^;]*?palmDirection:\s*'(?P<palm>\w+)')",
+    re.DOTALL,
+)
+_FINGER_PATTERN = re.compile(rf"(thumb|index|middle|ring|pinky):\s*\{{\s*curl:\s*{_NUMBER},\s*spread:\s*{_NUMBER}\s*\}}")
+_WRIST_PATTERN = re.compile(rf"wristRotation:\s*\{{\s*x:\s*{_NUMBER},\s*y:\s*{_NUMBER},\s*z:\s*{_NUMBER}\s*\}}")
+
+
+def parse_frontend_poses(path: Path) -> dict[str, dict]:
+    """
+    Read the ASL_POSES and WORD_POSES tables from the frontend's handPoses.ts.
+
+    Word poses use their first keyframe, as getPoseForSign() does.
+
+    Returns:
+        Sign -> HandPoseData-shaped dict
+    """
+    source = path.read_text(encoding="utf-8")
+    start = source.find("ASL_POSES")
+    if start == -1:
+        return {}
+
+    poses = {}
+    for match in _POSE_PATTERN.finditer(source, start):
+        body = match.group("body")
+        fingers = {name: {"curl": float(curl), "spread": float(spread)}
+                   for name, curl, spread in _FINGER_PATTERN.findall(body)}
+        wrist = _WRIST_PATTERN.search(body)
+        if len(fingers) != 5 or wrist is None:
+            continue
+        x, y, z = (float(value) for value in wrist.groups())
+        poses[match.group("key").strip("'")] = {
+            **fingers,
+            "wrist_rotation": {"x": x, "y": y, "z": z},
+            "palm_direction": match.group("palm"),
+        }
+    return poses
+
+
+def load_library(path: Path) -> dict:
+    """Load a library file into {"version", "languages": {lang: {"poses": {sign: row}, "alphabet": {...}}}}."""
+    library = {"version": 0, "languages": {}}
+    if not path.exists():
+        return library
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("pose_columns", POSE_COLUMNS) != POSE_COLUMNS:
+        raise ValueError(f"Unsupported pose columns in {path}")
+    library["version"] = data.get("version", 0)
+    for language, entries in data.get("languages", {}).items():
+        library["languages"][language] = {
+            "poses": {normalize_text(row[0]): row for row in entries.get("poses", [])},
+            "alphabet": dict(entries.get("alphabet", {})),
+        }
+    return library
+
+
+def validate_row(row: list) -> bool:
+    try:
+        sign, *values, palm_direction, description = row
+        HandPoseData(**row_to_pose(values), palm_direction=palm_direction)
+        return isinstance(sign, str) and isinstance(description, str) and len(values) == len(POSE_COLUMNS) - 3
+    except (ValueError, TypeError, ValidationError):
+        return False
+
+
+def write_library(path: Path, library: dict) -> None:
+    """Write the library with one pose row per line, so diffs stay readable."""
+    lines = [
+        "{",
+        f'  "version": {library["version"]},',
+        f'  "pose_columns": {json.dumps(POSE_COLUMNS)},',
+        '  "languages": {',
+    ]
+    languages = sorted(library["languages"].items())
+    for i, (language, entries) in enumerate(languages):
+        # Letters and numbers first, then vocabulary
+        rows = sorted(entries["poses"].values(), key=lambda row: (len(row[0]) > 1, normalize_text(row[0])))
+        lines.append(f"    {json.dumps(language)}: {{")
+        lines.append('      "poses": [')
+        lines += [f"        {json.dumps(row, ensure_ascii=False)}," for row in rows]
+        if rows:
+            lines[-1] = lines[-1].rstrip(",")
+        lines.append("      ],")
+        lines.append('      "alphabet": {')
+        letters = sorted(entries["alphabet"].items())
+        lines += [f"        {json.dumps(letter)}: {json.dumps(step, ensure_ascii=False)}," for letter, step in letters]
+        if letters:
+            lines[-1] = lines[-1].rstrip(",")
+        lines.append("      }")
+        lines.append("    }" + ("," if i < len(languages) - 1 else ""))
+    lines += ["  }", "}"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+async def build(
+    library: dict,
+    language: str,
+    frontend_poses: dict[str, dict],
+    words: list[str],
+    alphabet: bool,
+    refresh: bool,
+    concurrency: int,
+) -> dict:
+    """
+    Add frontend poses and model-generated entries to the library in place.
+
+    Returns:
+        Counts of added, updated, generated, failed and invalid entries
+    """
+    entries = library["languages"].setdefault(language, {"poses": {}, "alphabet": {}})
+    poses = entries["poses"]
+    stats = {"added": 0, "updated": 0, "generated": 0, "failed": 0, "invalid": 0}
+
+    def put(sign: str, pose: dict, description: str) -> None:
+        row = pose_to_row(sign, pose, description)
+        if not validate_row(row):
+            print(f"  {sign}: invalid pose, skipped", file=sys.stderr)
+            stats["invalid"] += 1
+            return
+        key = normalize_text(sign)
+        if key not in poses:
+            stats["added"] += 1
+        elif poses[key] != row:
+            stats["updated"] += 1
+        else:
+            return
+        poses[key] = row
+
+    # The frontend's poses are what the 3D viewer already renders; keep the library in step
+    for sign, pose in frontend_poses.items():
+        existing = poses.get(normalize_text(sign))
+        description = existing[-1] if existing else f"{language} sign for '{sign}'"
+        put(sign if len(sign) > 1 else sign.upper(), pose, description)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate_pose(word: str) -> None:
+        async with semaphore:
+            try:
+                result = await generate_hand_pose(word, language=language)
+            except ValueError as e:
+                print(f"  {word}: {e}", file=sys.stderr)
+                stats["failed"] += 1
+                return
+        if isinstance(result, _FallbackResult):
+            print(f"  {word}: unparseable model response, skipped", file=sys.stderr)
+            stats["failed"] += 1
+            return
+        stats["generated"] += 1
+        put(word, {"wrist_rotation": {}, **result["pose"]}, result["description"])
+
+    async def generate_letter(letter: str) -> None:
+        async with semaphore:
+            try:
+                result = await get_sign_guidance(letter, language=language)
+                step = SignGuidanceStep(**result["steps"][0]).model_dump()
+            except (ValueError, IndexError, TypeError, ValidationError) as e:
+                print(f"  {letter}: {e}", file=sys.stderr)
+                stats["failed"] += 1
+                return
+        stats["generated"] += 1
+        stats["added" if letter not in entries["alphabet"] else "updated"] += 1
+        entries["alphabet"][letter] = step
+
+    tasks = [generate_pose(word) for word in words if refresh or normalize_text(word) not in poses]
+    if alphabet:
+        letters = [chr(code) for code in range(ord("A"), ord("Z") + 1)]
+        tasks += [generate_letter(letter) for letter in letters if refresh or letter not in entries["alphabet"]]
+    await asyncio.gather(*tasks)
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Build the precomputed sign library.")
+    parser.add_argument("--output", type=Path, default=Path(settings.sign_library_path or DEFAULT_LIBRARY_PATH),
+                        help="Library file to update")
+    parser.add_argument("--language", default="ASL", help="Sign language of the new entries")
+    parser.add_argument("--frontend", type=Path, default=DEFAULT_FRONTEND_POSES,
+                        help="handPoses.ts to import poses from")
+    parser.add_argument("--no-frontend", action="store_true", help="Don't import the frontend's poses")
+    parser.add_argument("--words", type=Path, help="Vocabulary to generate poses for with Gemini, one per line")
+    parser.add_argument("--alphabet", action="store_true", help="Generate missing alphabet guidance with Gemini")
+    parser.add_argument("--refresh", action="store_true", help="Regenerate entries that already exist")
+    parser.add_argument("--concurrency", type=int, default=4, help="Model calls in flight")
+    args = parser.parse_args(argv)
+
+    library = load_library(args.output)
+    frontend_poses = {}
+    if not args.no_frontend and args.frontend.exists():
+        frontend_poses = parse_frontend_poses(args.frontend)
+        print(f"Read {len(frontend_poses)} poses from {args.frontend}")
+    words = read_words(args.words) if args.words else []
+
+    stats = asyncio.run(build(
+        library,
+        language=args.language.strip().upper(),
+        frontend_poses=frontend_poses,
+        words=words,
+        alphabet=args.alphabet,
+        refresh=args.refresh,
+        concurrency=args.concurrency,
+    ))
+
+    if stats["added"] or stats["updated"]:
+        library["version"] += 1
+        write_library(args.output, library)
+        print(f"Wrote {args.output} (version {library['version']})")
+    else:
+        print(f"{args.output} is up to date (version {library['version']})")
+
+    print(
+        f"Done: {stats['added']} added, {stats['updated']} updated, {stats['generated']} generated, "
+        f"{stats['failed']} failed, {stats['invalid']} invalid"
+    )
+    return 0 if stats["failed"] == 0 and stats["invalid"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Pre-crawl sign media for a word list into the media index.
+
+Resolves every word through the sign_resources providers so production
+serves common vocabulary from the index instead of scraping at request time.
+
+Usage:
+    python -m app.tools.precrawl words.txt [--concurrency 8] [--rate 2]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import get_settings
+from app.services.cache import normalize_text
+from app.services.http_client import init_http_client, close_http_client
+from app.services.media_index import init_media_index, close_media_index
+from app.services.sign_resources import get_providers, resolve_sign_media
+
+
+class HostRateLimiter:
+    """
+    Space out requests to each host to at most `rate` per second on average.
+
+    Slots are reserved for a whole lookup before it starts, so the wait
+    doesn't eat into the lookup's deadline. A lookup's candidate pages are
+    then fetched together as a short burst.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at: dict[str, float] = defaultdict(float)
+
+    def reserve(self, urls: list[str]) -> float:
+        """Reserve one slot per URL on its host and return the seconds until all of them are due."""
+        if not self.interval:
+            return 0.0
+        counts: dict[str, int] = defaultdict(int)
+        for url in urls:
+            counts[urlsplit(url).netloc] += 1
+
+        now = time.monotonic()
+        delay = 0.0
+        for host, count in counts.items():
+            start = max(now, self._next_at[host])
+            self._next_at[host] = start + count * self.interval
+            delay = max(delay, start - now)
+        return delay
+
+    async def wait(self, urls: list[str]) -> None:
+        """Sleep until a lookup fetching `urls` may start."""
+        delay = self.reserve(urls)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def read_words(path: Path) -> list[str]:
+    """Read one word or phrase per line, skipping blanks, comments and duplicates."""
+    words = []
+    seen = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        word = line.strip()
+        if not word or word.startswith("#"):
+            continue
+        key = normalize_text(word)
+        if key not in seen:
+            seen.add(key)
+            words.append(word)
+    return words
+
+
+class Checkpoint:
+    """Append-only file of finished words so an interrupted crawl can resume."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.done: set[str] = set()
+        if path.exists():
+            self.done = {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+        self._fp = path.open("a", encoding="utf-8")
+
+    def __contains__(self, word: str) -> bool:
+        return normalize_text(word) in self.done
+
+    def mark(self, word: str) -> None:
+        key = normalize_text(word)
+        self.done.add(key)
+        self._fp.write(key + "\n")
+        self._fp.flush()
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+async def crawl_word(
+    word: str,
+    client: httpx.AsyncClient,
+    retries: int,
+    backoff: float,
+    deadline: Optional[float],
+    limiter: Optional[HostRateLimiter] = None,
+) -> tuple[Optional[dict], bool]:
+    """
+    Resolve one word, retrying with exponential backoff while the answer is incomplete.
+
+    Each attempt waits for the limiter first, outside the lookup's deadline.
+
+    Returns:
+        Tuple of (result or None if every attempt raised, complete)
+    """
+    result, complete = None, False
+    urls = [url for provider in get_providers() for url in provider.page_urls(word)]
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            await limiter.wait(urls)
+        try:
+            result, complete = await resolve_sign_media(word, client=client, deadline=deadline)
+        except Exception as e:
+            print(f"  {word}: attempt {attempt + 1} failed: {e}", file=sys.stderr)
+            result, complete = None, False
+
+        if complete or (result is not None and result["found"]):
+            break
+        if attempt < retries:
+            await asyncio.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+    return result, complete
+
+
+async def precrawl(
+    words: list[str],
+    index_path: Optional[str] = None,
+    checkpoint_path: Optional[Path] = None,
+    concurrency: int = 8,
+    rate: float = 2.0,
+    retries: int = 3,
+    backoff: float = 1.0,
+    deadline: Optional[float] = None,
+) -> dict:
+    """
+    Resolve a word list into the media index.
+
+    Args:
+        words: Words to resolve
+        index_path: Media index file (defaults to settings.media_index_path)
+        checkpoint_path: Progress file; words listed there are skipped
+        concurrency: Words resolved at the same time
+        rate: Requests per second allowed to each host
+        retries: Extra attempts for words whose lookup was incomplete
+        backoff: Base delay in seconds between attempts
+        deadline: Per-attempt lookup budget (defaults to settings.sign_media_deadline)
+
+    Returns:
+        Summary with counts, hit rate and throughput
+    """
+    index = init_media_index(index_path)
+    if index is None:
+        raise RuntimeError("Media index is disabled (MEDIA_INDEX_ENABLED=false)")
+
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    pending = [word for word in words if checkpoint is None or word not in checkpoint]
+    skipped = len(words) - len(pending)
+
+    limiter = HostRateLimiter(rate)
+    client = init_http_client()
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"words": len(words), "skipped": skipped, "resolved": 0, "found": 0, "failed": 0}
+    start = time.perf_counter()
+
+    async def worker(word: str) -> None:
+        async with semaphore:
+            result, complete = await crawl_word(word, client, retries, backoff, deadline, limiter)
+
+        if result is not None and (result["found"] or complete):
+            index.store(word, result, complete)
+            stats["resolved"] += 1
+            stats["found"] += int(result["found"])
+            if checkpoint is not None:
+                checkpoint.mark(word)
+        else:
+            # Left out of the checkpoint so the next run retries it
+            stats["failed"] += 1
+
+        done = stats["resolved"] + stats["failed"]
+        if done % 50 == 0 or done == len(pending):
+            print(f"  {done}/{len(pending)} words ({stats['found']} found, {stats['failed']} failed)")
+
+    try:
+        await asyncio.gather(*[worker(word) for word in pending])
+    finally:
+        await close_http_client()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_seconds"] = elapsed
+    # Words that ended up in the index; failed words are counted separately
+    stats["words_per_second"] = stats["resolved"] / elapsed if elapsed > 0 else 0.0
+    stats["hit_rate"] = stats["found"] / stats["resolved"] if stats["resolved"] else 0.0
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Warm the sign media index from a word list.")
+    parser.add_argument("wordlist", type=Path, help="File with one word or phrase per line")
+    parser.add_argument("--index", default=settings.media_index_path, help="Media index SQLite file")
+    parser.add_argument("--checkpoint", type=Path, help="Progress file (default: <wordlist>.progress)")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Don't read or write progress")
+    parser.add_argument("--concurrency", type=int, default=8, help="Words resolved concurrently")
+    parser.add_argument("--rate", type=float, default=2.0, help="Max requests per second per host (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=3, help="Retries for incomplete lookups")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base retry delay in seconds")
+    parser.add_argument("--deadline", type=float, default=None, help="Per-attempt lookup budget in seconds")
+    parser.add_argument("--export", type=Path, help="Write the whole index as JSON Lines when done")
+    args = parser.parse_args(argv)
+
+    words = read_words(args.wordlist)
+    checkpoint = None if args.no_checkpoint else (args.checkpoint or args.wordlist.with_suffix(".progress"))
+    print(f"Pre-crawling {len(words)} words into {args.index}")
+
+    stats = asyncio.run(precrawl(
+        words,
+        index_path=args.index,
+        checkpoint_path=checkpoint,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        retries=args.retries,
+        backoff=args.backoff,
+        deadline=args.deadline,
+    ))
+
+    if args.export:
+        index = init_media_index(args.index)
+        with args.export.open("w", encoding="utf-8") as fp:
+            count = index.export_jsonl(fp)
+        print(f"Exported {count} entries to {args.export}")
+    close_media_index()
+
+    print(
+        f"Done: {stats['resolved']} resolved, {stats['found']} found, {stats['failed']} failed, "
+        f"{stats['skipped']} skipped from checkpoint"
+    )
+    print(f"Hit rate: {stats['hit_rate']:.1%}")
+    print(f"Throughput: {stats['words_per_second']:.2f} words/sec over {stats['elapsed_seconds']:.1f}s")
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Benchmarks for the backend hot paths (see benchmarks/run.py)."""
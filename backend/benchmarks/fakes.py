@@ -0,0 +1,290 @@
+"""
+Deterministic stand-ins for Gemini and the sign media sites.
+
+FakeModel answers generate_content() like the real SDK, after a fixed
+(optionally jittered) delay, with well-formed JSON for whichever prompt it
+gets. FakeSignSites serves Lifeprint- and HandSpeak-shaped pages from a
+local HTTP server so sign media lookups never leave the machine.
+"""
+
+import io
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from PIL import Image, ImageDraw
+
+_QUOTED = re.compile(r'"([^"\n]+)"')
+
+
+def _step(number: int, word: str) -> dict:
+    return {
+        "step": number,
+        "word": word,
+        "description": f"Form the handshape for '{word}' in front of the chest.",
+        "hand_position": "Dominant hand in neutral space",
+        "hand_shape": "flat hand",
+        "palm_orientation": "palm facing out",
+        "location": "in front of chest",
+        "movement": "small forward movement",
+        "facial_expression": None,
+        "video_search_query": f"ASL sign for {word}",
+    }
+
+
+class FakeModel:
+    """
+    Stand-in for genai.GenerativeModel with a configurable response latency.
+
+    Args:
+        latency: Seconds each call blocks for (like the SDK, in the calling thread)
+        jitter: Extra uniform random delay, 0 to jitter seconds (seeded)
+        chunks: Chunks a streamed response is split into
+        seed: Seed for the jitter
+    """
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, chunks: int = 6, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.chunks = max(1, chunks)
+        self.calls = 0
+        self.images = 0  # Inline image parts received
+        self.image_bytes = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.calls += 1
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    @staticmethod
+    def respond(prompt: str) -> dict:
+        """Build a JSON answer shaped for the prompt's function."""
+        quoted = _QUOTED.search(prompt)
+        subject = quoted.group(1) if quoted else "sign"
+        words = subject.split() or [subject]
+
+        if "3D hand modeling" in prompt:
+            return {
+                "pose": {
+                    "thumb": {"curl": 0.2, "spread": 0.3},
+                    "index": {"curl": 0.0, "spread": 0.0},
+                    "middle": {"curl": 0.0, "spread": 0.0},
+                    "ring": {"curl": 1.0, "spread": 0.0},
+                    "pinky": {"curl": 1.0, "spread": 0.0},
+                    "wrist_rotation": {"x": 0.0, "y": 0.0, "z": 0.0},
+                    "palm_direction": "forward",
+                },
+                "description": f"Hand pose for '{subject}'.",
+            }
+        if "visual teaching methods" in prompt:
+            return {
+                "steps": [_step(i + 1, word) for i, word in enumerate(words)],
+                "video_resources": [
+                    {"title": f"How to sign {word}", "url": f"https://www.handspeak.com/word/{word}", "source": "HandSpeak"}
+                    for word in words
+                ],
+                "tips": "Practice slowly in front of a mirror.",
+                "common_mistakes": "Signing too fast.",
+            }
+        if "sign language instructor" in prompt:
+            return {
+                "steps": [
+                    {key: value for key, value in _step(i + 1, word).items()
+                     if key in ("step", "description", "hand_position", "movement")}
+                    for i, word in enumerate(words)
+                ],
+                "notes": "Keep your movements smooth.",
+            }
+        # Translation of a frame or clip
+        return {"detected": True, "text": "HELLO", "confidence": 0.92, "description": "Open hand waving"}
+
+    def generate_content(self, contents, stream: bool = False, **kwargs):
+        parts = contents if isinstance(contents, (list, tuple)) else [contents]
+        prompt = next((part for part in parts if isinstance(part, str)), "")
+        images = [part["data"] for part in parts if isinstance(part, dict) and "data" in part]
+        with self._lock:
+            self.images += len(images)
+            self.image_bytes += sum(len(data) for data in images)
+        text = json.dumps(self.respond(prompt))
+        usage = SimpleNamespace(
+            prompt_token_count=len(prompt) // 4 + 258 * (len(parts) - 1),
+            candidates_token_count=len(text) // 4,
+            total_token_count=len(prompt) // 4 + 258 * (len(parts) - 1) + len(text) // 4,
+        )
+        delay = self._delay()
+
+        if not stream:
+            time.sleep(delay)
+            return SimpleNamespace(text=text, usage_metadata=usage)
+
+        size = -(-len(text) // self.chunks)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+
+        class _Stream:
+            usage_metadata = usage
+
+            def __iter__(self):
+                # The delay is spread over the chunks, first chunk after one slice
+                for piece in pieces:
+                    time.sleep(delay / len(pieces))
+                    yield SimpleNamespace(text=piece)
+
+        return _Stream()
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    server: "_SiteServer"
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real sites
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The lookup already had its answer and cancelled this request
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parts = urlsplit(self.path)
+
+        # Lifeprint: /asl101/pages-signs/<letter>/<word>.htm
+        match = re.fullmatch(r"/asl101/pages-signs/(\w)/([^/]+)\.htm", parts.path)
+        if match:
+            word = unquote(match.group(2))
+            if word in self.server.lifeprint_words:
+                self._send(200, f'<html><body><img src="../../signs/{match.group(1)}/{word}.gif"></body></html>')
+            else:
+                self._send(404, "<html><body>Not found</body></html>")
+            return
+
+        # HandSpeak: /word/search/index.php?id=<word>
+        if parts.path == "/word/search/index.php":
+            word = parse_qs(parts.query).get("id", [""])[0]
+            if word in self.server.handspeak_words:
+                self._send(200, f'<html><body><video><source src="/media/{word}.mp4"></video></body></html>')
+            else:
+                self._send(200, "<html><body>No results</body></html>")
+            return
+
+        self._send(404, "<html><body>Not found</body></html>")
+
+
+class _SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The default backlog of 5 drops connections under load
+    latency = 0.0
+    lifeprint_words: set = set()
+    handspeak_words: set = set()
+    connections = 0  # TCP connections accepted
+
+    def process_request(self, request, client_address):
+        # Called once per connection, on the serving thread
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class FakeSignSites:
+    """
+    Local server answering both Lifeprint and HandSpeak URLs.
+
+    Args:
+        latency: Seconds each page request takes
+        lifeprint_words: Words Lifeprint has a page for
+        handspeak_words: Words HandSpeak has a video for
+    """
+
+    def __init__(self, latency: float = 0.02, lifeprint_words=(), handspeak_words=()):
+        self._server = _SiteServer(("127.0.0.1", 0), _SiteHandler)
+        self._server.latency = latency
+        self._server.lifeprint_words = set(lifeprint_words)
+        self._server.handspeak_words = set(handspeak_words)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connections(self) -> int:
+        """TCP connections accepted so far (one per handshake; keep-alive requests reuse them)."""
+        return self._server.connections
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSignSites":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-sign-sites", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_frame(width: int = 640, height: int = 480, quality: int = 80, seed: int = 0) -> bytes:
+    """A deterministic JPEG test frame: noise-free shapes, so it compresses like a camera frame."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(24):
+        x, y = rng.randrange(width), rng.randrange(height)
+        size = rng.randrange(20, max(21, width // 4))
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        draw.ellipse([x, y, x + size, y + size], fill=color)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def make_hand_landmarks(center: tuple[float, float] = (0.6, 0.45), size: float = 0.2, seed: int = 0) -> dict:
+    """
+    One right hand's 21 landmarks in the extract_hand_landmarks() format.
+
+    Points are scattered (seeded) over a box of `size` (as a fraction of the
+    frame) around `center`, so a hand crop covers about that much of the frame.
+    """
+    rng = random.Random(seed)
+    cx, cy = center
+    points = [
+        {"x": cx + rng.uniform(-size / 2, size / 2), "y": cy + rng.uniform(-size / 2, size / 2), "z": 0.0}
+        for _ in range(21)
+    ]
+    return {"hands": [{"handedness": "Right", "landmarks": points, "confidence": 0.95}]}
+
+
+@contextmanager
+def fake_hands(landmarks: dict):
+    """
+    Make analyze_frame() in this process see `landmarks` in every frame.
+
+    Stands in for MediaPipe (which may not be installed), including the copy
+    made when the landmarks are drawn. Frame workers in other processes are
+    not affected.
+    """
+    from app.services import video
+
+    def detect_hands(image, hands=None, draw=True):
+        return (image.copy() if draw else image), landmarks
+
+    saved = video.MEDIAPIPE_AVAILABLE, video.detect_hands
+    video.MEDIAPIPE_AVAILABLE, video.detect_hands = True, detect_hands
+    try:
+        yield
+    finally:
+        video.MEDIAPIPE_AVAILABLE, video.detect_hands = saved
@@ -0,0 +1,420 @@
+"""
+Benchmark the backend hot paths against a fake Gemini and fake sign sites.
+
+Runs the app in-process under uvicorn with FakeModel in place of Gemini and
+FakeSignSites in place of Lifeprint/HandSpeak, then measures throughput and
+p50/p95/p99 latency for frame decoding and preprocessing, the WebSocket
+stream and every /api/signs/* route, plus peak RSS. Results are compared
+with a stored baseline; a scenario regresses when its p95 latency grows or
+its throughput drops by more than the tolerance.
+
+Usage:
+    python -m benchmarks.run [--requests 100] [--concurrency 8] [--latency 0.05]
+    python -m benchmarks.run --save-baseline
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import pickle
+import platform
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from benchmarks.fakes import FakeModel, FakeSignSites, fake_hands, make_frame, make_hand_landmarks
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Vocabulary cycled through by the route scenarios; only some of it is "on" the fake sites
+WORDS = [
+    "apple", "book", "car", "dog", "eat", "family", "good", "house", "love", "mother",
+    "name", "please", "school", "teacher", "water", "work", "yes", "friend", "learn", "help",
+]
+PHRASES = ["thank you friend", "good morning teacher", "i love you", "nice to meet you", "how are you"]
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Linearly interpolated percentile of the samples (q from 0 to 1)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def peak_rss_mb() -> dict:
+    """Peak resident set size of this process and its live child processes (frame workers)."""
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    scale = 1 if platform.system() == "Darwin" else 1024
+    result = {"self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20}
+
+    children = 0.0
+    import multiprocessing
+    for child in multiprocessing.active_children():
+        try:
+            with open(f"/proc/{child.pid}/status") as fp:
+                for line in fp:
+                    if line.startswith("VmHWM:"):
+                        children += int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    result["children"] = children
+    return result
+
+
+def run_sync(function: Callable[[], object], iterations: int) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_concurrent(
+    call: Callable[[int], Awaitable[bool]],
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> dict:
+    """Issue `requests` calls with at most `concurrency` in flight; call(i) returns success."""
+    # Warm connections and thread pools without recording the calls
+    await asyncio.gather(*(call(i) for i in range(warmup)))
+
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            ok = await call(i)
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+class AppServer:
+    """The app under uvicorn in a background thread, so clients measure the real HTTP/WebSocket path."""
+
+    def __init__(self, app):
+        import uvicorn
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self.server.run, name="benchmark-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 60.0) -> None:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Benchmark server failed to start")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=30)
+
+
+def bench_frames(iterations: int) -> dict:
+    """
+    Frame decoding and preprocessing on a 1280x720 camera-sized frame.
+
+    frame_to_model_<profile> covers everything from the received frame to
+    the Gemini image part for each encoding profile, and reports the
+    image bytes sent per frame. The _hands variants run the same path with
+    a hand detected in every frame (stubbed landmarks, since MediaPipe may
+    not be installed), which is where profiles crop to the hands or fall
+    back from sending the camera JPEG as received.
+    """
+    from app.services.encoding import PROFILES
+    from app.services.model_client import encode_contents
+    from app.services.video import analyze_frame, decode_base64_image, decode_frame, process_frame
+
+    data_url = "data:image/jpeg;base64," + base64.b64encode(make_frame(1280, 720)).decode("ascii")
+    image = decode_base64_image(data_url)
+
+    def frame_to_model(profile) -> int:
+        # Worker decode, analysis and encoding, the transfer back to the API process, then the Gemini part
+        decoded_image, jpeg = decode_frame(data_url, profile=profile)
+        processed = pickle.loads(pickle.dumps(analyze_frame(decoded_image, jpeg=jpeg, profile=profile)))
+        return encode_contents(processed.model_image(), quality=85, profile=profile)[1]
+
+    results = {
+        # load() forces the pixel decode PIL would otherwise defer to the first use
+        "decode_base64_image": run_sync(lambda: decode_base64_image(data_url).load(), iterations),
+        "process_frame": run_sync(lambda: process_frame(image), iterations),
+        "decode_frame": run_sync(lambda: decode_frame(data_url), iterations),
+    }
+    for name, profile in PROFILES.items():
+        results[f"frame_to_model_{name}"] = {
+            **run_sync(lambda: frame_to_model(profile), iterations),
+            "bytes_per_frame": frame_to_model(profile),
+        }
+    with fake_hands(make_hand_landmarks()):
+        for name, profile in PROFILES.items():
+            results[f"frame_to_model_{name}_hands"] = {
+                **run_sync(lambda: frame_to_model(profile), iterations),
+                "bytes_per_frame": frame_to_model(profile),
+            }
+    return results
+
+
+async def bench_stream(url: str, connections: int, frames: int, model: FakeModel) -> dict:
+    """
+    WebSocket round trip per frame ("frame" mode, JSON protocol, one frame in
+    flight per connection), with the image bytes Gemini received per frame.
+    """
+    import websockets
+
+    data_url = "data:image/jpeg;base64," + base64.b64encode(make_frame(640, 480)).decode("ascii")
+    latencies: list[float] = []
+    errors = 0
+
+    async def connection():
+        nonlocal errors
+        async with websockets.connect(url.replace("http", "ws", 1) + "/api/translate/stream", max_size=None) as ws:
+            await ws.send(json.dumps({"type": "hello", "mode": "frame"}))
+            for seq in range(frames):
+                start = time.perf_counter()
+                await ws.send(json.dumps({"type": "frame", "data": {"image": data_url, "language": "ASL", "seq": seq}}))
+                while True:
+                    message = json.loads(await ws.recv())
+                    if message["type"] == "translation" and message["data"].get("seq") == seq:
+                        latencies.append(time.perf_counter() - start)
+                        break
+                    if message["type"] == "error":
+                        errors += 1
+                        break
+
+    images, image_bytes = model.images, model.image_bytes
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    stats = summarize(latencies, time.perf_counter() - started, errors)
+    sent = model.images - images
+    stats["bytes_per_frame"] = round((model.image_bytes - image_bytes) / sent) if sent else 0
+    return {"ws_stream": stats}
+
+
+async def bench_routes(url: str, requests: int, concurrency: int) -> dict:
+    """Every /api/signs/* route, each with `requests` calls and `concurrency` in flight."""
+    results = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+
+        def post(path: str, body: Callable[[int], dict], stream: bool = False):
+            async def call(i: int) -> bool:
+                if not stream:
+                    response = await client.post(path, json=body(i))
+                    return response.status_code == 200
+                async with client.stream("POST", path, json=body(i)) as response:
+                    text = "".join([chunk async for chunk in response.aiter_text()])
+                return response.status_code == 200 and "event: done" in text
+            return call
+
+        def get(path: Callable[[int], str]):
+            async def call(i: int) -> bool:
+                return (await client.get(path(i))).status_code == 200
+            return call
+
+        scenarios = {
+            "signs_guidance": post("/api/signs/guidance", lambda i: {"text": PHRASES[i % len(PHRASES)]}),
+            "signs_guidance_stream": post(
+                "/api/signs/guidance/stream", lambda i: {"text": PHRASES[i % len(PHRASES)]}, stream=True
+            ),
+            "signs_visual_guidance": post("/api/signs/visual-guidance", lambda i: {"text": PHRASES[i % len(PHRASES)]}),
+            "signs_visual_guidance_stream": post(
+                "/api/signs/visual-guidance/stream", lambda i: {"text": PHRASES[i % len(PHRASES)]}, stream=True
+            ),
+            "signs_hand_pose_library": post("/api/signs/hand-pose", lambda i: {"sign": chr(ord("A") + i % 26)}),
+            "signs_hand_pose_model": post("/api/signs/hand-pose", lambda i: {"sign": WORDS[i % len(WORDS)]}),
+            "signs_alphabet": get(lambda i: f"/api/signs/alphabet/{chr(ord('a') + i % 26)}"),
+            "signs_common": get(lambda i: "/api/signs/common"),
+            "signs_gif": post("/api/signs/gif", lambda i: {"word": WORDS[i % len(WORDS)]}),
+        }
+        for name, call in scenarios.items():
+            results[name] = await run_concurrent(call, requests, concurrency, warmup=concurrency)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print each scenario against the baseline and return the regressions."""
+    regressions = []
+    differing = [key for key, value in results["config"].items() if baseline.get("config", {}).get(key) != value]
+    if differing:
+        print(f"\nNote: baseline was recorded with different settings ({', '.join(differing)})")
+    print(f"\n{'scenario':32} {'p95 ms':>10} {'base':>10} {'change':>8}   {'req/s':>9} {'base':>9} {'change':>8}")
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            print(f"{name:32} {current['p95_ms']:10.2f} {'-':>10} {'new':>8}")
+            continue
+        p95_change = current["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        throughput_change = current["throughput"] / base["throughput"] - 1 if base["throughput"] else 0.0
+        flag = ""
+        if p95_change > tolerance or throughput_change < -tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:32} {current['p95_ms']:10.2f} {base['p95_ms']:10.2f} {p95_change:+8.1%}   "
+            f"{current['throughput']:9.1f} {base['throughput']:9.1f} {throughput_change:+8.1%}{flag}"
+        )
+
+    base_rss = baseline.get("peak_rss_mb", {}).get("self")
+    if base_rss:
+        change = results["peak_rss_mb"]["self"] / base_rss - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append("peak_rss_mb")
+            flag = "  REGRESSION"
+        print(f"{'peak RSS (MB)':32} {results['peak_rss_mb']['self']:10.1f} {base_rss:10.1f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def configure_environment(sites: FakeSignSites, workdir: str) -> None:
+    """Point the app at the fakes; must run before app.config.get_settings() is first called."""
+    os.environ.update({
+        "GEMINI_API_KEY": "",  # FakeModel is installed directly
+        "GEMINI_REQUESTS_PER_MINUTE": "0",
+        "GEMINI_TOKENS_PER_MINUTE": "0",
+        "CACHE_BACKEND": "none",  # Measure the model path, not the cache
+        "MEDIA_INDEX_ENABLED": "false",
+        "MOTION_GATE_ENABLED": "false",
+        "LIFEPRINT_BASE_URL": sites.url,
+        "HANDSPEAK_BASE_URL": sites.url,
+        "JOBS_DB_PATH": os.path.join(workdir, "jobs.db"),
+        "JOBS_DIR": os.path.join(workdir, "jobs"),
+    })
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the backend against a fake Gemini and fake sign sites.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per route scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per route scenario")
+    parser.add_argument("--iterations", type=int, default=200, help="Iterations of the in-process frame benchmarks")
+    parser.add_argument("--connections", type=int, default=4, help="WebSocket connections")
+    parser.add_argument("--frames", type=int, default=25, help="Frames sent per WebSocket connection")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random fake model latency in seconds")
+    parser.add_argument("--site-latency", type=float, default=0.02, help="Fake sign site latency in seconds")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95/throughput change before failing")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    sites = FakeSignSites(
+        latency=args.site_latency,
+        lifeprint_words=WORDS[::2],
+        handspeak_words=WORDS[1::3],
+    ).start()
+    workdir = tempfile.mkdtemp(prefix="signbridge-bench-")
+    configure_environment(sites, workdir)
+
+    import app.services.gemini as gemini
+    from app.main import app
+
+    model = FakeModel(latency=args.latency, jitter=args.jitter)
+    gemini._model = model
+
+    results = {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "iterations": args.iterations,
+            "connections": args.connections,
+            "frames": args.frames,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "site_latency": args.site_latency,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "scenarios": {},
+    }
+
+    print("Frame benchmarks...")
+    results["scenarios"].update(bench_frames(args.iterations))
+
+    server = AppServer(app)
+    server.start()
+    try:
+        print("WebSocket stream...")
+        results["scenarios"].update(asyncio.run(bench_stream(server.url, args.connections, args.frames, model)))
+        print("Routes...")
+        results["scenarios"].update(asyncio.run(bench_routes(server.url, args.requests, args.concurrency)))
+        results["peak_rss_mb"] = peak_rss_mb()
+    finally:
+        server.stop()
+        sites.stop()
+    results["model_calls"] = model.calls
+
+    print(f"\n{'scenario':32} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'bytes/frame':>12}")
+    for name, stats in results["scenarios"].items():
+        sent = stats.get("bytes_per_frame")
+        print(
+            f"{name:32} {stats['throughput']:9.1f} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} "
+            f"{stats['p99_ms']:9.2f} {stats['errors']:7d} {sent if sent is not None else '-':>12}"
+        )
+    rss = results["peak_rss_mb"]
+    print(f"Peak RSS: {rss['self']:.1f} MB (frame workers: {rss['children']:.1f} MB)")
+    print(f"Fake model calls: {model.calls}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    failed = any(stats["errors"] for stats in results["scenarios"].values())
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
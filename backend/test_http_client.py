@@ -0,0 +1,66 @@
+"""Check that sign media lookups reuse pooled connections instead of a handshake per word."""
+
+import asyncio
+
+import httpx
+
+from app.config import get_settings
+from app.services.http_client import close_http_client, init_http_client
+from app.services.sign_resources import resolve_sign_media
+from benchmarks.fakes import FakeSignSites
+
+# Words neither fake site has, so every candidate page is fetched to the end and none is cancelled
+WORDS = ["apple", "book", "car", "dog", "eat", "family", "good", "house"]
+
+
+async def _resolve_per_word() -> None:
+    for word in WORDS:
+        async with httpx.AsyncClient() as client:
+            await resolve_sign_media(word, client=client)
+
+
+async def _resolve_shared() -> None:
+    # The app's client, as the lifespan builds it, used through the default path
+    init_http_client()
+    try:
+        for word in WORDS:
+            await resolve_sign_media(word)
+    finally:
+        await close_http_client()
+
+
+def _connections(sites: dict[str, FakeSignSites], resolve) -> dict[str, int]:
+    before = {name: site.connections for name, site in sites.items()}
+    asyncio.run(resolve())
+    return {name: site.connections - before[name] for name, site in sites.items()}
+
+
+def test_shared_client_reuses_connections(monkeypatch):
+    # One stand-in server per provider, so connections are counted per host
+    sites = {"lifeprint": FakeSignSites(latency=0.0).start(), "handspeak": FakeSignSites(latency=0.0).start()}
+    monkeypatch.setenv("LIFEPRINT_BASE_URL", sites["lifeprint"].url)
+    monkeypatch.setenv("HANDSPEAK_BASE_URL", sites["handspeak"].url)
+    monkeypatch.setenv("SIGN_MEDIA_DEADLINE", "30")
+    get_settings.cache_clear()
+    try:
+        per_word = _connections(sites, _resolve_per_word)
+        pooled = _connections(sites, _resolve_shared)
+
+        # With no idle connections kept, the app's client is back to a handshake per page
+        monkeypatch.setenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "0")
+        get_settings.cache_clear()
+        no_keepalive = _connections(sites, _resolve_shared)
+    finally:
+        for site in sites.values():
+            site.stop()
+        get_settings.cache_clear()
+
+    for name in sites:
+        # A client per word pays a handshake per candidate page for every word;
+        # the pooled client keeps one connection per concurrent candidate on
+        # each host and reuses it for every later word
+        candidates = per_word[name] // len(WORDS)
+        assert candidates >= 1
+        assert per_word[name] == candidates * len(WORDS)
+        assert 1 <= pooled[name] <= candidates
+        assert no_keepalive[name] == per_word[name]
@@ -0,0 +1,122 @@
+"""Video jobs shared by several API workers (managers) through one job store."""
+
+import asyncio
+from collections import Counter
+
+from app.services import jobs
+from app.services.jobs import JOB_CANCELLED, JOB_COMPLETED, JOB_INTERRUPTED, JobManager, JobStore
+
+FRAMES = 30
+
+
+def _fake_translate(runs: Counter, delay: float):
+    async def translate_video_file(path, language="ASL", mode=None, start_frame=0, progress_interval=None):
+        runs[path] += 1
+        for frame in range(start_frame, FRAMES, 5):
+            await asyncio.sleep(delay)
+            yield {
+                "type": "translation", "start": frame / 10, "end": frame / 10, "start_frame": frame,
+                "end_frame": frame, "kind": "frame", "text": f"W{frame}", "confidence": 0.9,
+            }
+            yield {"type": "progress", "frame": frame, "checkpoint": frame + 1, "total_frames": FRAMES}
+        yield {"type": "done", "frames": FRAMES, "total_frames": FRAMES}
+
+    return translate_video_file
+
+
+def _managers(tmp_path, count: int) -> list[JobManager]:
+    return [
+        JobManager(JobStore(str(tmp_path / "jobs.db")), str(tmp_path / "videos"), max_concurrent=2, poll_interval=0.02)
+        for _ in range(count)
+    ]
+
+
+async def _wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def _collect(events) -> list[dict]:
+    return [event async for event in events]
+
+
+def _upload(tmp_path, name: str) -> str:
+    path = tmp_path / name
+    path.write_bytes(b"video")
+    return str(path)
+
+
+def test_each_job_runs_in_one_worker(monkeypatch, tmp_path):
+    runs = Counter()
+    monkeypatch.setattr(jobs, "translate_video_file", _fake_translate(runs, delay=0.01))
+
+    async def main():
+        managers = _managers(tmp_path, 4)
+        for manager in managers:
+            manager.start()
+        submitted = [await managers[0].submit(_upload(tmp_path, f"{i}.mp4"), mode="frame") for i in range(6)]
+
+        # Events come from the store, so any worker can follow any job
+        events = await asyncio.wait_for(_collect(managers[3].events(submitted[0]["id"])), timeout=10)
+        await _wait_for(lambda: all(managers[0].store.get(job["id"])["status"] == JOB_COMPLETED for job in submitted))
+        for manager in managers:
+            await manager.close()
+        return managers[0].store, submitted, events
+
+    store, submitted, events = asyncio.run(main())
+
+    assert all(store.get(job["id"])["status"] == JOB_COMPLETED for job in submitted)
+    assert sorted(runs.values()) == [1] * len(submitted)
+    assert [event["text"] for event in events if event["type"] == "translation"] == [
+        f"W{frame}" for frame in range(0, FRAMES, 5)
+    ]
+    assert events[-1] == {"type": "status", "status": JOB_COMPLETED, "error": None}
+
+
+def test_cancel_from_another_worker(monkeypatch, tmp_path):
+    runs = Counter()
+    monkeypatch.setattr(jobs, "translate_video_file", _fake_translate(runs, delay=0.1))
+
+    async def main():
+        owner, other = _managers(tmp_path, 2)
+        owner.start()
+        job = await owner.submit(_upload(tmp_path, "clip.mp4"))
+        await _wait_for(lambda: owner.store.get(job["id"])["frames_done"] > 0)
+
+        await other.cancel(job["id"])
+        await _wait_for(lambda: not owner._tasks)
+        await owner.close()
+        return owner.store.get(job["id"])
+
+    job = asyncio.run(main())
+
+    # The owner stopped, didn't overwrite the cancellation and deleted the video
+    assert job["status"] == JOB_CANCELLED
+    assert job["frames_done"] < FRAMES
+    assert not (tmp_path / "videos" / f"{job['id']}.video").exists()
+
+
+def test_shutdown_hands_jobs_back(monkeypatch, tmp_path):
+    runs = Counter()
+    monkeypatch.setattr(jobs, "translate_video_file", _fake_translate(runs, delay=0.05))
+
+    async def main():
+        first, second = _managers(tmp_path, 2)
+        first.start()
+        job = await first.submit(_upload(tmp_path, "clip.mp4"))
+        await _wait_for(lambda: first.store.get(job["id"])["frames_done"] > 0)
+        await first.close()
+        interrupted = first.store.get(job["id"])
+
+        second.start()
+        await _wait_for(lambda: second.store.get(job["id"])["status"] == JOB_COMPLETED)
+        await second.close()
+        return interrupted, second.store.get(job["id"])
+
+    interrupted, job = asyncio.run(main())
+
+    assert interrupted["status"] == JOB_INTERRUPTED and interrupted["owner"] is None
+    assert job["status"] == JOB_COMPLETED
+    assert sum(runs.values()) == 2
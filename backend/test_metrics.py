@@ -0,0 +1,28 @@
+"""Metrics from several API workers merged into one /metrics response."""
+
+from app.services.metrics import Registry
+
+
+def _worker(requests: int, active: int, latencies: list[float]) -> Registry:
+    registry = Registry()
+    registry.counter("requests_total", "Requests", ("route",)).labels("/frame").inc(requests)
+    registry.gauge("active", "Open streams").set(active)
+    histogram = registry.histogram("latency_seconds", "Latency", bounds=(0.1, 1.0))
+    for latency in latencies:
+        histogram.observe(latency)
+    return registry
+
+
+def test_render_sums_other_workers():
+    scraped = _worker(requests=3, active=1, latencies=[0.05])
+    others = [_worker(requests=4, active=2, latencies=[0.5, 2.0]).snapshot(), _worker(0, 0, []).snapshot()]
+
+    lines = scraped.render(others).splitlines()
+
+    assert 'requests_total{route="/frame"} 7' in lines
+    assert "active 3" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+    assert lines.count("# TYPE requests_total counter") == 1
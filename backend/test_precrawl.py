@@ -0,0 +1,48 @@
+"""Pre-crawl a word list against a local stand-in for Lifeprint and HandSpeak."""
+
+import asyncio
+import time
+
+from app.config import get_settings
+from app.services.media_index import close_media_index
+from app.tools.precrawl import precrawl
+from benchmarks.fakes import FakeSignSites
+
+LIFEPRINT_WORDS = ["apple", "book", "car", "dog", "eat"]
+HANDSPEAK_WORDS = ["family", "good"]
+MISSING_WORDS = ["house", "love", "mother"]
+
+
+def test_precrawl_rate_limit_stays_outside_deadline(monkeypatch, tmp_path):
+    sites = FakeSignSites(latency=0.01, lifeprint_words=LIFEPRINT_WORDS, handspeak_words=HANDSPEAK_WORDS).start()
+    monkeypatch.setenv("LIFEPRINT_BASE_URL", sites.url)
+    monkeypatch.setenv("HANDSPEAK_BASE_URL", sites.url)
+    get_settings.cache_clear()
+    words = LIFEPRINT_WORDS + HANDSPEAK_WORDS + MISSING_WORDS
+    rate = 20.0
+
+    try:
+        start = time.perf_counter()
+        # Every word is started at once, but the wait for a rate slot (up to
+        # ~2s here) must not count against the 0.5s lookup deadline
+        stats = asyncio.run(precrawl(
+            words,
+            index_path=str(tmp_path / "media.db"),
+            concurrency=len(words),
+            rate=rate,
+            retries=0,
+            deadline=0.5,
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        sites.stop()
+        close_media_index()
+        get_settings.cache_clear()
+
+    assert stats["failed"] == 0
+    assert stats["resolved"] == len(words)
+    assert stats["found"] == len(LIFEPRINT_WORDS) + len(HANDSPEAK_WORDS)
+    assert stats["words_per_second"] == stats["resolved"] / stats["elapsed_seconds"]
+    # Every word reserves one slot per candidate page on the shared host
+    pages = len(words) * 4
+    assert elapsed >= (pages - 4) / rate * 0.9